@@ -0,0 +1,177 @@
+import asyncio
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from ..observability.metrics import REGISTRY
+from .concurrency import ConcurrencyLimiter, QueueFullError, Ticket
+from .server_config import ServerConfig
+
+GENERATE = "generate"
+STREAM = "stream"
+INGEST = "ingest"
+SEARCH = "search"
+
+# How often a queued request checks whether its client is still connected.
+DISCONNECT_POLL_INTERVAL = 1.0
+
+# Non-standard status (nginx convention) logged when the client left while queued.
+CLIENT_CLOSED_REQUEST = 499
+
+ACTIVE_REQUESTS = REGISTRY.gauge(
+    "raglight_requests_active", "Requests currently running, by route class.", ["route"]
+)
+QUEUED_REQUESTS = REGISTRY.gauge(
+    "raglight_requests_queued",
+    "Requests waiting for a running slot, by route class.",
+    ["route"],
+)
+REJECTED_REQUESTS = REGISTRY.counter(
+    "raglight_requests_rejected_total",
+    "Requests refused with 429 because the queue was full, by route class.",
+    ["route"],
+)
+
+
+class AdmissionController:
+    """
+    Admission control for the REST API, with one ``ConcurrencyLimiter`` per route class.
+
+    Each route class (``generate``, ``stream``, ``ingest``, ``search``) has its own
+    concurrency cap, bounded wait queue and deadline, so that a burst on one kind of
+    request neither starves the others nor turns into a pile of timeouts: requests
+    beyond the queue are refused immediately with ``429`` and a ``Retry-After``
+    estimate, and requests that wait past their deadline get ``504``.
+
+    Attributes:
+        limiters (Dict[str, ConcurrencyLimiter]): Limiters keyed by route class.
+    """
+
+    def __init__(self, limiters: Dict[str, ConcurrencyLimiter]) -> None:
+        self.limiters = limiters
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "AdmissionController":
+        return cls(
+            {
+                GENERATE: ConcurrencyLimiter(
+                    config.max_concurrent_generate,
+                    config.max_queued_generate,
+                    config.generate_timeout,
+                ),
+                STREAM: ConcurrencyLimiter(
+                    config.max_concurrent_streams,
+                    config.max_queued_streams,
+                    config.stream_timeout,
+                ),
+                INGEST: ConcurrencyLimiter(
+                    config.max_concurrent_ingest,
+                    config.max_queued_ingest,
+                    config.ingest_queue_timeout,
+                ),
+                SEARCH: ConcurrencyLimiter(
+                    config.max_concurrent_search,
+                    config.max_queued_search,
+                    config.search_timeout,
+                ),
+            }
+        )
+
+    async def admit(
+        self, route_class: str, request: Request, watch_disconnect: bool = True
+    ) -> Ticket:
+        """
+        Waits for a running slot of a route class.
+
+        Args:
+            route_class (str): One of ``generate``, ``stream``, ``ingest`` or ``search``.
+            request (Request): The incoming request, polled for client disconnects.
+            watch_disconnect (bool): Whether to poll for client disconnects while
+                queued. Polling consumes unread body chunks, so it must be off for a
+                request whose body is read after admission.
+
+        Returns:
+            Ticket: The held slot. The caller must ``release`` it once done.
+
+        Raises:
+            HTTPException: 429 when the queue is full, 504 when the deadline expires
+                while queued, 499 when the client disconnects while queued.
+        """
+        limiter = self.limiters[route_class]
+        try:
+            ticket = limiter.reserve()
+        except QueueFullError as e:
+            REJECTED_REQUESTS.inc(route=route_class)
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many {route_class} requests: {e}",
+                headers={"Retry-After": str(limiter.retry_after())},
+            )
+
+        acquiring = asyncio.ensure_future(ticket.acquire())
+        waiting = {acquiring}
+        disconnected: Optional[asyncio.Future] = None
+        if watch_disconnect:
+            disconnected = asyncio.ensure_future(_wait_for_disconnect(request))
+            waiting.add(disconnected)
+        try:
+            await asyncio.wait(
+                waiting,
+                timeout=ticket.remaining(),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        except BaseException:
+            ticket.release()
+            raise
+        finally:
+            for task in waiting:
+                if not task.done():
+                    task.cancel()
+        if acquiring.done() and not acquiring.cancelled():
+            return ticket
+        ticket.release()
+        if (
+            disconnected is not None
+            and disconnected.done()
+            and not disconnected.cancelled()
+        ):
+            raise HTTPException(
+                status_code=CLIENT_CLOSED_REQUEST,
+                detail="Client disconnected while queued",
+            )
+        raise HTTPException(
+            status_code=504,
+            detail=f"Deadline exceeded while queued for {route_class}",
+        )
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    """
+    Returns once the client of a queued request has disconnected.
+    """
+    while True:
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+        if await request.is_disconnected():
+            return
+
+
+def update_queue_metrics(admission: AdmissionController) -> None:
+    """
+    Copies the current queue depths of every route class into the metrics registry.
+    """
+    for route_class, limiter in admission.limiters.items():
+        ACTIVE_REQUESTS.set(limiter.active, route=route_class)
+        QUEUED_REQUESTS.set(limiter.queued, route=route_class)
+
+
+def get_admission(request: Request) -> AdmissionController:
+    """
+    Returns the admission controller of the app, creating it from its config if needed.
+    """
+    state = request.app.state
+    admission = getattr(state, "admission", None)
+    if admission is None:
+        config = getattr(state, "server_config", None) or ServerConfig()
+        admission = AdmissionController.from_config(config)
+        state.admission = admission
+    return admission
@@ -28,7 +28,10 @@ from typing import Optional
 from fastapi import FastAPI
 
 from ..rag.simple_rag_api import RAGPipeline
+from .admission import AdmissionController
+from .ingest_jobs import IngestJobManager
 from .router import create_router
+from .search_cache import SearchCache
 from .server_config import ServerConfig
 
 # Silence noisy third-party loggers (runs in the uvicorn subprocess, where CLI callback() never fires)
@@ -56,7 +59,19 @@ def create_app(config: Optional[ServerConfig] = None) -> FastAPI:
         pipeline = RAGPipeline(config.to_rag_config(), config.to_vector_store_config())
         app.state.pipeline = pipeline
         app.state.server_config = config
+        app.state.admission = AdmissionController.from_config(config)
+        app.state.search_cache = SearchCache(
+            max_entries=config.search_cache_size, ttl=config.search_cache_ttl
+        )
+        ingest_jobs = IngestJobManager(
+            pipeline.get_vector_store(),
+            journal_path=os.path.join(config.jobs_dir, "jobs.db"),
+            upload_dir=os.path.join(config.jobs_dir, "uploads"),
+        )
+        ingest_jobs.start()
+        app.state.ingest_jobs = ingest_jobs
         yield
+        ingest_jobs.stop(timeout=5)
 
     app = FastAPI(
         title="RAGLight API",
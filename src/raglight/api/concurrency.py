@@ -0,0 +1,146 @@
+import asyncio
+import math
+import time
+from typing import Optional
+
+# Weight of the latest request in the moving average of service times.
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class QueueFullError(Exception):
+    """Raised when a limiter has no free slot and its waiting queue is full."""
+
+
+class Ticket:
+    """
+    A place in a ``ConcurrencyLimiter``: queued on creation, running once ``acquire``
+    returns, and given back by ``release``. Releasing is idempotent so that it can be
+    called both by the request handler and by the response once it is sent.
+
+    The first ``acquire`` enqueues a single waiter on the limiter's semaphore, and
+    later calls wait on that same waiter: a call that times out keeps the ticket's
+    place in line, so tickets are served in arrival order however often they poll.
+
+    Attributes:
+        deadline (Optional[float]): ``time.monotonic()`` value after which the request
+            should be abandoned, or None when the limiter has no timeout.
+    """
+
+    def __init__(self, limiter: "ConcurrencyLimiter") -> None:
+        self._limiter = limiter
+        self._acquired_at: Optional[float] = None
+        self._released = False
+        self._waiter: Optional[asyncio.Future] = None
+        self.deadline: Optional[float] = (
+            time.monotonic() + limiter.timeout if limiter.timeout else None
+        )
+
+    def remaining(self) -> Optional[float]:
+        """
+        Returns the time left before the deadline, in seconds, or None without deadline.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for a running slot.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait, in seconds.
+
+        Returns:
+            bool: True once the slot is held, False if the timeout expired first.
+        """
+        if self._acquired_at is not None:
+            return True
+        if self._waiter is None:
+            self._waiter = asyncio.ensure_future(self._limiter._semaphore.acquire())
+        # ``asyncio.wait`` leaves the waiter queued when the timeout expires, whereas
+        # ``wait_for`` would cancel it and send the ticket to the back of the line.
+        await asyncio.wait({self._waiter}, timeout=timeout)
+        if not self._waiter.done():
+            return False
+        self._waiter.result()
+        self._acquired_at = time.monotonic()
+        self._limiter.queued -= 1
+        self._limiter.active += 1
+        return True
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self._acquired_at is not None:
+            self._limiter.active -= 1
+            self._limiter._observe(time.monotonic() - self._acquired_at)
+            self._limiter._semaphore.release()
+        else:
+            self._limiter.queued -= 1
+            if self._waiter is not None:
+                if not self._waiter.done():
+                    self._waiter.cancel()
+                elif not self._waiter.cancelled():
+                    # The slot was granted but never claimed by ``acquire``.
+                    self._limiter._semaphore.release()
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of requests running at once, with a bounded waiting queue.
+
+    Requests beyond ``max_concurrent`` wait for a slot; once ``max_queued`` requests are
+    already waiting, new ones are refused with ``QueueFullError`` instead of piling up.
+
+    Attributes:
+        max_concurrent (int): Maximum number of requests running at once.
+        max_queued (int): Maximum number of requests waiting for a slot.
+        timeout (Optional[float]): Per-request deadline in seconds, queueing included.
+        active (int): Number of requests currently running.
+        queued (int): Number of requests currently waiting.
+        rejected (int): Number of requests refused because the queue was full.
+    """
+
+    def __init__(
+        self, max_concurrent: int, max_queued: int, timeout: Optional[float] = None
+    ) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.timeout = timeout
+        self.active = 0
+        self.queued = 0
+        self.rejected = 0
+        self._service_time: Optional[float] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+    def _observe(self, seconds: float) -> None:
+        if self._service_time is None:
+            self._service_time = seconds
+        else:
+            self._service_time += SERVICE_TIME_SMOOTHING * (
+                seconds - self._service_time
+            )
+
+    def retry_after(self) -> int:
+        """
+        Estimates, in whole seconds, how long a refused client should wait before retrying.
+        """
+        service_time = self._service_time or 1.0
+        waves = (self.queued + 1) / self.max_concurrent
+        return max(1, math.ceil(service_time * waves))
+
+    def reserve(self) -> Ticket:
+        """
+        Takes a place in the queue, to be turned into a running slot with ``Ticket.acquire``.
+
+        Raises:
+            QueueFullError: If every slot is busy and the queue is full.
+        """
+        if self.active + self.queued >= self.max_concurrent + self.max_queued:
+            self.rejected += 1
+            raise QueueFullError(
+                f"{self.active} requests running and {self.queued} waiting"
+            )
+        self.queued += 1
+        return Ticket(self)
@@ -0,0 +1,501 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: every process runs jobs.
+    fcntl = None
+
+from ..models.data_source_model import GitHubSource
+from ..observability.metrics import REGISTRY
+from ..scrapper.github_scrapper import GithubScrapper
+from ..vectorstore.vector_store import VectorStore
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Maximum number of per-file error messages kept on a job.
+MAX_JOB_ERRORS = 100
+
+# How often an idle worker looks for jobs submitted by other processes, and how often
+# a process waiting for the worker lock retries it, in seconds.
+JOB_POLL_INTERVAL = 1.0
+
+WORKER_LOCK_FILE = "worker.lock"
+
+_COLUMNS = (
+    "id",
+    "kind",
+    "params",
+    "status",
+    "owner",
+    "cancel_requested",
+    "files_total",
+    "files_done",
+    "chunks_embedded",
+    "errors",
+    "created_at",
+    "started_at",
+    "finished_at",
+)
+
+INGEST_JOBS = REGISTRY.gauge(
+    "raglight_ingest_jobs", "Ingestion jobs known to the server, by status.", ["status"]
+)
+
+
+@dataclass
+class IngestJob:
+    """
+    A snapshot of an ingestion request processed in the background.
+
+    ``kind`` is one of ``data_path``, ``file_paths``, ``github`` or ``upload``, and
+    ``params`` holds the matching request fields. ``owner`` identifies the process
+    running the job.
+    """
+
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = QUEUED
+    owner: Optional[str] = None
+    files_total: int = 0
+    files_done: int = 0
+    chunks_embedded: int = 0
+    errors: List[str] = field(default_factory=list)
+    cancel_requested: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def throughput(self) -> float:
+        """Chunks embedded per second since the job started."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.chunks_embedded / elapsed if elapsed > 0 else 0.0
+
+
+class IngestJobJournal:
+    """
+    SQLite journal of ingestion jobs, shared by every process of the server.
+
+    The journal is the only copy of a job's state. Each ingested file is recorded as
+    its own row, so that progress costs one small write per file however large the
+    job grows, and a job interrupted by a restart skips the files it already ingested.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT NOT NULL, "
+                "status TEXT NOT NULL, owner TEXT, "
+                "cancel_requested INTEGER NOT NULL DEFAULT 0, "
+                "files_total INTEGER NOT NULL DEFAULT 0, "
+                "files_done INTEGER NOT NULL DEFAULT 0, "
+                "chunks_embedded INTEGER NOT NULL DEFAULT 0, "
+                "errors TEXT NOT NULL DEFAULT '[]', created_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_files ("
+                "job_id TEXT NOT NULL, path TEXT NOT NULL, PRIMARY KEY (job_id, path))"
+            )
+
+    @staticmethod
+    def _job(row: tuple) -> IngestJob:
+        values = dict(zip(_COLUMNS, row))
+        values["params"] = json.loads(values["params"])
+        values["errors"] = json.loads(values["errors"])
+        values["cancel_requested"] = bool(values["cancel_requested"])
+        return IngestJob(**values)
+
+    def insert(self, job: IngestJob) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                (
+                    job.id,
+                    job.kind,
+                    json.dumps(job.params),
+                    job.status,
+                    job.owner,
+                    int(job.cancel_requested),
+                    job.files_total,
+                    job.files_done,
+                    job.chunks_embedded,
+                    json.dumps(job.errors),
+                    job.created_at,
+                    job.started_at,
+                    job.finished_at,
+                ),
+            )
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._job(row) if row else None
+
+    def load_all(self) -> List[IngestJob]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs ORDER BY created_at"
+            ).fetchall()
+        return [self._job(row) for row in rows]
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def claim_next(self, owner: str) -> Optional[IngestJob]:
+        """
+        Marks the oldest queued job as running for ``owner`` and returns it.
+
+        The claim only succeeds while the job is still queued, so a job cancelled or
+        claimed by another process in the meantime is never run.
+        """
+        with self._lock, self._conn:
+            ids = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+            for (job_id,) in ids:
+                claimed = self._conn.execute(
+                    "UPDATE jobs SET status = ?, owner = ?, "
+                    "started_at = COALESCE(started_at, ?) WHERE id = ? AND status = ?",
+                    (RUNNING, owner, time.time(), job_id, QUEUED),
+                ).rowcount
+                if claimed:
+                    break
+            else:
+                return None
+        return self.get(job_id)
+
+    def requeue_running(self) -> List[str]:
+        """Queues again the jobs left running, and returns their IDs."""
+        with self._lock, self._conn:
+            ids = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ?", (RUNNING,)
+                )
+            ]
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL WHERE status = ?",
+                (QUEUED, RUNNING),
+            )
+        return ids
+
+    def set_files_total(self, job_id: str, files_total: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET files_total = ? WHERE id = ?", (files_total, job_id)
+            )
+
+    def done_files(self, job_id: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM job_files WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def record_file(self, job_id: str, path: str, n_chunks: int) -> None:
+        """Records an ingested file and adds it to the job's counters."""
+        with self._lock, self._conn:
+            added = self._conn.execute(
+                "INSERT OR IGNORE INTO job_files (job_id, path) VALUES (?, ?)",
+                (job_id, path),
+            ).rowcount
+            if added:
+                self._conn.execute(
+                    "UPDATE jobs SET files_done = files_done + 1, "
+                    "chunks_embedded = chunks_embedded + ? WHERE id = ?",
+                    (n_chunks, job_id),
+                )
+
+    def add_error(self, job_id: str, message: str) -> None:
+        """Appends an error to a job, keeping at most ``MAX_JOB_ERRORS`` of them."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT errors FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            errors = json.loads(row[0]) if row else []
+            if len(errors) < MAX_JOB_ERRORS:
+                errors.append(message)
+                self._conn.execute(
+                    "UPDATE jobs SET errors = ? WHERE id = ?",
+                    (json.dumps(errors), job_id),
+                )
+
+    def request_cancel(self, job_id: str) -> bool:
+        """
+        Flags a job for cancellation, and cancels it outright if it is still queued.
+
+        Returns:
+            bool: True if the job was queued and is now cancelled.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status IN (?, ?)",
+                (job_id, QUEUED, RUNNING),
+            )
+            return bool(
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ? "
+                    "WHERE id = ? AND status = ?",
+                    (CANCELLED, time.time(), job_id, QUEUED),
+                ).rowcount
+            )
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def finish(self, job_id: str, status: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+                (status, time.time(), job_id),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class IngestJobManager:
+    """
+    Runs ingestion jobs one after the other on a background worker thread.
+
+    Jobs are kept in a SQLite journal that every process of the server shares, e.g. the
+    workers of ``raglight serve --workers N``: any process accepts jobs and answers
+    status and cancel requests from the journal. Jobs only run in the process holding
+    an exclusive ``fcntl`` lock on ``worker.lock`` next to the journal, which claims
+    them from the journal one at a time. When that process exits, another one takes
+    the lock over and queues the jobs it left running again; they skip the files they
+    had already ingested. Without ``fcntl`` (Windows), every process runs jobs, so
+    serve with a single worker there. Uploaded files are kept under ``upload_dir``
+    until their job finishes.
+
+    Attributes:
+        vector_store (VectorStore): The store documents are ingested into.
+        upload_dir (str): Directory holding the files of upload jobs.
+        owner (str): Identifies this process in the journal.
+    """
+
+    def __init__(
+        self, vector_store: VectorStore, journal_path: str, upload_dir: str
+    ) -> None:
+        self.vector_store = vector_store
+        self.upload_dir = upload_dir
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock_path = os.path.join(os.path.dirname(journal_path), WORKER_LOCK_FILE)
+        self._journal = IngestJobJournal(journal_path)
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._lock_file: Optional[IO[str]] = None
+
+    def start(self) -> None:
+        """
+        Starts the worker thread, which runs jobs once it holds the worker lock.
+        """
+        self._worker = threading.Thread(
+            target=self._work, name="raglight-ingest-worker", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the worker after the job in progress. Queued jobs stay in the journal.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+        self._journal.close()
+
+    def new_upload_dir(self, job_id: str) -> str:
+        path = os.path.join(self.upload_dir, job_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def submit(
+        self, kind: str, params: Dict[str, Any], job_id: Optional[str] = None
+    ) -> IngestJob:
+        """
+        Queues a new job.
+
+        Args:
+            kind (str): ``data_path``, ``file_paths``, ``github`` or ``upload``.
+            params (Dict[str, Any]): The job parameters.
+            job_id (Optional[str]): ID to use, e.g. when files were already staged for it.
+
+        Returns:
+            IngestJob: The queued job.
+        """
+        job = IngestJob(id=job_id or uuid.uuid4().hex, kind=kind, params=params)
+        self._journal.insert(job)
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self._journal.get(job_id)
+
+    def list(self) -> List[IngestJob]:
+        return self._journal.load_all()
+
+    def update_metrics(self) -> None:
+        """Copies the number of jobs in each status into the metrics registry."""
+        counts = {status: 0 for status in (QUEUED, RUNNING) + FINISHED_STATUSES}
+        counts.update(self._journal.count_by_status())
+        for status, count in counts.items():
+            INGEST_JOBS.set(count, status=status)
+
+    def cancel(self, job_id: str) -> Optional[IngestJob]:
+        """
+        Cancels a job: a queued job is dropped, a running one stops after its current files.
+        """
+        if self._journal.request_cancel(job_id):
+            self._cleanup(self._journal.get(job_id))
+        return self._journal.get(job_id)
+
+    def _finish(self, job: IngestJob, status: str) -> None:
+        self._journal.finish(job.id, status)
+        self._cleanup(job)
+
+    @staticmethod
+    def _cleanup(job: IngestJob) -> None:
+        if job.kind == "upload":
+            shutil.rmtree(job.params["dir"], ignore_errors=True)
+
+    def _acquire_worker_lock(self) -> bool:
+        """
+        Waits until this process may run jobs.
+
+        Returns:
+            bool: True once the worker lock is held, False if stopped first.
+        """
+        if fcntl is None:
+            return True
+        self._lock_file = open(self._lock_path, "a")
+        while not self._stopping.is_set():
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except OSError:
+                self._stopping.wait(JOB_POLL_INTERVAL)
+        return False
+
+    def _work(self) -> None:
+        try:
+            if not self._acquire_worker_lock():
+                return
+            # Only the lock holder runs jobs: the ones left running belong to a
+            # process that is gone.
+            for job_id in self._journal.requeue_running():
+                logging.info(f"Resuming interrupted ingestion job {job_id}")
+            while not self._stopping.is_set():
+                self._wakeup.clear()
+                job = self._journal.claim_next(self.owner)
+                if job is None:
+                    self._wakeup.wait(JOB_POLL_INTERVAL)
+                    continue
+                try:
+                    self._run(job)
+                except Exception as e:
+                    logging.exception(f"Ingestion job {job.id} failed")
+                    self._journal.add_error(job.id, str(e))
+                    self._finish(job, FAILED)
+        finally:
+            if self._lock_file is not None:
+                # Closing the file releases the lock.
+                self._lock_file.close()
+
+    def _resolve_files(self, job: IngestJob, root: Optional[str]) -> List[str]:
+        params = job.params
+        if job.kind == "file_paths":
+            missing = [fp for fp in params["file_paths"] if not os.path.isfile(fp)]
+            for fp in missing:
+                self._journal.add_error(job.id, f"File not found: {fp}")
+            return [fp for fp in params["file_paths"] if os.path.isfile(fp)]
+        if not os.path.isdir(root):
+            raise ValueError(f"'{root}' is not a valid directory")
+        return self.vector_store.collect_files(root, params.get("ignore_folders"))
+
+    def _run(self, job: IngestJob) -> None:
+        clone_dir = None
+        try:
+            if job.kind == "github":
+                scrapper = GithubScrapper()
+                scrapper.set_repositories(
+                    [GitHubSource(url=job.params["url"], branch=job.params["branch"])]
+                )
+                clone_dir = scrapper.clone_all()
+                root = clone_dir
+            elif job.kind == "upload":
+                root = job.params["dir"]
+            else:
+                root = job.params.get("data_path")
+
+            def key(path: str) -> str:
+                return os.path.relpath(path, root) if root else path
+
+            files = self._resolve_files(job, root)
+            done = self._journal.done_files(job.id)
+            self._journal.set_files_total(job.id, len(files))
+            pending = [fp for fp in files if key(fp) not in done]
+
+            def on_file_done(path: str, n_chunks: int, error: Optional[str]) -> None:
+                self._journal.record_file(job.id, key(path), n_chunks)
+                if error:
+                    self._journal.add_error(job.id, f"{key(path)}: {error}")
+
+            self.vector_store.ingest_files(
+                pending,
+                on_file_done=on_file_done,
+                should_stop=lambda: self._journal.cancel_requested(job.id),
+            )
+        finally:
+            if clone_dir:
+                shutil.rmtree(clone_dir, ignore_errors=True)
+
+        cancelled = self._journal.cancel_requested(job.id)
+        self._finish(job, CANCELLED if cancelled else SUCCEEDED)
+        job = self._journal.get(job.id)
+        logging.info(
+            f"Ingestion job {job.id} {job.status}: {job.files_done}/{job.files_total} "
+            f"files, {job.chunks_embedded} chunks"
+        )
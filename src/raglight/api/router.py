@@ -1,24 +1,46 @@
 import asyncio
 import json
+import logging
 import os
 import shutil
 import tempfile
-import threading
-from typing import List, Optional
+import uuid
+from typing import Any, Callable, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, File, HTTPException, Request, UploadFile
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
 from starlette.concurrency import run_in_threadpool
 
 from ..document_processing.document_processor_factory import DocumentProcessorFactory
 from ..models.data_source_model import GitHubSource
 from ..rag.builder import Builder
 from ..scrapper.github_scrapper import GithubScrapper
+from ..vectorstore.vector_store import VectorStore
+from ..observability.metrics import CONTENT_TYPE, REGISTRY
+from .admission import (
+    GENERATE,
+    INGEST,
+    SEARCH,
+    STREAM,
+    get_admission,
+    update_queue_metrics,
+)
+from .concurrency import Ticket
+from .ingest_jobs import IngestJob, IngestJobManager
+from .search_cache import SearchCache
+from .server_config import ServerConfig
+from .uploads import MB, UploadError, UploadSpooler, UploadTooLargeError
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of queries in one /search/batch request.
+MAX_SEARCH_BATCH = 64
 
 
 class GenerateRequest(BaseModel):
     question: str
+    session_id: Optional[str] = None
 
 
 class GenerateResponse(BaseModel):
@@ -36,6 +58,63 @@ class IngestResponse(BaseModel):
     message: str
 
 
+class IngestJobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    files_total: int
+    files_done: int
+    chunks_embedded: int
+    throughput: float
+    errors: List[str]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @classmethod
+    def from_job(cls, job: IngestJob) -> "IngestJobResponse":
+        return cls(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            files_total=job.files_total,
+            files_done=job.files_done,
+            chunks_embedded=job.chunks_embedded,
+            throughput=job.throughput,
+            errors=list(job.errors),
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+
+class SearchRequest(BaseModel):
+    query: str
+    k: int = Field(default=5, ge=1, le=100)
+    filter: Optional[Dict[str, Any]] = None
+    collection: Optional[str] = None
+    search_type: Optional[Literal["semantic", "bm25", "hybrid"]] = None
+
+
+class SearchHit(BaseModel):
+    id: Optional[str] = None
+    content: str
+    metadata: Dict[str, Any]
+    score: Optional[float] = None
+
+
+class SearchResponse(BaseModel):
+    results: List[SearchHit]
+
+
+class BatchSearchRequest(BaseModel):
+    requests: List[SearchRequest] = Field(min_length=1, max_length=MAX_SEARCH_BATCH)
+
+
+class BatchSearchResponse(BaseModel):
+    responses: List[SearchResponse]
+
+
 class CollectionsResponse(BaseModel):
     collections: list
 
@@ -52,6 +131,152 @@ class LLMConfigResponse(BaseModel):
     llm_api_base: Optional[str] = None
 
 
+class _LimitedStreamingResponse(StreamingResponse):
+    """Streaming response that gives its concurrency ticket back however it ends."""
+
+    def __init__(self, *args, ticket: Ticket, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.ticket.release()
+
+
+_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {
+                            "type": "array",
+                            "items": {"type": "string", "format": "binary"},
+                        }
+                    },
+                }
+            }
+        }
+    }
+}
+
+
+def _upload_spooler(request: Request, dest_dir: str) -> UploadSpooler:
+    config = getattr(request.app.state, "server_config", None) or ServerConfig()
+    return UploadSpooler(
+        dest_dir,
+        max_file_size=config.max_upload_file_mb * MB,
+        max_total_size=config.max_upload_total_mb * MB,
+    )
+
+
+def _get_search_cache(request: Request) -> SearchCache:
+    """
+    Returns the search cache of the app, creating it from its config if needed.
+
+    The app lifespan creates it; only call this from the event loop, never from a
+    worker thread.
+    """
+    state = request.app.state
+    cache = getattr(state, "search_cache", None)
+    if cache is None:
+        config = getattr(state, "server_config", None) or ServerConfig()
+        cache = SearchCache(
+            max_entries=config.search_cache_size, ttl=config.search_cache_ttl
+        )
+        state.search_cache = cache
+    return cache
+
+
+def _search_key(body: SearchRequest) -> str:
+    return SearchCache.make_key(
+        body.query, body.k, body.filter, body.collection, body.search_type
+    )
+
+
+def _search(
+    vector_store: VectorStore, cache: SearchCache, body: SearchRequest
+) -> SearchResponse:
+    key = _search_key(body)
+    generation = vector_store.index_generation
+    results = cache.get(key, generation)
+    if results is None:
+        scored = vector_store.similarity_search_with_scores(
+            body.query,
+            k=body.k,
+            filter=body.filter,
+            collection_name=body.collection,
+            search_type=body.search_type,
+        )
+        results = [
+            {
+                "id": doc.id,
+                "content": doc.page_content,
+                "metadata": doc.metadata,
+                "score": score,
+            }
+            for doc, score in scored
+        ]
+        cache.set(key, generation, results)
+    return SearchResponse(results=[SearchHit(**hit) for hit in results])
+
+
+def _search_batch(
+    vector_store: VectorStore, cache: SearchCache, items: List[SearchRequest]
+) -> List[SearchResponse]:
+    """
+    Runs the searches of a batch one after the other, after embedding the queries
+    that are not already cached in a single model call.
+    """
+    generation = vector_store.index_generation
+    vector_store.embed_queries(
+        [
+            item.query
+            for item in items
+            if (item.search_type or vector_store.search_type) != "bm25"
+            and not cache.contains(_search_key(item), generation)
+        ]
+    )
+    return [_search(vector_store, cache, item) for item in items]
+
+
+async def _run_in_slot(ticket: Ticket, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Runs blocking work in the threadpool within the deadline of a held ticket.
+
+    A worker thread cannot be interrupted: past the deadline the request gets ``504``,
+    but the ticket is only released once the thread finishes, so abandoned work still
+    counts against the concurrency cap of its route class.
+    """
+
+    def _done(future: asyncio.Future) -> None:
+        ticket.release()
+        if not future.cancelled():
+            future.exception()  # Retrieved here when nobody awaits it any more.
+
+    try:
+        work = asyncio.ensure_future(run_in_threadpool(func, *args))
+    except BaseException:
+        ticket.release()
+        raise
+    work.add_done_callback(_done)
+    try:
+        return await asyncio.wait_for(asyncio.shield(work), ticket.remaining())
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Search deadline exceeded")
+
+
+def _get_ingest_jobs(request: Request) -> IngestJobManager:
+    jobs = getattr(request.app.state, "ingest_jobs", None)
+    if jobs is None:
+        raise HTTPException(status_code=503, detail="Ingestion jobs are not enabled")
+    return jobs
+
+
 def create_router() -> APIRouter:
     router = APIRouter()
 
@@ -62,41 +287,55 @@ def create_router() -> APIRouter:
     @router.post("/generate", response_model=GenerateResponse)
     async def generate(request: Request, body: GenerateRequest):
         pipeline = request.app.state.pipeline
+        ticket = await get_admission(request).admit(GENERATE, request)
         try:
-            answer = await run_in_threadpool(pipeline.generate, body.question)
+            answer = await asyncio.wait_for(
+                pipeline.agenerate(body.question, session_id=body.session_id),
+                ticket.remaining(),
+            )
             return GenerateResponse(answer=answer)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Generation deadline exceeded")
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            ticket.release()
 
     @router.post("/generate/stream")
     async def generate_stream(request: Request, body: GenerateRequest):
         pipeline = request.app.state.pipeline
-        loop = asyncio.get_running_loop()
-        queue: asyncio.Queue = asyncio.Queue()
+        ticket = await get_admission(request).admit(STREAM, request)
 
-        def produce():
+        async def event_stream():
+            stream = pipeline.agenerate_streaming(
+                body.question, session_id=body.session_id
+            )
             try:
-                for chunk in pipeline.generate_streaming(body.question):
-                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            stream.__anext__(), ticket.remaining()
+                        )
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        yield f"data: {json.dumps({'error': 'Generation deadline exceeded'})}\n\n"
+                        break
+                    if await request.is_disconnected():
+                        logger.info("Client disconnected, cancelling generation")
+                        return
+                    yield f"data: {json.dumps({'chunk': chunk})}\n\n"
             except Exception as e:
-                loop.call_soon_threadsafe(queue.put_nowait, {"error": str(e)})
+                yield f"data: {json.dumps({'error': str(e)})}\n\n"
             finally:
-                loop.call_soon_threadsafe(queue.put_nowait, None)
-
-        threading.Thread(target=produce, daemon=True).start()
-
-        async def event_stream():
-            while True:
-                item = await queue.get()
-                if item is None:
-                    break
-                if isinstance(item, dict) and "error" in item:
-                    yield f"data: {json.dumps({'error': item['error']})}\n\n"
-                    break
-                yield f"data: {json.dumps({'chunk': item})}\n\n"
+                # Closing the generator propagates into the LLM stream and stops it.
+                await stream.aclose()
+                ticket.release()
             yield "data: [DONE]\n\n"
 
-        return StreamingResponse(event_stream(), media_type="text/event-stream")
+        return _LimitedStreamingResponse(
+            event_stream(), ticket=ticket, media_type="text/event-stream"
+        )
 
     @router.post("/ingest", response_model=IngestResponse)
     async def ingest(request: Request, body: IngestRequest):
@@ -124,6 +363,10 @@ def create_router() -> APIRouter:
                     vector_store.add_class_documents(classes)
 
         def _do_ingest():
+            with vector_store.ingest_lock:
+                _ingest_sources()
+
+        def _ingest_sources():
             if body.data_path:
                 vector_store.ingest(data_path=body.data_path)
             if body.file_paths:
@@ -138,73 +381,173 @@ def create_router() -> APIRouter:
                 finally:
                     shutil.rmtree(repos_path, ignore_errors=True)
 
+        ticket = await get_admission(request).admit(INGEST, request)
         try:
             await run_in_threadpool(_do_ingest)
             return IngestResponse(message="Ingestion completed successfully")
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            ticket.release()
 
     @router.post(
         "/ingest/upload",
         response_model=IngestResponse,
-        openapi_extra={
-            "requestBody": {
-                "content": {
-                    "multipart/form-data": {
-                        "schema": {
-                            "type": "object",
-                            "required": ["files"],
-                            "properties": {
-                                "files": {
-                                    "type": "array",
-                                    "items": {"type": "string", "format": "binary"},
-                                }
-                            },
-                        }
-                    }
-                }
-            }
-        },
+        openapi_extra=_UPLOAD_OPENAPI,
     )
-    async def ingest_upload(request: Request, files: List[UploadFile] = File(...)):
-        if not files:
-            raise HTTPException(status_code=400, detail="No files provided")
+    async def ingest_upload(request: Request):
+        vector_store = request.app.state.pipeline.get_vector_store()
+        spooler = _upload_spooler(request, tempfile.mkdtemp(prefix="raglight_upload_"))
+        ticket: Optional[Ticket] = None
+        ingesting: Optional[asyncio.Future] = None
+        names: List[str] = []
+
+        def _ingest(path: str) -> None:
+            try:
+                vector_store.ingest_files([path])
+            finally:
+                os.remove(path)
 
-        pipeline = request.app.state.pipeline
-        vector_store = pipeline.get_vector_store()
+        try:
+            spooler.check_content_length(request)
+            # The body is only read once admitted, so the queue must not poll for
+            # disconnects: that would consume body chunks.
+            ticket = await get_admission(request).admit(
+                INGEST, request, watch_disconnect=False
+            )
+            # Each file is ingested as soon as it is received, while the next one is
+            # still being spooled.
+            async for path in spooler.files(request):
+                if ingesting is not None:
+                    await ingesting
+                names.append(os.path.basename(path))
+                ingesting = asyncio.ensure_future(run_in_threadpool(_ingest, path))
+            if ingesting is not None:
+                await ingesting
+                ingesting = None
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except UploadError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            if ingesting is not None:
+                await asyncio.gather(ingesting, return_exceptions=True)
+            shutil.rmtree(spooler.dest_dir, ignore_errors=True)
+            if ticket is not None:
+                ticket.release()
+
+        if not names:
+            raise HTTPException(status_code=400, detail="No files provided")
+        return IngestResponse(
+            message=f"Ingested {len(names)} file(s): {', '.join(names)}"
+        )
 
-        # Read all file contents while still in async context
-        saved: List[tuple[str, bytes]] = []
-        for upload in files:
-            content = await upload.read()
-            saved.append((upload.filename or "upload", content))
+    @router.post("/ingest/jobs", response_model=IngestJobResponse, status_code=202)
+    async def submit_ingest_job(request: Request, body: IngestRequest):
+        sources = [s for s in (body.data_path, body.file_paths, body.github_url) if s]
+        if len(sources) != 1:
+            raise HTTPException(
+                status_code=400,
+                detail="Provide exactly one of: data_path, file_paths, github_url",
+            )
+        jobs = _get_ingest_jobs(request)
+        if body.data_path:
+            job = jobs.submit("data_path", {"data_path": body.data_path})
+        elif body.file_paths:
+            job = jobs.submit("file_paths", {"file_paths": body.file_paths})
+        else:
+            job = jobs.submit(
+                "github", {"url": body.github_url, "branch": body.github_branch}
+            )
+        return IngestJobResponse.from_job(job)
 
-        def _do_upload():
-            factory = DocumentProcessorFactory()
-            tmp_dir = tempfile.mkdtemp(prefix="raglight_upload_")
-            try:
-                for filename, content in saved:
-                    dest = os.path.join(tmp_dir, filename)
-                    os.makedirs(os.path.dirname(dest), exist_ok=True)
-                    with open(dest, "wb") as f:
-                        f.write(content)
-                    chunks, classes = vector_store._process_file(
-                        dest, factory, vector_store._flatten_metadata
-                    )
-                    if chunks:
-                        vector_store.add_documents(chunks)
-                    if classes:
-                        vector_store.add_class_documents(classes)
-            finally:
-                shutil.rmtree(tmp_dir, ignore_errors=True)
+    @router.post(
+        "/ingest/jobs/upload",
+        response_model=IngestJobResponse,
+        status_code=202,
+        openapi_extra=_UPLOAD_OPENAPI,
+    )
+    async def submit_upload_job(request: Request):
+        jobs = _get_ingest_jobs(request)
+        job_id = uuid.uuid4().hex
+        spooler = _upload_spooler(request, jobs.new_upload_dir(job_id))
+        try:
+            spooler.check_content_length(request)
+            files = [path async for path in spooler.files(request)]
+        except UploadError as e:
+            shutil.rmtree(spooler.dest_dir, ignore_errors=True)
+            status = 413 if isinstance(e, UploadTooLargeError) else 400
+            raise HTTPException(status_code=status, detail=str(e))
+        except Exception as e:
+            shutil.rmtree(spooler.dest_dir, ignore_errors=True)
+            raise HTTPException(status_code=500, detail=str(e))
+        if not files:
+            shutil.rmtree(spooler.dest_dir, ignore_errors=True)
+            raise HTTPException(status_code=400, detail="No files provided")
+        job = jobs.submit("upload", {"dir": spooler.dest_dir}, job_id=job_id)
+        return IngestJobResponse.from_job(job)
+
+    @router.get("/ingest/jobs", response_model=List[IngestJobResponse])
+    async def list_ingest_jobs(request: Request):
+        return [IngestJobResponse.from_job(j) for j in _get_ingest_jobs(request).list()]
+
+    @router.get("/ingest/jobs/{job_id}", response_model=IngestJobResponse)
+    async def get_ingest_job(request: Request, job_id: str):
+        job = _get_ingest_jobs(request).get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+        return IngestJobResponse.from_job(job)
+
+    @router.post("/ingest/jobs/{job_id}/cancel", response_model=IngestJobResponse)
+    async def cancel_ingest_job(request: Request, job_id: str):
+        job = _get_ingest_jobs(request).cancel(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+        return IngestJobResponse.from_job(job)
+
+    @router.post("/search", response_model=SearchResponse)
+    async def search(request: Request, body: SearchRequest):
+        vector_store = request.app.state.pipeline.get_vector_store()
+        cache = _get_search_cache(request)
+        ticket = await get_admission(request).admit(SEARCH, request)
+        try:
+            return await _run_in_slot(ticket, _search, vector_store, cache, body)
+        except HTTPException:
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
+    @router.post("/search/batch", response_model=BatchSearchResponse)
+    async def search_batch(request: Request, body: BatchSearchRequest):
+        vector_store = request.app.state.pipeline.get_vector_store()
+        cache = _get_search_cache(request)
+        ticket = await get_admission(request).admit(SEARCH, request)
         try:
-            await run_in_threadpool(_do_upload)
-            names = ", ".join(name for name, _ in saved)
-            return IngestResponse(message=f"Ingested {len(saved)} file(s): {names}")
+            responses = await _run_in_slot(
+                ticket, _search_batch, vector_store, cache, body.requests
+            )
+            return BatchSearchResponse(responses=responses)
+        except HTTPException:
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/metrics")
+    async def metrics(request: Request):
+        update_queue_metrics(get_admission(request))
+        jobs = getattr(request.app.state, "ingest_jobs", None)
+        if jobs is not None:
+            jobs.update_metrics()
+        return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
     @router.get("/collections", response_model=CollectionsResponse)
     async def collections(request: Request):
         pipeline = request.app.state.pipeline
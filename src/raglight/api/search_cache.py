@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..observability.metrics import record_cache_lookup
+
+
+class SearchCache:
+    """
+    Thread-safe, bounded LRU cache of ``/search`` results.
+
+    Entries are keyed by the normalized request and tagged with the
+    ``index_generation`` of the vector store they were computed on, so that any
+    ingestion into the index makes them stale without an explicit flush.
+
+    The index generation is a per-process counter, so it only sees writes made
+    through the same ``VectorStore`` instance. Writes from other API workers, the CLI
+    or ingestion jobs of another process are only picked up once entries expire
+    after ``ttl``.
+
+    Attributes:
+        max_entries (int): Maximum number of cached requests. 0 disables the cache.
+        ttl (Optional[float]): Lifetime of an entry in seconds. None means no expiry.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to query the vector store.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 300) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Tuple[Any, float, List[Dict[str, Any]]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _is_fresh(
+        self, entry: Optional[Tuple[Any, float, Any]], index_generation: Any
+    ) -> bool:
+        if entry is None or entry[0] != index_generation:
+            return False
+        return self.ttl is None or time.monotonic() - entry[1] <= self.ttl
+
+    @staticmethod
+    def make_key(
+        query: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection: Optional[str],
+        search_type: Optional[str],
+    ) -> str:
+        """
+        Builds the cache key of a request. Whitespace in the query and the order of
+        the filter keys do not change the key.
+        """
+        return json.dumps(
+            [" ".join(query.split()), k, filter or {}, collection, search_type],
+            sort_keys=True,
+            default=str,
+        )
+
+    def get(self, key: str, index_generation: Any) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not self._is_fresh(entry, index_generation):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                record_cache_lookup("search", False)
+                return None
+            self.hits += 1
+            record_cache_lookup("search", True)
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def contains(self, key: str, index_generation: Any) -> bool:
+        """
+        Whether a fresh entry exists, without counting a lookup.
+        """
+        with self._lock:
+            return self._is_fresh(self._entries.get(key), index_generation)
+
+    def set(
+        self, key: str, index_generation: Any, results: List[Dict[str, Any]]
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (index_generation, time.monotonic(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -6,6 +6,20 @@ from ..config.langfuse_config import LangfuseConfig
 from ..config.settings import Settings
 from ..config.rag_config import RAGConfig
 from ..config.vector_store_config import VectorStoreConfig
+from ..cross_encoder.cross_encoder_model import CrossEncoderModel
+from ..rag.session_store import (
+    InMemorySessionStore,
+    SessionStore,
+    SQLiteSessionStore,
+)
+
+
+def _optional_float(name: str, default: Optional[float]) -> Optional[float]:
+    """Reads a float env var where an empty value or 0 means "no limit"."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return float(value) or None if value.strip() else None
 
 
 @dataclass
@@ -38,6 +52,14 @@ class ServerConfig:
             "RAGLIGHT_EMBEDDINGS_API_BASE", Settings.DEFAULT_OLLAMA_CLIENT
         )
     )
+    # Socket of a `raglight model-server` shared by the workers. When set, the
+    # embeddings (and the cross encoder, if configured) are served by it.
+    model_server: Optional[str] = field(
+        default_factory=lambda: os.environ.get("RAGLIGHT_MODEL_SERVER") or None
+    )
+    cross_encoder_model: Optional[str] = field(
+        default_factory=lambda: os.environ.get("RAGLIGHT_CROSS_ENCODER_MODEL") or None
+    )
     persist_dir: str = field(
         default_factory=lambda: os.environ.get("RAGLIGHT_PERSIST_DIR", "./raglight_db")
     )
@@ -67,6 +89,98 @@ class ServerConfig:
             else None
         )
     )
+    quantization: Optional[str] = field(
+        default_factory=lambda: os.environ.get("RAGLIGHT_QUANTIZATION") or None
+    )
+    search_dimensions: Optional[int] = field(
+        default_factory=lambda: (
+            int(os.environ.get("RAGLIGHT_SEARCH_DIMENSIONS"))
+            if os.environ.get("RAGLIGHT_SEARCH_DIMENSIONS")
+            else None
+        )
+    )
+    session_db: Optional[str] = field(
+        default_factory=lambda: os.environ.get("RAGLIGHT_SESSION_DB") or None
+    )
+    max_history: int = field(
+        default_factory=lambda: int(os.environ.get("RAGLIGHT_MAX_HISTORY", "20"))
+    )
+    max_sessions: int = field(
+        default_factory=lambda: int(os.environ.get("RAGLIGHT_MAX_SESSIONS", "10000"))
+    )
+    max_concurrent_generate: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_MAX_CONCURRENT_GENERATE", "8")
+        )
+    )
+    max_queued_generate: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_MAX_QUEUED_GENERATE", "32")
+        )
+    )
+    generate_timeout: Optional[float] = field(
+        default_factory=lambda: _optional_float("RAGLIGHT_GENERATE_TIMEOUT", 120.0)
+    )
+    max_concurrent_streams: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_MAX_CONCURRENT_STREAMS", "32")
+        )
+    )
+    max_queued_streams: int = field(
+        default_factory=lambda: int(os.environ.get("RAGLIGHT_MAX_QUEUED_STREAMS", "64"))
+    )
+    stream_timeout: Optional[float] = field(
+        default_factory=lambda: _optional_float("RAGLIGHT_STREAM_TIMEOUT", 300.0)
+    )
+    max_concurrent_ingest: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_MAX_CONCURRENT_INGEST", "1")
+        )
+    )
+    max_queued_ingest: int = field(
+        default_factory=lambda: int(os.environ.get("RAGLIGHT_MAX_QUEUED_INGEST", "8"))
+    )
+    # Ingestion runs in a worker thread that cannot be interrupted, so only the time
+    # spent waiting in the queue is bounded.
+    ingest_queue_timeout: Optional[float] = field(
+        default_factory=lambda: _optional_float("RAGLIGHT_INGEST_QUEUE_TIMEOUT", 600.0)
+    )
+    max_concurrent_search: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_MAX_CONCURRENT_SEARCH", "16")
+        )
+    )
+    max_queued_search: int = field(
+        default_factory=lambda: int(os.environ.get("RAGLIGHT_MAX_QUEUED_SEARCH", "64"))
+    )
+    # Past the deadline a search answers 504, but its worker thread cannot be
+    # interrupted: it keeps its slot until it finishes.
+    search_timeout: Optional[float] = field(
+        default_factory=lambda: _optional_float("RAGLIGHT_SEARCH_TIMEOUT", 30.0)
+    )
+    search_cache_size: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_SEARCH_CACHE_SIZE", "1024")
+        )
+    )
+    # The cache only sees ingestions made by its own process: the TTL bounds how long
+    # writes from other workers or processes go unnoticed.
+    search_cache_ttl: Optional[float] = field(
+        default_factory=lambda: _optional_float("RAGLIGHT_SEARCH_CACHE_TTL", 300.0)
+    )
+    max_upload_file_mb: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_MAX_UPLOAD_FILE_MB", "100")
+        )
+    )
+    max_upload_total_mb: int = field(
+        default_factory=lambda: int(
+            os.environ.get("RAGLIGHT_MAX_UPLOAD_TOTAL_MB", "1024")
+        )
+    )
+    jobs_dir: str = field(
+        default_factory=lambda: os.environ.get("RAGLIGHT_JOBS_DIR", "./raglight_jobs")
+    )
     langfuse_host: Optional[str] = field(
         default_factory=lambda: os.environ.get("LANGFUSE_HOST")
         or os.environ.get("LANGFUSE_BASE_URL")
@@ -79,6 +193,21 @@ class ServerConfig:
         default_factory=lambda: os.environ.get("LANGFUSE_SECRET_KEY") or None
     )
 
+    def validate(self) -> None:
+        """
+        Checks settings that cannot be used together.
+
+        Raises:
+            ValueError: If a model server is set with a non-HuggingFace embeddings
+                provider. The model server only hosts HuggingFace models.
+        """
+        if self.model_server and self.embeddings_provider != Settings.HUGGINGFACE:
+            raise ValueError(
+                "RAGLIGHT_MODEL_SERVER serves HuggingFace embeddings only, but "
+                f"RAGLIGHT_EMBEDDINGS_PROVIDER is {self.embeddings_provider!r}. Unset "
+                "RAGLIGHT_MODEL_SERVER or use the HuggingFace provider."
+            )
+
     def _build_langfuse_config(self) -> Optional[LangfuseConfig]:
         if self.langfuse_host and self.langfuse_public_key and self.langfuse_secret_key:
             return LangfuseConfig(
@@ -88,6 +217,30 @@ class ServerConfig:
             )
         return None
 
+    def _build_session_store(self) -> SessionStore:
+        if self.session_db:
+            return SQLiteSessionStore(self.session_db, max_history=self.max_history)
+        return InMemorySessionStore(
+            max_history=self.max_history, max_sessions=self.max_sessions
+        )
+
+    def _build_cross_encoder(self) -> Optional[CrossEncoderModel]:
+        if not self.cross_encoder_model:
+            return None
+        if self.model_server:
+            from ..cross_encoder.model_server_cross_encoder import (
+                ModelServerCrossEncoderModel,
+            )
+
+            return ModelServerCrossEncoderModel(
+                self.cross_encoder_model, address=self.model_server
+            )
+        from ..cross_encoder.huggingface_cross_encoder import (
+            HuggingfaceCrossEncoderModel,
+        )
+
+        return HuggingfaceCrossEncoderModel(self.cross_encoder_model)
+
     def to_rag_config(self) -> RAGConfig:
         return RAGConfig(
             llm=self.llm_model,
@@ -95,17 +248,26 @@ class ServerConfig:
             api_base=self.llm_api_base,
             system_prompt=self.system_prompt,
             k=self.k,
+            cross_encoder_model=self._build_cross_encoder(),
             langfuse_config=self._build_langfuse_config(),
+            max_history=self.max_history,
+            session_store=self._build_session_store(),
+            shared_history=False,
         )
 
     def to_vector_store_config(self) -> VectorStoreConfig:
+        self.validate()
         return VectorStoreConfig(
             embedding_model=self.embeddings_model,
-            provider=self.embeddings_provider,
-            api_base=self.embeddings_api_base,
+            provider=(
+                Settings.MODEL_SERVER if self.model_server else self.embeddings_provider
+            ),
+            api_base=self.model_server or self.embeddings_api_base,
             persist_directory=self.persist_dir if not self.db_host else None,
             host=self.db_host,
             port=self.db_port,
             database=self.db,
             collection_name=self.collection,
+            quantization=self.quantization,
+            search_dimensions=self.search_dimensions,
         )
@@ -0,0 +1,201 @@
+import os
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
+
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+MB = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Raised when a multipart upload is malformed."""
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an uploaded file, or the whole upload, exceeds its size limit."""
+
+
+def safe_filename(filename: Optional[str]) -> str:
+    """
+    Keeps only the final component of a client-supplied filename, so that it cannot
+    point outside the spool directory.
+    """
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    return name if name not in ("", ".", "..") else "upload"
+
+
+class UploadSpooler:
+    """
+    Streams the files of a ``multipart/form-data`` request body to disk, chunk by chunk.
+
+    The body is parsed as it arrives and each file is written straight to
+    ``dest_dir``, so memory use does not depend on the size of the upload. Files are
+    yielded as soon as their last byte is written, letting the caller start ingesting
+    them while the rest of the body is still being received. Size limits are enforced
+    while receiving, before a too large upload is fully read.
+
+    Attributes:
+        dest_dir (str): Directory the files are written to.
+        max_file_size (Optional[int]): Maximum size of one file in bytes.
+        max_total_size (Optional[int]): Maximum size of all files together in bytes.
+        field_name (str): Name of the form field holding the files.
+    """
+
+    def __init__(
+        self,
+        dest_dir: str,
+        max_file_size: Optional[int] = None,
+        max_total_size: Optional[int] = None,
+        field_name: str = "files",
+    ) -> None:
+        self.dest_dir = dest_dir
+        self.max_file_size = max_file_size
+        self.max_total_size = max_total_size
+        self.field_name = field_name
+        self.total_size = 0
+
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._file: Optional[BinaryIO] = None
+        self._path: Optional[str] = None
+        self._file_size = 0
+        # Parser callbacks are synchronous: they only record what to write, and the
+        # writes happen in a worker thread once the chunk has been parsed.
+        self._pending_writes: List[Tuple[BinaryIO, bytes]] = []
+        self._completed: List[str] = []
+
+    def check_content_length(self, request: Request) -> None:
+        """
+        Refuses an upload whose declared ``Content-Length`` is already over the total limit.
+
+        Raises:
+            UploadTooLargeError: If the declared body size exceeds ``max_total_size``.
+        """
+        length = request.headers.get("content-length")
+        if self.max_total_size and length and length.isdigit():
+            if int(length) > self.max_total_size:
+                raise UploadTooLargeError(
+                    f"Upload of {int(length)} bytes exceeds the limit of "
+                    f"{self.max_total_size} bytes"
+                )
+
+    def _unique_path(self, filename: str) -> str:
+        stem, ext = os.path.splitext(filename)
+        path = os.path.join(self.dest_dir, filename)
+        n = 1
+        while os.path.exists(path) or path in self._completed:
+            path = os.path.join(self.dest_dir, f"{stem}_{n}{ext}")
+            n += 1
+        return path
+
+    def _on_part_begin(self) -> None:
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if name != self.field_name or b"filename" not in options:
+            return
+        filename = safe_filename(options[b"filename"].decode("utf-8", errors="replace"))
+        self._path = self._unique_path(filename)
+        self._file = open(self._path, "wb")
+        self._file_size = 0
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._file is None:
+            return
+        size = end - start
+        self._file_size += size
+        self.total_size += size
+        if self.max_file_size and self._file_size > self.max_file_size:
+            raise UploadTooLargeError(
+                f"'{os.path.basename(self._path)}' exceeds the per-file limit of "
+                f"{self.max_file_size} bytes"
+            )
+        if self.max_total_size and self.total_size > self.max_total_size:
+            raise UploadTooLargeError(
+                f"Upload exceeds the total limit of {self.max_total_size} bytes"
+            )
+        self._pending_writes.append((self._file, data[start:end]))
+
+    def _on_part_end(self) -> None:
+        if self._file is None:
+            return
+        self._pending_writes.append((self._file, b""))
+        self._completed.append(self._path)
+        self._file = None
+        self._path = None
+
+    @staticmethod
+    def _flush(writes: List[Tuple[BinaryIO, bytes]]) -> None:
+        for handle, data in writes:
+            if data:
+                handle.write(data)
+            else:
+                handle.close()
+
+    async def files(self, request: Request) -> AsyncIterator[str]:
+        """
+        Receives the request body and yields the path of each file once fully written.
+
+        Raises:
+            UploadError: If the body is not a valid multipart upload.
+            UploadTooLargeError: If a size limit is exceeded. The partial file is removed.
+        """
+        content_type, params = parse_options_header(
+            request.headers.get("content-type", "")
+        )
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise UploadError("Expected a multipart/form-data body")
+
+        os.makedirs(self.dest_dir, exist_ok=True)
+        parser = MultipartParser(
+            params[b"boundary"],
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+        try:
+            async for chunk in request.stream():
+                try:
+                    parser.write(chunk)
+                except UploadTooLargeError:
+                    raise
+                except Exception as e:
+                    raise UploadError(f"Malformed multipart body: {e}") from e
+                writes, self._pending_writes = self._pending_writes, []
+                if writes:
+                    await run_in_threadpool(self._flush, writes)
+                completed, self._completed = self._completed, []
+                for path in completed:
+                    yield path
+            parser.finalize()
+        finally:
+            for handle, _ in self._pending_writes:
+                handle.close()
+            self._pending_writes = []
+            # Drop a file cut short by an error or a client disconnect.
+            if self._file is not None:
+                self._file.close()
+                os.remove(self._path)
+                self._file = None
@@ -689,6 +689,113 @@ def interactive_agentic_chat_command():
         raise typer.Exit(code=1)
 
 
+@app.command(name="model-server")
+def model_server_command(
+    socket: Optional[str] = typer.Option(
+        None, "--socket", help="Unix socket path (default: RAGLIGHT_MODEL_SERVER)"
+    ),
+    embeddings_model: Optional[str] = typer.Option(
+        None,
+        "--embeddings-model",
+        help="HuggingFace embeddings model (default: RAGLIGHT_EMBEDDINGS_MODEL)",
+    ),
+    cross_encoder_model: Optional[str] = typer.Option(
+        None,
+        "--cross-encoder-model",
+        help="HuggingFace cross encoder (default: RAGLIGHT_CROSS_ENCODER_MODEL)",
+    ),
+    max_batch_size: int = typer.Option(
+        64, "--max-batch-size", help="Maximum texts embedded per model call"
+    ),
+    max_wait_ms: float = typer.Option(
+        5.0, "--max-wait-ms", help="Time spent collecting a batch, in milliseconds"
+    ),
+):
+    """
+    Host the embeddings and cross encoder models once for all API workers.
+    Workers connect to it when RAGLIGHT_MODEL_SERVER is set to the socket path.
+    """
+    from raglight.embeddings.huggingface_embeddings import HuggingfaceEmbeddingsModel
+    from raglight.model_server.server import (
+        ModelServer,
+        ModelServerError,
+        authkey_from_env,
+        default_address,
+    )
+
+    load_dotenv(dotenv_path=Path(".env"))
+    try:
+        address = socket or os.environ.get("RAGLIGHT_MODEL_SERVER") or default_address()
+    except ModelServerError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1)
+    embeddings_model = embeddings_model or os.environ.get(
+        "RAGLIGHT_EMBEDDINGS_MODEL", Settings.DEFAULT_EMBEDDINGS_MODEL
+    )
+    cross_encoder_model = cross_encoder_model or os.environ.get(
+        "RAGLIGHT_CROSS_ENCODER_MODEL"
+    )
+
+    console.print("[bold magenta]🧠 RAGLight Model Server[/bold magenta]")
+    console.print(f"  Embeddings    : [cyan]{embeddings_model}[/cyan]")
+    cross_encoder = None
+    if cross_encoder_model:
+        from raglight.cross_encoder.huggingface_cross_encoder import (
+            HuggingfaceCrossEncoderModel,
+        )
+
+        console.print(f"  Cross encoder : [cyan]{cross_encoder_model}[/cyan]")
+        cross_encoder = HuggingfaceCrossEncoderModel(cross_encoder_model)
+    server = ModelServer(
+        HuggingfaceEmbeddingsModel(embeddings_model),
+        cross_encoder,
+        address=address,
+        authkey=authkey_from_env(),
+        max_batch_size=max_batch_size,
+        max_wait=max_wait_ms / 1000,
+    )
+    console.print(f"\n[bold green]Listening on {address}[/bold green]\n")
+    try:
+        server.serve_forever()
+    except ModelServerError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+def _start_model_server(address: str, timeout: float = 300.0):
+    """
+    Launches `raglight model-server` in a subprocess and waits until it answers on
+    its socket. A socket file alone may be left over from a previous run.
+    """
+    import subprocess
+    import sys
+    import time
+    from raglight.model_server.client import ModelServerClient
+    from raglight.model_server.server import INFO, ModelServerError
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "raglight.cli.main", "model-server", "--socket", address]
+    )
+    client = ModelServerClient(address)
+    deadline = time.monotonic() + timeout
+    while True:
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.terminate()
+            console.print("[bold red]❌ The model server failed to start[/bold red]")
+            raise typer.Exit(code=1)
+        try:
+            client.call(INFO)
+            break
+        except ModelServerError:
+            time.sleep(0.2)
+    client.close()
+    return proc
+
+
 @app.command(name="serve")
 def serve_command(
     host: str = typer.Option("0.0.0.0", "--host", help="Host to bind"),
@@ -699,6 +806,11 @@ def serve_command(
     workers: int = typer.Option(1, "--workers", help="Number of worker processes"),
     ui: bool = typer.Option(False, "--ui", help="Start Streamlit UI alongside the API"),
     ui_port: int = typer.Option(8501, "--ui-port", help="Port for the Streamlit UI"),
+    model_server: bool = typer.Option(
+        False,
+        "--model-server",
+        help="Load the models once in a shared model server instead of per worker",
+    ),
 ):
     """
     Start the RAGLight REST API server (configured via RAGLIGHT_* env vars).
@@ -713,7 +825,29 @@ def serve_command(
     from raglight.api.server_config import ServerConfig
 
     load_dotenv(dotenv_path=Path(".env"))
+    model_server_proc = None
+    if model_server:
+        import secrets
+        from raglight.model_server.server import ModelServerError, default_address
+
+        try:
+            address = os.environ.get("RAGLIGHT_MODEL_SERVER") or default_address()
+        except ModelServerError as e:
+            console.print(f"[bold red]❌ {e}[/bold red]")
+            raise typer.Exit(code=1)
+        # Inherited by the model server and the worker processes. A fresh secret
+        # per run keeps other local processes off the socket.
+        os.environ["RAGLIGHT_MODEL_SERVER"] = address
+        os.environ["RAGLIGHT_MODEL_SERVER_AUTHKEY"] = secrets.token_hex(32)
     config = ServerConfig()
+    try:
+        config.validate()
+    except ValueError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1)
+    if model_server:
+        console.print(f"⏳ Starting the model server on [cyan]{address}[/cyan]...")
+        model_server_proc = _start_model_server(address)
     display_host = "localhost" if host == "0.0.0.0" else host
 
     console.print("[bold magenta]🚀 RAGLight API Server[/bold magenta]")
@@ -723,6 +857,8 @@ def serve_command(
     console.print(
         f"  Embeddings   : [cyan]{config.embeddings_provider}[/cyan] / [cyan]{config.embeddings_model}[/cyan]"
     )
+    if config.model_server:
+        console.print(f"  Model server : [cyan]{config.model_server}[/cyan]")
     console.print(f"  Vector store : [cyan]{config.db}[/cyan]")
     if config.db_host:
         console.print(
@@ -743,14 +879,18 @@ def serve_command(
 
     if not ui:
         console.print(f"\n[bold green]Listening on http://{host}:{port}[/bold green]\n")
-        uvicorn.run(
-            "raglight.api.app:create_app",
-            factory=True,
-            host=host,
-            port=port,
-            reload=reload,
-            workers=workers if not reload else 1,
-        )
+        try:
+            uvicorn.run(
+                "raglight.api.app:create_app",
+                factory=True,
+                host=host,
+                port=port,
+                reload=reload,
+                workers=workers if not reload else 1,
+            )
+        finally:
+            if model_server_proc is not None:
+                model_server_proc.terminate()
         return
 
     console.print(f"\n  API  →  [bold green]http://{display_host}:{port}[/bold green]")
@@ -795,6 +935,8 @@ def serve_command(
     def _shutdown(sig, frame):
         api_proc.terminate()
         ui_proc.terminate()
+        if model_server_proc is not None:
+            model_server_proc.terminate()
 
     signal.signal(signal.SIGINT, _shutdown)
     signal.signal(signal.SIGTERM, _shutdown)
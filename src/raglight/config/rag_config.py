@@ -4,6 +4,8 @@ from typing import List, Optional, Union
 from ..config.settings import Settings
 from ..config.langfuse_config import LangfuseConfig
 from ..cross_encoder.cross_encoder_model import CrossEncoderModel
+from ..llm.response_cache import ResponseCache
+from ..rag.session_store import SessionStore
 from ..models.data_source_model import DataSource
 
 
@@ -22,3 +24,16 @@ class RAGConfig:
     langfuse_config: Optional[LangfuseConfig] = field(default=None)
     reformulation: bool = field(default=True)
     max_history: int = field(default=20)
+    rerank_candidates: Optional[int] = field(default=None)
+    rerank_batch_size: int = field(default=16)
+    rerank_patience: int = field(default=0)
+    rerank_min_score: Optional[float] = field(default=None)
+    context_max_tokens: Optional[int] = field(default=None)
+    context_duplicate_threshold: float = field(default=0.9)
+    semantic_cache: bool = field(default=False)
+    semantic_cache_threshold: float = field(default=0.95)
+    semantic_cache_ttl: Optional[float] = field(default=3600)
+    semantic_cache_max_entries: int = field(default=1024)
+    response_cache: Optional[ResponseCache] = field(default=None)
+    session_store: Optional[SessionStore] = field(default=None)
+    shared_history: bool = field(default=True)
@@ -19,6 +19,7 @@ class Settings:
 
     CHROMA = "Chroma"
     QDRANT = "Qdrant"
+    LOCAL = "Local"
     OLLAMA = "Ollama"
     MISTRAL = "Mistral"
     VLLM = "vLLM"
@@ -39,6 +40,7 @@ class Settings:
     MISTRAL_API_KEY = os.environ.get("MISTRAL_API_KEY", "")
     LMSTUDIO = "LmStudio"
     HUGGINGFACE = "HuggingFace"
+    MODEL_SERVER = "ModelServer"
     DEFAULT_LLM = "llama3.2:1b"
     DEFAULT_OPENAI_CLIENT = os.environ.get(
         "OPENAI_CLIENT_URL", "https://api.openai.com/v1"
@@ -193,6 +195,8 @@ class Settings:
     SEARCH_SEMANTIC = "semantic"
     SEARCH_BM25 = "bm25"
     SEARCH_HYBRID = "hybrid"
+    QUANTIZATION_SCALAR = "scalar"
+    QUANTIZATION_BINARY = "binary"
 
     DEFAULT_IGNORE_FOLDERS = [
         ".venv",
@@ -19,3 +19,5 @@ class VectorStoreConfig:
     )
     search_type: str = field(default=Settings.SEARCH_HYBRID)
     hybrid_alpha: float = 0.5
+    quantization: Optional[str] = None
+    search_dimensions: Optional[int] = None
@@ -1,6 +1,10 @@
 from __future__ import annotations
+import heapq
+import logging
 from abc import ABC, abstractmethod
-from typing import Any, List
+from typing import Any, List, Optional, Tuple
+
+from .score_cache import ScoreCache
 
 
 class CrossEncoderModel(ABC):
@@ -13,16 +17,27 @@ class CrossEncoderModel(ABC):
     Attributes:
         model_name (str): The name of the model.
         model (Any): The loaded model instance.
+        score_cache (ScoreCache): LRU cache of already computed (query, document) scores.
     """
 
-    def __init__(self, model_name: str) -> None:
+    def __init__(self, model_name: str, cache_size: int = 4096) -> None:
         """
         Initializes an CrossEncoderModel instance.
 
         Args:
             model_name (str): The name of the model to be loaded.
+            cache_size (int): Maximum number of (query, document) scores kept in memory.
+                Set to 0 to disable caching. Defaults to 4096.
         """
+        if (
+            not self.supports_scoring
+            and type(self).predict is CrossEncoderModel.predict
+        ):
+            raise TypeError(
+                f"{type(self).__name__} must implement _compute_scores or predict."
+            )
         self.model_name: str = model_name
+        self.score_cache: ScoreCache = ScoreCache(cache_size)
         self.model: Any = self.load()
 
     @abstractmethod
@@ -47,7 +62,109 @@ class CrossEncoderModel(ABC):
         """
         return self.model
 
-    @abstractmethod
+    @property
+    def supports_scoring(self) -> bool:
+        """
+        Whether the model scores (query, document) pairs, i.e. overrides
+        ``_compute_scores``. Models that only override ``predict`` cannot ``score`` or
+        ``rank``.
+        """
+        return type(self)._compute_scores is not CrossEncoderModel._compute_scores
+
+    def _compute_scores(self, query: str, documents: List[str]) -> List[float]:
+        """
+        Scores (query, document) pairs with the underlying model, bypassing the cache.
+
+        Concrete subclasses override this, or ``predict`` for models without scores.
+
+        Args:
+            query (str): The input query.
+            documents (List[str]): The document texts to score.
+
+        Returns:
+            List[float]: One relevance score per document.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not implement pairwise scoring."
+        )
+
+    def score(self, query: str, documents: List[str]) -> List[float]:
+        """
+        Returns the relevance score of each document for the query.
+
+        Scores already computed for the same (query, document) pair are served from
+        ``score_cache``; only missing pairs are sent to the model, in a single batch.
+
+        Args:
+            query (str): The input query.
+            documents (List[str]): The document texts to score.
+
+        Returns:
+            List[float]: One relevance score per document, in input order.
+        """
+        scores = self.score_cache.get_many(query, documents)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            missing_docs = [documents[i] for i in missing]
+            computed = [float(s) for s in self._compute_scores(query, missing_docs)]
+            self.score_cache.put_many(query, missing_docs, computed)
+            for i, score in zip(missing, computed):
+                scores[i] = score
+        return scores
+
+    def rank(
+        self,
+        query: str,
+        documents: List[str],
+        top_k: int,
+        batch_size: Optional[int] = None,
+        patience: int = 0,
+        min_score: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Ranks documents against the query and returns the indices and scores of the best ones.
+
+        Documents are expected in retrieval order. They are scored in batches of
+        ``batch_size`` and scoring stops early once ``patience`` consecutive batches left
+        the current top ``top_k`` unchanged, since later candidates are the weakest hits.
+
+        Args:
+            query (str): The input query.
+            documents (List[str]): The document texts to rank, best retrieval hits first.
+            top_k (int): The number of top results to return.
+            batch_size (Optional[int]): Documents scored per batch. None scores all at once.
+            patience (int): Unchanged batches before stopping. 0 disables early stopping.
+            min_score (Optional[float]): Results scoring below this threshold are dropped.
+
+        Returns:
+            List[Tuple[int, float]]: ``(index, score)`` pairs into ``documents``, best first.
+        """
+        batch_size = batch_size or max(1, len(documents))
+        scored: List[Tuple[float, int]] = []
+        top_indices: Optional[set] = None
+        stale_batches = 0
+        for start in range(0, len(documents), batch_size):
+            scores = self.score(query, documents[start : start + batch_size])
+            scored.extend((score, start + i) for i, score in enumerate(scores))
+
+            previous = top_indices
+            top_indices = {i for _, i in heapq.nlargest(top_k, scored)}
+            if previous is not None and top_indices == previous:
+                stale_batches += 1
+                if patience and stale_batches >= patience:
+                    logging.debug(
+                        f"Reranking stopped early after {len(scored)}/{len(documents)} documents."
+                    )
+                    break
+            else:
+                stale_batches = 0
+
+        return [
+            (i, score)
+            for score, i in heapq.nlargest(top_k, scored)
+            if min_score is None or score >= min_score
+        ]
+
     def predict(self, query: str, documents: List[str], top_k: int) -> List[str]:
         """
         Re-ranks the given documents against the query and returns the top_k most relevant.
@@ -60,4 +177,4 @@ class CrossEncoderModel(ABC):
         Returns:
             List[str]: The top_k re-ranked document texts.
         """
-        pass
+        return [documents[i] for i, _ in self.rank(query, documents, top_k)]
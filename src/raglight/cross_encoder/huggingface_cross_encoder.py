@@ -16,14 +16,15 @@ class HuggingfaceCrossEncoderModel(CrossEncoderModel):
         model_name (str): The name of the HuggingFace model to be loaded.
     """
 
-    def __init__(self, model_name: str) -> None:
+    def __init__(self, model_name: str, cache_size: int = 4096) -> None:
         """
         Initializes a HuggingfaceCrossEncoderModel instance.
 
         Args:
             model_name (str): The name of the HuggingFace model to load.
+            cache_size (int): Maximum number of (query, document) scores kept in memory.
         """
-        super().__init__(model_name)
+        super().__init__(model_name, cache_size=cache_size)
 
     @override
     def load(self) -> HuggingfaceCrossEncoderModel:
@@ -39,22 +40,9 @@ class HuggingfaceCrossEncoderModel(CrossEncoderModel):
         return CrossEncoder(self.model_name)
 
     @override
-    def predict(self, query: str, documents: List[str], top_k: int) -> List[str]:
+    def _compute_scores(self, query: str, documents: List[str]) -> List[float]:
         """
-        Predicts the similarity scores and returns the list of most relevant document texts.
-
-        Args:
-            query (str): The input query.
-            documents (List[str]): The list of document texts to rank.
-            top_k (int): The number of top results to return.
-
-        Returns:
-            List[str]: The list of top_k re-ranked document texts.
+        Scores (query, document) pairs in one batch with the HuggingFace cross encoder.
         """
-        # rank returns a list of dicts: [{'corpus_id': int, 'score': float, 'text': str}, ...]
-        results = self.model.rank(
-            query=query, documents=documents, top_k=top_k, return_documents=True
-        )
-
-        # We extract and return only the text strings
-        return [res["text"] for res in results]
+        scores = self.model.predict([(query, doc) for doc in documents])
+        return [float(s) for s in scores]
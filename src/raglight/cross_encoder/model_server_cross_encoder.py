@@ -0,0 +1,53 @@
+from __future__ import annotations
+from typing import List, Optional
+from typing_extensions import override
+
+from ..model_server.client import ModelServerClient
+from ..model_server.server import INFO, SCORE
+from .cross_encoder_model import CrossEncoderModel
+
+
+class ModelServerCrossEncoderModel(CrossEncoderModel):
+    """
+    Concrete implementation of the CrossEncoderModel delegating to a local ``ModelServer``.
+
+    Attributes:
+        model_name (str): The cross encoder the model server must host.
+        address (Optional[str]): Path of the model server Unix socket.
+    """
+
+    def __init__(
+        self, model_name: str, address: Optional[str] = None, cache_size: int = 4096
+    ) -> None:
+        """
+        Initializes a ModelServerCrossEncoderModel instance.
+
+        Args:
+            model_name (str): The cross encoder the model server must host.
+            address (Optional[str]): Path of the model server socket. Defaults to
+                the server's default socket.
+            cache_size (int): Maximum number of (query, document) scores kept in memory.
+        """
+        self.address = address
+        super().__init__(model_name, cache_size=cache_size)
+
+    @override
+    def load(self) -> ModelServerClient:
+        """
+        Connects to the model server and checks that it hosts ``model_name``.
+
+        Raises:
+            ValueError: If the server hosts another cross encoder, or none.
+        """
+        client = ModelServerClient(self.address)
+        hosted = client.call(INFO)["cross_encoder_model"]
+        if hosted != self.model_name:
+            raise ValueError(
+                f"The model server hosts cross encoder '{hosted}', "
+                f"not '{self.model_name}'"
+            )
+        return client
+
+    @override
+    def _compute_scores(self, query: str, documents: List[str]) -> List[float]:
+        return self.model.call(SCORE, query, documents)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..observability.metrics import CACHE_REQUESTS
+
+
+class ScoreCache:
+    """
+    Thread-safe, bounded LRU cache of cross-encoder scores.
+
+    Entries are keyed by ``(query, sha1(document))`` so that long chunk texts are not
+    kept in memory twice.
+
+    Attributes:
+        max_size (int): Maximum number of (query, document) pairs kept in the cache.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to be scored by the model.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._scores: OrderedDict[Tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str, document: str) -> Tuple[str, str]:
+        return query, hashlib.sha1(document.encode("utf-8")).hexdigest()
+
+    def get_many(self, query: str, documents: List[str]) -> List[Optional[float]]:
+        """
+        Looks up the scores of several documents for a query.
+
+        Returns:
+            List[Optional[float]]: The cached score of each document, or ``None`` when missing.
+        """
+        scores: List[Optional[float]] = []
+        with self._lock:
+            for document in documents:
+                key = self._key(query, document)
+                score = self._scores.get(key)
+                if score is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._scores.move_to_end(key)
+                scores.append(score)
+        hits = sum(score is not None for score in scores)
+        if hits:
+            CACHE_REQUESTS.inc(hits, cache="rerank_score", result="hit")
+        if len(scores) > hits:
+            CACHE_REQUESTS.inc(len(scores) - hits, cache="rerank_score", result="miss")
+        return scores
+
+    def put_many(self, query: str, documents: List[str], scores: List[float]) -> None:
+        """Stores the scores of several documents for a query, evicting the oldest pairs."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            for document, score in zip(documents, scores):
+                key = self._key(query, document)
+                self._scores[key] = float(score)
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._scores),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
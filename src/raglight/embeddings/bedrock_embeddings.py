@@ -11,8 +11,11 @@ except ImportError as e:
     ) from e
 
 from ..config.settings import Settings
+from ..observability.metrics import timed
 from .embeddings_model import EmbeddingsModel
 
+BEDROCK_EMBEDDINGS_MAX_TOKENS = 8192
+
 
 class BedrockEmbeddingsModel(EmbeddingsModel):
     """
@@ -29,16 +32,22 @@ class BedrockEmbeddingsModel(EmbeddingsModel):
         model (BedrockEmbeddings): The LangChain BedrockEmbeddings client.
     """
 
-    def __init__(self, model_name: str, region_name: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        model_name: str,
+        region_name: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> None:
         """
         Initializes a BedrockEmbeddingsModel instance.
 
         Args:
             model_name (str): The Bedrock embedding model ID.
             region_name (Optional[str]): AWS region. Defaults to AWS_DEFAULT_REGION env var or 'us-east-1'.
+            max_tokens (Optional[int]): Overrides the model's maximum input length in tokens.
         """
         self.region_name = region_name or Settings.AWS_DEFAULT_REGION
-        super().__init__(model_name)
+        super().__init__(model_name, max_tokens=max_tokens)
 
     @override
     def load(self) -> BedrockEmbeddings:
@@ -54,6 +63,14 @@ class BedrockEmbeddingsModel(EmbeddingsModel):
         )
 
     @override
+    def get_max_tokens(self) -> Optional[int]:
+        """
+        Returns the maximum input length in tokens (8192 for Titan Text Embeddings V2).
+        """
+        return self.max_tokens or BEDROCK_EMBEDDINGS_MAX_TOKENS
+
+    @override
+    @timed("embed_documents")
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         Embeds a list of documents using the Bedrock embedding model.
@@ -64,9 +81,10 @@ class BedrockEmbeddingsModel(EmbeddingsModel):
         Returns:
             List[List[float]]: List of embedding vectors.
         """
-        return self.model.embed_documents(texts)
+        return self.model.embed_documents([self.truncate(text) for text in texts])
 
     @override
+    @timed("embed_query")
     def embed_query(self, text: str) -> List[float]:
         """
         Embeds a single query text.
@@ -77,4 +95,4 @@ class BedrockEmbeddingsModel(EmbeddingsModel):
         Returns:
             List[float]: The embedding vector.
         """
-        return self.model.embed_query(text)
+        return self.model.embed_query(self.truncate(text))
@@ -1,6 +1,53 @@
 from __future__ import annotations
+import asyncio
+import logging
+import math
 from abc import ABC, abstractmethod
-from typing import Any, Optional, List
+from functools import lru_cache
+from typing import Any, Callable, Optional, List
+
+# Conservative characters-per-token ratio used when no tokenizer is available locally.
+APPROX_CHARS_PER_TOKEN = 3
+
+
+@lru_cache(maxsize=8)
+def get_tiktoken_encoding(model_name: Optional[str] = None) -> Optional[Any]:
+    """
+    Returns the cached tiktoken encoding of a model (``cl100k_base`` when the model is
+    unknown or not given), or None when tiktoken is unavailable.
+    """
+    try:
+        import tiktoken
+
+        if model_name:
+            try:
+                return tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken is optional and downloads encodings on first use, which fails offline.
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative character-based token count, for when no tokenizer is available."""
+    return math.ceil(len(text) / APPROX_CHARS_PER_TOKEN)
+
+
+def fitting_prefix_length(
+    text: str, max_tokens: int, count_tokens: Callable[[str], int]
+) -> int:
+    """
+    Returns the length in characters of the longest prefix of ``text`` that fits in
+    ``max_tokens``, as measured by ``count_tokens``.
+    """
+    n_tokens = count_tokens(text)
+    cut = len(text)
+    while n_tokens > max_tokens and cut > 1:
+        cut = max(1, min(cut - 1, int(cut * max_tokens / n_tokens * 0.95)))
+        n_tokens = count_tokens(text[:cut])
+    return cut
 
 
 class EmbeddingsModel(ABC):
@@ -14,18 +61,27 @@ class EmbeddingsModel(ABC):
         model_name (str): The name of the model.
         model (Any): The loaded model instance (e.g., Ollama Client).
         api_base (Optional[str]): The base URL for the API.
+        max_tokens (Optional[int]): Maximum input length in tokens. When ``None``,
+            the provider default returned by ``get_max_tokens`` is used.
     """
 
-    def __init__(self, model_name: str, api_base: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        model_name: str,
+        api_base: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> None:
         """
         Initializes an EmbeddingsModel instance.
 
         Args:
             model_name (str): The name of the model to be loaded.
             api_base (Optional[str]): The base URL for the API (optional).
+            max_tokens (Optional[int]): Overrides the model's maximum input length in tokens.
         """
         self.model_name: str = model_name
         self.api_base: Optional[str] = api_base
+        self.max_tokens: Optional[int] = max_tokens
         # Load the model immediately upon initialization
         self.model: Any = self.load()
 
@@ -68,6 +124,25 @@ class EmbeddingsModel(ABC):
         """
         pass
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds several query texts. Providers that can embed queries in a single call
+        override this; the default embeds them one by one.
+
+        Args:
+            texts (List[str]): The query texts to embed.
+
+        Returns:
+            List[List[float]]: One embedding per query, in input order.
+        """
+        return [self.embed_query(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Embeds a single query text without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.embed_query, text)
+
     def get_model(self) -> Any:
         """
         Retrieves the loaded embeddings model client.
@@ -76,3 +151,87 @@ class EmbeddingsModel(ABC):
             Any: The loaded model instance.
         """
         return self.model
+
+    def get_max_tokens(self) -> Optional[int]:
+        """
+        Returns the maximum number of tokens the model accepts for a single input.
+
+        Subclasses override this to expose the provider's limit. ``None`` means the
+        limit is unknown and inputs are sent unchanged.
+
+        Returns:
+            Optional[int]: The maximum sequence length in tokens.
+        """
+        return self.max_tokens
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Counts the tokens of a text as seen by the embedding model.
+
+        The default implementation is a conservative character-based estimate; subclasses
+        with access to the real tokenizer override it.
+
+        Args:
+            text (str): The text to measure.
+
+        Returns:
+            int: The number of tokens.
+        """
+        return estimate_tokens(text)
+
+    def _fitting_prefix_length(self, text: str, max_tokens: int) -> int:
+        """
+        Returns the length in characters of the longest prefix that fits in ``max_tokens``.
+        """
+        return fitting_prefix_length(text, max_tokens, self.count_tokens)
+
+    def truncate(self, text: str) -> str:
+        """
+        Truncates a text so that it fits in the model's maximum sequence length.
+
+        Args:
+            text (str): The text to truncate.
+
+        Returns:
+            str: The text, cut to the model's token limit if needed.
+        """
+        max_tokens = self.get_max_tokens()
+        if not max_tokens:
+            return text
+        cut = self._fitting_prefix_length(text, max_tokens)
+        if cut < len(text):
+            logging.debug(
+                f"Truncating embedding input from {len(text)} to {cut} characters."
+            )
+        return text[:cut]
+
+    def split_to_fit(self, text: str) -> List[str]:
+        """
+        Splits a text into consecutive pieces that each fit in the model's maximum
+        sequence length, preferably on whitespace boundaries.
+
+        Args:
+            text (str): The text to split.
+
+        Returns:
+            List[str]: The pieces, or ``[text]`` when it already fits.
+        """
+        max_tokens = self.get_max_tokens()
+        if not max_tokens:
+            return [text]
+
+        pieces: List[str] = []
+        rest = text
+        while rest:
+            cut = self._fitting_prefix_length(rest, max_tokens)
+            if cut >= len(rest) and not pieces:
+                return [text]
+            if cut < len(rest):
+                space = rest.rfind(" ", 0, cut)
+                if space > cut // 2:
+                    cut = space
+            piece = rest[:cut].strip()
+            if piece:
+                pieces.append(piece)
+            rest = rest[cut:]
+        return pieces
@@ -5,12 +5,20 @@ from typing_extensions import override
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
 from ..config.settings import Settings
+from ..observability.metrics import timed
 from .embeddings_model import EmbeddingsModel
 
+GEMINI_EMBEDDINGS_MAX_TOKENS = 2048
+
 
 class GeminiEmbeddingsModel(EmbeddingsModel):
-    def __init__(self, model_name: str, api_base: Optional[str] = None) -> None:
-        super().__init__(model_name, api_base)
+    def __init__(
+        self,
+        model_name: str,
+        api_base: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> None:
+        super().__init__(model_name, api_base, max_tokens=max_tokens)
 
     @override
     def load(self) -> GoogleGenerativeAIEmbeddings:
@@ -20,9 +28,15 @@ class GeminiEmbeddingsModel(EmbeddingsModel):
         )
 
     @override
+    def get_max_tokens(self) -> Optional[int]:
+        return self.max_tokens or GEMINI_EMBEDDINGS_MAX_TOKENS
+
+    @override
+    @timed("embed_documents")
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return self.model.embed_documents(texts)
+        return self.model.embed_documents([self.truncate(text) for text in texts])
 
     @override
+    @timed("embed_query")
     def embed_query(self, text: str) -> List[float]:
-        return self.model.embed_query(text)
+        return self.model.embed_query(self.truncate(text))
@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 from typing_extensions import override
 
 from sentence_transformers import SentenceTransformer
 
+from ..observability.metrics import timed
 from .embeddings_model import EmbeddingsModel
 
 
@@ -13,14 +14,15 @@ class HuggingfaceEmbeddingsModel(EmbeddingsModel):
     This runs locally.
     """
 
-    def __init__(self, model_name: str) -> None:
+    def __init__(self, model_name: str, max_tokens: Optional[int] = None) -> None:
         """
         Initializes a HuggingfaceEmbeddingsModel instance.
 
         Args:
             model_name (str): The name of the HuggingFace model to load locally.
+            max_tokens (Optional[int]): Overrides the model's ``max_seq_length``.
         """
-        super().__init__(model_name)
+        super().__init__(model_name, max_tokens=max_tokens)
 
     @override
     def load(self) -> SentenceTransformer:
@@ -33,6 +35,27 @@ class HuggingfaceEmbeddingsModel(EmbeddingsModel):
         return SentenceTransformer(self.model_name)
 
     @override
+    def get_max_tokens(self) -> Optional[int]:
+        """
+        Returns the model's maximum sequence length, as reported by sentence-transformers.
+        """
+        if self.max_tokens is not None:
+            return self.max_tokens
+        max_seq_length = getattr(self.model, "max_seq_length", None)
+        return max_seq_length if isinstance(max_seq_length, int) else None
+
+    @override
+    def count_tokens(self, text: str) -> int:
+        """
+        Counts tokens with the model's own tokenizer, special tokens included.
+        """
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            return super().count_tokens(text)
+        return len(tokenizer(text, add_special_tokens=True, verbose=False)["input_ids"])
+
+    @override
+    @timed("embed_documents")
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         Embed list of documents.
@@ -41,9 +64,18 @@ class HuggingfaceEmbeddingsModel(EmbeddingsModel):
         return embeddings.tolist()
 
     @override
+    @timed("embed_query")
     def embed_query(self, text: str) -> List[float]:
         """
         Embed a single query text.
         """
         embedding = self.model.encode(text)
         return embedding.tolist()
+
+    @override
+    @timed("embed_query")
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds several query texts in one batch.
+        """
+        return self.model.encode(texts).tolist()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from typing import List, Optional
+from typing_extensions import override
+
+from ..model_server.client import ModelServerClient
+from ..model_server.server import (
+    COUNT_TOKENS,
+    EMBED_DOCUMENTS,
+    EMBED_QUERY,
+    INFO,
+)
+from .embeddings_model import EmbeddingsModel
+
+
+class ModelServerEmbeddingsModel(EmbeddingsModel):
+    """
+    Concrete implementation of the EmbeddingsModel delegating to a local ``ModelServer``.
+
+    The model itself lives in the model server process, shared by every API worker;
+    ``api_base`` is the path of its Unix socket. ``model_name`` must match the model the
+    server was started with, so that vectors stay compatible with the index.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        api_base: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> None:
+        self._server_max_tokens: Optional[int] = None
+        super().__init__(model_name, api_base=api_base, max_tokens=max_tokens)
+
+    @override
+    def load(self) -> ModelServerClient:
+        """
+        Connects to the model server and checks that it hosts ``model_name``.
+
+        Raises:
+            ValueError: If the server hosts another embeddings model.
+        """
+        client = ModelServerClient(self.api_base)
+        info = client.call(INFO)
+        if info["embeddings_model"] != self.model_name:
+            raise ValueError(
+                f"The model server hosts '{info['embeddings_model']}', "
+                f"not '{self.model_name}'"
+            )
+        self._server_max_tokens = info["embeddings_max_tokens"]
+        return client
+
+    @override
+    def get_max_tokens(self) -> Optional[int]:
+        return self.max_tokens or self._server_max_tokens
+
+    @override
+    def count_tokens(self, text: str) -> int:
+        return self.model.call(COUNT_TOKENS, text)
+
+    @override
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.call(EMBED_DOCUMENTS, texts)
+
+    @override
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.call(EMBED_QUERY, text)
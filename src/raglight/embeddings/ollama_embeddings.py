@@ -5,6 +5,7 @@ from typing_extensions import override
 from langchain_ollama import OllamaEmbeddings
 
 from ..config.settings import Settings
+from ..observability.metrics import timed
 from .embeddings_model import EmbeddingsModel
 
 
@@ -14,9 +15,10 @@ class OllamaEmbeddingsModel(EmbeddingsModel):
         model_name: str,
         api_base: Optional[str] = None,
         options: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
     ) -> None:
         resolved_api_base = api_base or Settings.DEFAULT_OLLAMA_CLIENT
-        super().__init__(model_name, api_base=resolved_api_base)
+        super().__init__(model_name, api_base=resolved_api_base, max_tokens=max_tokens)
         self.options = options or {}
         if "num_batch" not in self.options:
             self.options["num_batch"] = 8192
@@ -31,9 +33,15 @@ class OllamaEmbeddingsModel(EmbeddingsModel):
         )
 
     @override
+    def get_max_tokens(self) -> Optional[int]:
+        return self.max_tokens or self.options.get("num_ctx")
+
+    @override
+    @timed("embed_documents")
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return self.model.embed_documents(texts)
+        return self.model.embed_documents([self.truncate(text) for text in texts])
 
     @override
+    @timed("embed_query")
     def embed_query(self, text: str) -> List[float]:
-        return self.model.embed_query(text)
+        return self.model.embed_query(self.truncate(text))
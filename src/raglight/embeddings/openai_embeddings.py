@@ -5,13 +5,21 @@ from typing_extensions import override
 from langchain_openai import OpenAIEmbeddings
 
 from ..config.settings import Settings
-from .embeddings_model import EmbeddingsModel
+from ..observability.metrics import timed
+from .embeddings_model import EmbeddingsModel, get_tiktoken_encoding
+
+OPENAI_EMBEDDINGS_MAX_TOKENS = 8191
 
 
 class OpenAIEmbeddingsModel(EmbeddingsModel):
-    def __init__(self, model_name: str, api_base: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        model_name: str,
+        api_base: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> None:
         resolved_api_base = api_base or Settings.DEFAULT_OPENAI_CLIENT
-        super().__init__(model_name, api_base=resolved_api_base)
+        super().__init__(model_name, api_base=resolved_api_base, max_tokens=max_tokens)
 
     @override
     def load(self) -> OpenAIEmbeddings:
@@ -22,9 +30,22 @@ class OpenAIEmbeddingsModel(EmbeddingsModel):
         )
 
     @override
+    def get_max_tokens(self) -> Optional[int]:
+        return self.max_tokens or OPENAI_EMBEDDINGS_MAX_TOKENS
+
+    @override
+    def count_tokens(self, text: str) -> int:
+        encoding = get_tiktoken_encoding(self.model_name)
+        if encoding is None:
+            return super().count_tokens(text)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    @override
+    @timed("embed_documents")
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return self.model.embed_documents(texts)
+        return self.model.embed_documents([self.truncate(text) for text in texts])
 
     @override
+    @timed("embed_query")
     def embed_query(self, text: str) -> List[float]:
-        return self.model.embed_query(text)
+        return self.model.embed_query(self.truncate(text))
@@ -0,0 +1,50 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from ..observability.metrics import record_cache_lookup
+
+
+class QueryEmbeddingCache:
+    """
+    Thread-safe, bounded LRU cache of query embeddings.
+
+    A question is often searched several times in a row: in the main and class
+    collections, by both halves of a hybrid search, or again by an agent tool call.
+    The cache embeds it once.
+
+    Attributes:
+        max_size (int): Maximum number of queries kept in the cache. 0 disables it.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self._vectors: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._vectors.get(query)
+            if vector is not None:
+                self._vectors.move_to_end(query)
+        if self.max_size > 0:
+            record_cache_lookup("query_embedding", vector is not None)
+        return vector
+
+    def put(self, query: str, vector: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._vectors[query] = vector
+            self._vectors.move_to_end(query)
+            while len(self._vectors) > self.max_size:
+                self._vectors.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._vectors), "max_size": self.max_size}
@@ -14,6 +14,7 @@ except ImportError as e:
 
 from ..config.settings import Settings
 from .llm import LLM
+from .response_cache import ResponseCache
 
 
 class BedrockModel(LLM):
@@ -38,6 +39,7 @@ class BedrockModel(LLM):
         system_prompt: Optional[str] = None,
         system_prompt_file: Optional[str] = None,
         region_name: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         """
         Initializes a BedrockModel instance.
@@ -47,9 +49,15 @@ class BedrockModel(LLM):
             system_prompt (Optional[str]): System prompt text. Falls back to default if not provided.
             system_prompt_file (Optional[str]): Path to a file containing the system prompt.
             region_name (Optional[str]): AWS region. Defaults to AWS_DEFAULT_REGION env var or 'us-east-1'.
+            response_cache (Optional[ResponseCache]): Exact-match cache of model responses.
         """
         self.region_name = region_name or Settings.AWS_DEFAULT_REGION
-        super().__init__(model_name, system_prompt, system_prompt_file)
+        super().__init__(
+            model_name,
+            system_prompt,
+            system_prompt_file,
+            response_cache=response_cache,
+        )
         logging.info(f"Using AWS Bedrock with {model_name} model 🤖")
 
     @override
@@ -65,6 +73,18 @@ class BedrockModel(LLM):
             region_name=self.region_name,
         )
 
+    def _build_messages(self, input: Dict[str, Any]):
+        messages = []
+        if self.system_prompt:
+            messages.append(SystemMessage(content=self.system_prompt))
+        for msg in input.get("history", []):
+            if msg["role"] == "assistant":
+                messages.append(AIMessage(content=msg["content"]))
+            else:
+                messages.append(HumanMessage(content=msg["content"]))
+        messages.append(HumanMessage(content=input.get("question", "")))
+        return messages
+
     @override
     def generate(self, input: Dict[str, Any]) -> str:
         """
@@ -76,41 +96,11 @@ class BedrockModel(LLM):
         Returns:
             str: The generated response text.
         """
-        history = input.get("history", [])
-        messages = []
-
-        if self.system_prompt:
-            messages.append(SystemMessage(content=self.system_prompt))
-
-        for msg in history:
-            if msg["role"] == "assistant":
-                messages.append(AIMessage(content=msg["content"]))
-            else:
-                messages.append(HumanMessage(content=msg["content"]))
-
-        messages.append(HumanMessage(content=input.get("question", "")))
-        response = self.model.invoke(messages)
-        return response.content
+        return self._invoke(self._build_messages(input))
 
     @override
     def generate_streaming(
         self, input: Dict[str, Any], callbacks=None
     ) -> Iterable[str]:
-        history = input.get("history", [])
-        messages = []
-
-        if self.system_prompt:
-            messages.append(SystemMessage(content=self.system_prompt))
-
-        for msg in history:
-            if msg["role"] == "assistant":
-                messages.append(AIMessage(content=msg["content"]))
-            else:
-                messages.append(HumanMessage(content=msg["content"]))
-
-        messages.append(HumanMessage(content=input.get("question", "")))
-
         stream_config = {"callbacks": callbacks} if callbacks else {}
-        for chunk in self.model.stream(messages, config=stream_config):
-            if chunk.content:
-                yield chunk.content
+        yield from self._stream(self._build_messages(input), config=stream_config)
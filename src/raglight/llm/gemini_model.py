@@ -5,6 +5,7 @@ import logging
 
 from ..config.settings import Settings
 from .llm import LLM
+from .response_cache import ResponseCache
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
@@ -18,9 +19,16 @@ class GeminiModel(LLM):
         system_prompt_file: Optional[str] = None,
         api_base: Optional[str] = None,
         role: str = "user",
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         self.api_base = api_base or Settings.DEFAULT_GOOGLE_CLIENT
-        super().__init__(model_name, system_prompt, system_prompt_file, self.api_base)
+        super().__init__(
+            model_name,
+            system_prompt,
+            system_prompt_file,
+            self.api_base,
+            response_cache=response_cache,
+        )
         logging.info(f"Using Gemini with {model_name} model 🤖")
         self.role: str = role
 
@@ -61,14 +69,11 @@ class GeminiModel(LLM):
 
     @override
     def generate(self, input: Dict[str, Any]) -> str:
-        response = self.model.invoke(self._build_messages(input))
-        return response.content
+        return self._invoke(self._build_messages(input))
 
     @override
     def generate_streaming(
         self, input: Dict[str, Any], callbacks=None
     ) -> Iterable[str]:
         config = {"callbacks": callbacks} if callbacks else {}
-        for chunk in self.model.stream(self._build_messages(input), config=config):
-            if chunk.content:
-                yield chunk.content
+        yield from self._stream(self._build_messages(input), config=config)
@@ -1,8 +1,11 @@
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
 from ..config.settings import Settings
+from ..observability.metrics import LLM_TOKENS
+from .response_cache import ResponseCache
 
 
 class LLM(ABC):
@@ -15,6 +18,7 @@ class LLM(ABC):
     Attributes:
         model_name (str): The name of the LLM model.
         model (Any): The loaded model instance.
+        response_cache (Optional[ResponseCache]): Exact-match cache of model responses.
     """
 
     def __init__(
@@ -23,14 +27,18 @@ class LLM(ABC):
         system_prompt: Optional[str] = None,
         system_prompt_file: Optional[str] = None,
         api_base: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         """
         Initializes an LLM instance.
 
         Args:
             model_name (str): The name of the LLM model to be loaded.
+            response_cache (Optional[ResponseCache]): When set, responses to byte-identical
+                message lists are served from this cache instead of calling the model.
         """
         self.model_name: str = model_name
+        self.response_cache: Optional[ResponseCache] = response_cache
         self.model: Any = self.load()
         if system_prompt_file:
             self.system_prompt: str = self._load_system_prompt_from_file(
@@ -46,6 +54,150 @@ class LLM(ABC):
         with open(filePath, "r", encoding="utf-8") as file:
             return file.read()
 
+    def _cache_key(self, messages: List[Any]) -> str:
+        return ResponseCache.make_key(
+            f"{type(self).__name__}:{self.model_name}", messages
+        )
+
+    def _record_usage(self, message: Any) -> None:
+        """
+        Counts the tokens of a response or stream chunk, when the provider reports them.
+        """
+        usage = getattr(message, "usage_metadata", None)
+        if not isinstance(usage, dict):
+            return
+        for kind in ("input_tokens", "output_tokens"):
+            tokens = usage.get(kind)
+            if isinstance(tokens, int) and tokens > 0:
+                LLM_TOKENS.inc(
+                    tokens, model=self.model_name, kind=kind[: -len("_tokens")]
+                )
+
+    def _call_model(self, messages: List[Any]) -> Any:
+        response = self.model.invoke(messages)
+        self._record_usage(response)
+        return response.content
+
+    async def _acall_model(self, messages: List[Any]) -> Any:
+        response = await self.model.ainvoke(messages)
+        self._record_usage(response)
+        return response.content
+
+    def _invoke(self, messages: List[Any]) -> str:
+        """
+        Invokes the model on built messages, going through the response cache if any.
+
+        Args:
+            messages (List[Any]): The LangChain messages to send.
+
+        Returns:
+            str: The response content.
+        """
+        if self.response_cache is None:
+            return self._call_model(messages)
+
+        key = self._cache_key(messages)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return "".join(cached)
+        content = self._call_model(messages)
+        if isinstance(content, str):
+            self.response_cache.set(key, [content])
+        return content
+
+    def _stream(
+        self, messages: List[Any], config: Optional[Dict[str, Any]] = None
+    ) -> Iterable[str]:
+        """
+        Streams the model response to built messages, replaying cached chunks on a hit.
+
+        A response is only cached once the stream has been fully consumed.
+
+        Args:
+            messages (List[Any]): The LangChain messages to send.
+            config (Optional[Dict[str, Any]]): LangChain run config (e.g. callbacks).
+
+        Yields:
+            str: Successive chunks of the response.
+        """
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(messages)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                yield from cached
+                return
+
+        chunks: List[str] = []
+        for chunk in self.model.stream(messages, config=config or {}):
+            self._record_usage(chunk)
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield chunk.content
+
+        if key is not None and all(isinstance(c, str) for c in chunks):
+            self.response_cache.set(key, chunks)
+
+    async def _ainvoke(self, messages: List[Any]) -> str:
+        """
+        Async counterpart of ``_invoke``, using the LangChain async client.
+        """
+        if self.response_cache is None:
+            return await self._acall_model(messages)
+
+        key = self._cache_key(messages)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return "".join(cached)
+        content = await self._acall_model(messages)
+        if isinstance(content, str):
+            self.response_cache.set(key, [content])
+        return content
+
+    async def _astream(
+        self, messages: List[Any], config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async counterpart of ``_stream``, using the LangChain async client.
+        """
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(messages)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                for chunk in cached:
+                    yield chunk
+                return
+
+        chunks: List[str] = []
+        async for chunk in self.model.astream(messages, config=config or {}):
+            self._record_usage(chunk)
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield chunk.content
+
+        if key is not None and all(isinstance(c, str) for c in chunks):
+            self.response_cache.set(key, chunks)
+
+    @property
+    def supports_messages(self) -> bool:
+        """
+        Whether the provider builds LangChain messages, i.e. overrides
+        ``_build_messages``. Such providers get native async generation; the others fall
+        back to running ``generate`` and ``generate_streaming`` in a worker thread.
+        """
+        return type(self)._build_messages is not LLM._build_messages
+
+    def _build_messages(self, input: Dict[str, Any]) -> List[Any]:
+        """
+        Builds the LangChain messages sent to the model for an input.
+
+        Only called when ``supports_messages`` is True.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not build LangChain messages."
+        )
+
     @abstractmethod
     def load(self) -> Any:
         """
@@ -90,3 +242,41 @@ class LLM(ABC):
             str: Successive chunks of the generated output.
         """
         pass
+
+    async def agenerate(self, input: Dict[str, Any]) -> str:
+        """
+        Generates text without blocking the event loop.
+
+        Args:
+            input (Dict[str, Any]): Same input as ``generate``.
+
+        Returns:
+            str: The generated output from the model.
+        """
+        if not self.supports_messages:
+            return await asyncio.to_thread(self.generate, input)
+        return await self._ainvoke(self._build_messages(input))
+
+    async def agenerate_streaming(
+        self, input: Dict[str, Any], callbacks: Optional[list] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generates text in streaming mode without blocking the event loop.
+
+        Args:
+            input (Dict[str, Any]): Same input as ``generate_streaming``.
+            callbacks (Optional[list]): Optional list of LangChain callbacks (e.g. Langfuse).
+
+        Yields:
+            str: Successive chunks of the generated output.
+        """
+        if not self.supports_messages:
+            iterator = iter(self.generate_streaming(input, callbacks=callbacks))
+            done = object()
+            while (chunk := await asyncio.to_thread(next, iterator, done)) is not done:
+                yield chunk
+            return
+
+        config = {"callbacks": callbacks} if callbacks else {}
+        async for chunk in self._astream(self._build_messages(input), config=config):
+            yield chunk
@@ -3,6 +3,7 @@ from typing import Iterable, Optional, Dict, Any
 from typing_extensions import override
 from ..config.settings import Settings
 from .llm import LLM
+from .response_cache import ResponseCache
 import logging
 
 from langchain_mistralai import ChatMistralAI
@@ -17,9 +18,15 @@ class MistralModel(LLM):
         system_prompt_file: Optional[str] = None,
         api_base: str = None,
         role: str = "user",
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         self.api_key = Settings.MISTRAL_API_KEY
-        super().__init__(model_name, system_prompt, system_prompt_file)
+        super().__init__(
+            model_name,
+            system_prompt,
+            system_prompt_file,
+            response_cache=response_cache,
+        )
         logging.info(f"Using Mistral with {model_name} model 🤖")
         self.role: str = role
 
@@ -60,14 +67,11 @@ class MistralModel(LLM):
 
     @override
     def generate(self, input: Dict[str, Any]) -> str:
-        response = self.model.invoke(self._build_messages(input))
-        return response.content
+        return self._invoke(self._build_messages(input))
 
     @override
     def generate_streaming(
         self, input: Dict[str, Any], callbacks=None
     ) -> Iterable[str]:
         config = {"callbacks": callbacks} if callbacks else {}
-        for chunk in self.model.stream(self._build_messages(input), config=config):
-            if chunk.content:
-                yield chunk.content
+        yield from self._stream(self._build_messages(input), config=config)
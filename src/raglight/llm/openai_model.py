@@ -3,6 +3,7 @@ from typing import Iterable, Optional, Dict, Any
 from typing_extensions import override
 from ..config.settings import Settings
 from .llm import LLM
+from .response_cache import ResponseCache
 import logging
 
 from langchain_openai import ChatOpenAI
@@ -17,9 +18,16 @@ class OpenAIModel(LLM):
         system_prompt_file: Optional[str] = None,
         api_base: Optional[str] = None,
         role: str = "user",
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         self.api_base = api_base or Settings.DEFAULT_OPENAI_CLIENT
-        super().__init__(model_name, system_prompt, system_prompt_file, self.api_base)
+        super().__init__(
+            model_name,
+            system_prompt,
+            system_prompt_file,
+            self.api_base,
+            response_cache=response_cache,
+        )
         logging.info(f"Using OpenAI with {model_name} model 🤖")
         self.role: str = role
 
@@ -63,14 +71,11 @@ class OpenAIModel(LLM):
 
     @override
     def generate(self, input: Dict[str, Any]) -> str:
-        response = self.model.invoke(self._build_messages(input))
-        return response.content
+        return self._invoke(self._build_messages(input))
 
     @override
     def generate_streaming(
         self, input: Dict[str, Any], callbacks=None
     ) -> Iterable[str]:
         config = {"callbacks": callbacks} if callbacks else {}
-        for chunk in self.model.stream(self._build_messages(input), config=config):
-            if chunk.content:
-                yield chunk.content
+        yield from self._stream(self._build_messages(input), config=config)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..observability.metrics import record_cache_lookup
+
+
+class ResponseCache(ABC):
+    """
+    Abstract base class for exact-match LLM response caches.
+
+    Responses are stored as the list of chunks the model produced, so that a cached
+    response can be replayed by ``generate_streaming`` as well as returned by ``generate``.
+
+    Attributes:
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to call the model.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, messages: Sequence[Any]) -> str:
+        """
+        Builds the cache key of a request from the model name and the built messages.
+
+        Args:
+            model_name (str): Name of the model, including the provider when relevant.
+            messages (Sequence[Any]): LangChain messages sent to the model.
+
+        Returns:
+            str: A SHA-256 hex digest of the canonical request.
+        """
+        canonical = json.dumps(
+            {
+                "model": model_name,
+                "messages": [
+                    {"type": getattr(m, "type", type(m).__name__), "content": m.content}
+                    for m in messages
+                ],
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Returns the cached chunks of a response, or None when missing.
+        """
+        chunks = self._get(key)
+        if chunks is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        record_cache_lookup("response", chunks is not None)
+        return chunks
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[List[str]]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, chunks: List[str]) -> None:
+        """
+        Stores the chunks of a complete response.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    Thread-safe, bounded LRU response cache held in process memory.
+
+    Attributes:
+        max_entries (int): Maximum number of responses kept in the cache.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self._responses: OrderedDict[str, List[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            chunks = self._responses.get(key)
+            if chunks is not None:
+                self._responses.move_to_end(key)
+            return chunks
+
+    def set(self, key: str, chunks: List[str]) -> None:
+        with self._lock:
+            self._responses[key] = list(chunks)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Response cache persisted in a local SQLite database, shared across processes and restarts.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+        max_entries (Optional[int]): Maximum number of responses kept; the least recently
+            used are deleted. None means unbounded.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = 100_000) -> None:
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, chunks TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+            )
+
+    def _get(self, key: str) -> Optional[List[str]]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT chunks FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_used = julianday('now') WHERE key = ?",
+                (key,),
+            )
+        return json.loads(row[0])
+
+    def set(self, key: str, chunks: List[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, chunks, last_used) "
+                "VALUES (?, ?, julianday('now'))",
+                (key, json.dumps(list(chunks), ensure_ascii=False)),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                    "ORDER BY last_used DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
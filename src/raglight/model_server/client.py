@@ -0,0 +1,85 @@
+from __future__ import annotations
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection
+from typing import Any, Optional
+
+from .server import (
+    ModelServerError,
+    authkey_from_env,
+    check_socket_owner,
+    default_address,
+)
+
+
+class ModelServerClient:
+    """
+    Client of a ``ModelServer``.
+
+    Each thread uses its own connection, so concurrent calls from a worker reach the
+    server in parallel and can be batched together there.
+
+    Attributes:
+        address (str): Path of the model server Unix socket. Defaults to
+            ``default_address()``.
+    """
+
+    def __init__(
+        self, address: Optional[str] = None, authkey: Optional[bytes] = None
+    ) -> None:
+        self.address = address or default_address()
+        self.authkey = authkey if authkey is not None else authkey_from_env()
+        self._local = threading.local()
+
+    def _connection(self) -> Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            check_socket_owner(self.address)
+            try:
+                conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            except AuthenticationError as e:
+                raise ModelServerError(
+                    f"The model server at {self.address} rejected the connection: {e}. "
+                    "Check RAGLIGHT_MODEL_SERVER_AUTHKEY."
+                ) from e
+            except (OSError, EOFError) as e:
+                raise ModelServerError(
+                    f"Cannot connect to the model server at {self.address}: {e}. "
+                    "Start it with `raglight model-server`."
+                ) from e
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def call(self, op: str, *args: Any) -> Any:
+        """
+        Sends a request to the model server and waits for its result.
+
+        A connection dropped by a server restart is reopened once.
+
+        Raises:
+            ModelServerError: If the server cannot be reached or the request failed.
+        """
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.send((op, args))
+                status, result = conn.recv()
+                break
+            except (OSError, EOFError) as e:
+                self._reset()
+                if attempt:
+                    raise ModelServerError(
+                        f"Lost the connection to the model server: {e}"
+                    ) from e
+        if status != "ok":
+            raise ModelServerError(result)
+        return result
+
+    def close(self) -> None:
+        self._reset()
@@ -0,0 +1,297 @@
+from __future__ import annotations
+import logging
+import os
+import queue
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, Listener
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..cross_encoder.cross_encoder_model import CrossEncoderModel
+from ..embeddings.embeddings_model import EmbeddingsModel
+
+SOCKET_NAME = "raglight-models.sock"
+
+# Operations served by the model server. ``embed_documents`` and ``embed_query``
+# requests from different clients are merged into one model call.
+EMBED_DOCUMENTS = "embed_documents"
+EMBED_QUERY = "embed_query"
+SCORE = "score"
+COUNT_TOKENS = "count_tokens"
+INFO = "info"
+
+
+class ModelServerError(Exception):
+    """Raised on the client side when the model server fails to process a request."""
+
+
+def authkey_from_env() -> Optional[bytes]:
+    """Returns the shared secret of the model server socket, if one is configured."""
+    key = os.environ.get("RAGLIGHT_MODEL_SERVER_AUTHKEY")
+    return key.encode() if key else None
+
+
+def default_address() -> str:
+    """
+    Returns the default socket path, in a directory only the current user can access:
+    ``$XDG_RUNTIME_DIR`` when set, else a 0700 ``raglight-<uid>`` directory created
+    in the temporary directory.
+
+    Raises:
+        ModelServerError: If the fallback directory exists but is not private to the
+            current user.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"raglight-{os.getuid()}")
+        os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+        info = os.lstat(runtime_dir)
+        if (
+            not stat.S_ISDIR(info.st_mode)
+            or info.st_uid != os.getuid()
+            or info.st_mode & 0o077
+        ):
+            raise ModelServerError(
+                f"Refusing to use {runtime_dir}: it must be a directory private to "
+                "the current user"
+            )
+    return os.path.join(runtime_dir, SOCKET_NAME)
+
+
+def check_socket_owner(address: str) -> None:
+    """
+    Refuses a socket path owned by another user, which could impersonate the model
+    server (or a client) and exchange pickled payloads with this process.
+
+    Raises:
+        ModelServerError: If ``address`` exists and is not owned by the current user.
+    """
+    try:
+        owner = os.lstat(address).st_uid
+    except FileNotFoundError:
+        return
+    if owner != os.getuid():
+        raise ModelServerError(
+            f"Refusing to use {address}: it is owned by another user"
+        )
+
+
+@dataclass
+class _Request:
+    op: str
+    args: Tuple[Any, ...]
+    future: Future = field(default_factory=Future)
+
+
+class ModelServer:
+    """
+    Hosts the embeddings and cross encoder models once for every API worker of a machine.
+
+    With ``raglight serve --workers N``, each worker process would otherwise load its
+    own copy of the models. The model server loads them once, listens on a local Unix
+    socket and serves the workers through ``ModelServerEmbeddingsModel`` and
+    ``ModelServerCrossEncoderModel``. Messages are pickled, so the socket is only
+    reachable by the current user and should be protected by an ``authkey``. Concurrent embedding requests are queued and
+    merged: the batcher thread waits up to ``max_wait`` seconds for more requests and
+    runs the model once on up to ``max_batch_size`` texts, which keeps an accelerator
+    busy with large batches instead of many small ones.
+
+    Attributes:
+        embeddings (EmbeddingsModel): The hosted embeddings model.
+        cross_encoder (Optional[CrossEncoderModel]): The hosted cross encoder, if any.
+        address (str): Path of the Unix socket. Defaults to ``default_address()``.
+        max_batch_size (int): Maximum number of texts embedded in one model call.
+        max_wait (float): Time in seconds spent collecting a batch.
+    """
+
+    def __init__(
+        self,
+        embeddings: EmbeddingsModel,
+        cross_encoder: Optional[CrossEncoderModel] = None,
+        address: Optional[str] = None,
+        authkey: Optional[bytes] = None,
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+    ) -> None:
+        self.embeddings = embeddings
+        self.cross_encoder = cross_encoder
+        self.address = address or default_address()
+        self.authkey = authkey
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._requests: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._listener: Optional[Listener] = None
+        self._threads: List[threading.Thread] = []
+        self._closed = threading.Event()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "embeddings_model": self.embeddings.model_name,
+            "embeddings_max_tokens": self.embeddings.get_max_tokens(),
+            "cross_encoder_model": (
+                self.cross_encoder.model_name if self.cross_encoder else None
+            ),
+        }
+
+    def start(self) -> None:
+        """
+        Binds the socket and starts the accept and batcher threads.
+
+        Raises:
+            ModelServerError: If the socket path is owned by another user.
+        """
+        check_socket_owner(self.address)
+        if os.path.exists(self.address):
+            # Left behind by a server that did not shut down cleanly.
+            os.remove(self.address)
+        # Create the socket as 0600 right away rather than chmod it after binding.
+        umask = os.umask(0o177)
+        try:
+            self._listener = Listener(
+                self.address, family="AF_UNIX", authkey=self.authkey
+            )
+        finally:
+            os.umask(umask)
+        for target, name in (
+            (self._accept_loop, "raglight-model-server-accept"),
+            (self._batch_loop, "raglight-model-server-batcher"),
+        ):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logging.info(f"Model server listening on {self.address}")
+
+    def serve_forever(self) -> None:
+        """Starts the server and blocks until ``close`` is called."""
+        self.start()
+        self._closed.wait()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._requests.put(None)
+        if self._listener is not None:
+            # Closing the listener removes the socket file it created.
+            self._listener.close()
+            self._listener = None
+
+    def submit(self, op: str, *args: Any) -> Future:
+        """
+        Queues a request for the batcher thread and returns its pending result.
+        """
+        request = _Request(op, args)
+        self._requests.put(request)
+        return request.future
+
+    def _accept_loop(self) -> None:
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._closed.is_set():
+                    return
+                logging.exception("Model server failed to accept a connection")
+                continue
+            threading.Thread(
+                target=self._serve_connection, args=(conn,), daemon=True
+            ).start()
+
+    def _serve_connection(self, conn: Connection) -> None:
+        with conn:
+            while not self._closed.is_set():
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if op == INFO:
+                        result = self.info()
+                    elif op == COUNT_TOKENS:
+                        result = self.embeddings.count_tokens(*args)
+                    else:
+                        result = self.submit(op, *args).result()
+                    conn.send(("ok", result))
+                except Exception as e:
+                    conn.send(("error", f"{type(e).__name__}: {e}"))
+
+    def _collect_batch(self, first: _Request) -> List[_Request]:
+        batch = [first]
+        size = len(first.args[0]) if first.op == EMBED_DOCUMENTS else 1
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._requests.put(None)
+                break
+            batch.append(request)
+            size += len(request.args[0]) if request.op == EMBED_DOCUMENTS else 1
+        return batch
+
+    def _batch_loop(self) -> None:
+        while True:
+            first = self._requests.get()
+            if first is None:
+                return
+            batch = self._collect_batch(first)
+            embeds = [r for r in batch if r.op in (EMBED_DOCUMENTS, EMBED_QUERY)]
+            if embeds:
+                self._run_embeddings(embeds)
+            for request in batch:
+                if request.op == SCORE:
+                    self._run(request, self._score, *request.args)
+                elif request.op not in (EMBED_DOCUMENTS, EMBED_QUERY):
+                    request.future.set_exception(
+                        ValueError(f"Unknown model server operation: {request.op}")
+                    )
+
+    def _score(self, query: str, documents: List[str]) -> List[float]:
+        if self.cross_encoder is None:
+            raise ValueError("The model server has no cross encoder model")
+        return self.cross_encoder.score(query, documents)
+
+    @staticmethod
+    def _run(request: _Request, func: Any, *args: Any) -> None:
+        try:
+            request.future.set_result(func(*args))
+        except Exception as e:
+            request.future.set_exception(e)
+
+    def _run_embeddings(self, requests: List[_Request]) -> None:
+        """
+        Embeds the texts of several requests in one model call per kind and hands
+        each request its own slice of the result.
+        """
+        for op, embed in (
+            (EMBED_DOCUMENTS, self.embeddings.embed_documents),
+            (EMBED_QUERY, self.embeddings.embed_queries),
+        ):
+            group = [r for r in requests if r.op == op]
+            if not group:
+                continue
+            texts: List[str] = []
+            for request in group:
+                texts.extend(request.args[0] if op == EMBED_DOCUMENTS else request.args)
+            try:
+                vectors = embed(texts) if texts else []
+            except Exception as e:
+                for request in group:
+                    request.future.set_exception(e)
+                continue
+            start = 0
+            for request in group:
+                if op == EMBED_DOCUMENTS:
+                    end = start + len(request.args[0])
+                    request.future.set_result(vectors[start:end])
+                else:
+                    end = start + 1
+                    request.future.set_result(vectors[start])
+                start = end
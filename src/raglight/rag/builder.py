@@ -6,6 +6,7 @@ from ..config.langfuse_config import LangfuseConfig
 from ..embeddings.ollama_embeddings import OllamaEmbeddingsModel
 from ..cross_encoder.cross_encoder_model import CrossEncoderModel
 from ..cross_encoder.huggingface_cross_encoder import HuggingfaceCrossEncoderModel
+from ..cross_encoder.model_server_cross_encoder import ModelServerCrossEncoderModel
 from ..llm.llm import LLM
 from ..llm.ollama_model import OllamaModel
 from ..embeddings.openai_embeddings import OpenAIEmbeddingsModel
@@ -15,9 +16,12 @@ from ..llm.openai_model import OpenAIModel
 from ..vectorstore.vector_store import VectorStore
 from ..config.settings import Settings
 from .rag import RAG
+from .semantic_cache import SemanticCache
+from .session_store import SessionStore
 from ..embeddings.embeddings_model import EmbeddingsModel
 from ..embeddings.huggingface_embeddings import HuggingfaceEmbeddingsModel
 from ..embeddings.gemini_embeddings import GeminiEmbeddingsModel
+from ..embeddings.model_server_embeddings import ModelServerEmbeddingsModel
 from ..llm.gemini_model import GeminiModel
 
 
@@ -73,6 +77,8 @@ class Builder:
 
             kwargs.pop("api_base", None)
             self.embeddings = BedrockEmbeddingsModel(**kwargs)
+        elif type == Settings.MODEL_SERVER:
+            self.embeddings = ModelServerEmbeddingsModel(**kwargs)
         else:
             raise ValueError(f"Unknown Embeddings Model type: {type}")
         logging.info("✅ Embeddings Model created")
@@ -95,6 +101,8 @@ class Builder:
         logging.info("⏳ Creating a Cross Encoder Model...")
         if type == Settings.HUGGINGFACE:
             self.cross_encoder = HuggingfaceCrossEncoderModel(**kwargs)
+        elif type == Settings.MODEL_SERVER:
+            self.cross_encoder = ModelServerCrossEncoderModel(**kwargs)
         else:
             raise ValueError(f"Unknown Cross Encoder Model type: {type}")
         logging.info("✅ Cross Encoder Model created")
@@ -146,6 +154,20 @@ class Builder:
                 alpha=alpha,
                 **kwargs,
             )
+        elif type == Settings.LOCAL:
+            from ..vectorstore.local import LocalVS
+
+            # LocalVS is embedded: there is no server to connect to.
+            kwargs.pop("host", None)
+            kwargs.pop("port", None)
+            search_type = kwargs.pop("search_type", Settings.SEARCH_HYBRID)
+            alpha = kwargs.pop("alpha", 0.5)
+            self.vector_store = LocalVS(
+                embeddings_model=self.embeddings,
+                search_type=search_type,
+                alpha=alpha,
+                **kwargs,
+            )
         else:
             raise ValueError(f"Unknown VectorStore type: {type}")
         logging.info("✅ VectorStore created")
@@ -192,6 +214,15 @@ class Builder:
         langfuse_config: Optional[LangfuseConfig] = None,
         reformulation: bool = True,
         max_history: Optional[int] = 20,
+        rerank_candidates: Optional[int] = None,
+        rerank_batch_size: int = 16,
+        rerank_patience: int = 0,
+        rerank_min_score: Optional[float] = None,
+        context_max_tokens: Optional[int] = None,
+        context_duplicate_threshold: float = 0.9,
+        semantic_cache: Optional[SemanticCache] = None,
+        session_store: Optional[SessionStore] = None,
+        shared_history: bool = True,
     ) -> RAG:
         """
         Builds the RAG pipeline with the configured components.
@@ -201,6 +232,15 @@ class Builder:
             langfuse_config (Optional[LangfuseConfig]): Langfuse observability
                 configuration (v3+). When provided, every ``RAG.generate()`` call
                 is traced in Langfuse. Defaults to ``None``.
+            rerank_candidates (Optional[int]): Retrieved documents passed to the cross-encoder.
+            rerank_batch_size (int): Cross-encoder batch size. Defaults to 16.
+            rerank_patience (int): Unchanged batches before reranking stops early. 0 disables it. Defaults to 0.
+            rerank_min_score (Optional[float]): Minimum cross-encoder score kept in the context.
+            context_max_tokens (Optional[int]): Token budget of the retrieved context in the prompt.
+            context_duplicate_threshold (float): Near-duplicate chunk threshold. Defaults to 0.9.
+            semantic_cache (Optional[SemanticCache]): Answer cache for semantically equivalent questions.
+            session_store (Optional[SessionStore]): Per-session conversation histories.
+            shared_history (bool): Whether calls without a session share one history. Defaults to True.
 
         Returns:
             RAG: The fully configured RAG pipeline instance.
@@ -224,6 +264,15 @@ class Builder:
             langfuse_config=langfuse_config,
             reformulation=reformulation,
             max_history=max_history,
+            rerank_candidates=rerank_candidates,
+            rerank_batch_size=rerank_batch_size,
+            rerank_patience=rerank_patience,
+            rerank_min_score=rerank_min_score,
+            context_max_tokens=context_max_tokens,
+            context_duplicate_threshold=context_duplicate_threshold,
+            semantic_cache=semantic_cache,
+            session_store=session_store,
+            shared_history=shared_history,
         )
         logging.info("✅ RAG pipeline created")
         return self.rag
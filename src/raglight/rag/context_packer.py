@@ -0,0 +1,158 @@
+from __future__ import annotations
+import logging
+import re
+from typing import Callable, List, Optional, Set
+
+from langchain_core.documents import Document
+
+from ..embeddings.embeddings_model import (
+    estimate_tokens,
+    fitting_prefix_length,
+    get_tiktoken_encoding,
+)
+
+# Below this many tokens of remaining budget, a partial chunk is not worth adding.
+MIN_PARTIAL_CHUNK_TOKENS = 32
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts tokens with a cached tiktoken encoding, falling back to a character estimate.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The number of tokens.
+    """
+    encoding = get_tiktoken_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class ContextPacker:
+    """
+    Packs retrieved documents into the prompt context under a token budget.
+
+    Documents are taken in score order (``metadata["rerank_score"]`` when every document
+    has one, retrieval order otherwise). Near-duplicate chunks are dropped, the text a
+    chunk shares with an already packed neighbour of the same source (chunk overlap) is
+    trimmed, and packing stops once ``max_tokens`` is reached.
+
+    Attributes:
+        max_tokens (Optional[int]): Token budget of the context. None means unlimited.
+        duplicate_threshold (float): Word-shingle Jaccard similarity above which a chunk
+            is considered a near-duplicate of an already packed one.
+        min_overlap (int): Minimum overlap, in characters, trimmed between two chunks.
+        max_overlap (int): Maximum overlap, in characters, searched between two chunks.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        token_counter: Optional[Callable[[str], int]] = None,
+        duplicate_threshold: float = 0.9,
+        min_overlap: int = 20,
+        max_overlap: int = 500,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter or count_tokens
+        self.duplicate_threshold = duplicate_threshold
+        self.min_overlap = min_overlap
+        self.max_overlap = max_overlap
+
+    @staticmethod
+    def _shingles(text: str, size: int = 3) -> Set[str]:
+        words = re.findall(r"\w+", text.lower())
+        if len(words) < size:
+            return {" ".join(words)}
+        return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+    def _is_duplicate(self, shingles: Set[str], packed: List[Set[str]]) -> bool:
+        for other in packed:
+            union = len(shingles | other)
+            if union and len(shingles & other) / union >= self.duplicate_threshold:
+                return True
+        return False
+
+    def _overlap_length(self, previous: str, text: str) -> int:
+        """Returns the length of the longest suffix of ``previous`` that prefixes ``text``."""
+        if len(previous) < self.min_overlap or len(text) < self.min_overlap:
+            return 0
+        probe = text[: self.min_overlap]
+        start = max(0, len(previous) - self.max_overlap)
+        pos = previous.find(probe, start)
+        while pos != -1:
+            length = len(previous) - pos
+            if text.startswith(previous[pos:]):
+                return length
+            pos = previous.find(probe, pos + 1)
+        return 0
+
+    def _trim_overlap(self, doc: Document, text: str, packed: List[Document]) -> str:
+        source = doc.metadata.get("source")
+        for other in packed:
+            if source is None or other.metadata.get("source") != source:
+                continue
+            other_text = other.page_content
+            overlap = self._overlap_length(other_text, text)
+            if overlap:
+                text = text[overlap:]
+                continue
+            overlap = self._overlap_length(text, other_text)
+            if overlap:
+                text = text[: len(text) - overlap]
+        return text.strip()
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        return text[: fitting_prefix_length(text, max_tokens, self.token_counter)]
+
+    def _score_order(self, documents: List[Document]) -> List[Document]:
+        if documents and all("rerank_score" in doc.metadata for doc in documents):
+            return sorted(
+                documents, key=lambda doc: doc.metadata["rerank_score"], reverse=True
+            )
+        return list(documents)
+
+    def pack(self, documents: List[Document]) -> List[str]:
+        """
+        Selects and trims document texts so that they fit in the token budget.
+
+        Args:
+            documents (List[Document]): The retrieved (and possibly reranked) documents.
+
+        Returns:
+            List[str]: The texts to put in the prompt, best first.
+        """
+        remaining = self.max_tokens
+        texts: List[str] = []
+        packed_docs: List[Document] = []
+        packed_shingles: List[Set[str]] = []
+
+        for doc in self._score_order(documents):
+            if not doc.page_content or not doc.page_content.strip():
+                continue
+            shingles = self._shingles(doc.page_content)
+            if self._is_duplicate(shingles, packed_shingles):
+                continue
+            text = self._trim_overlap(doc, doc.page_content, packed_docs)
+            if not text:
+                continue
+
+            if remaining is not None:
+                n_tokens = self.token_counter(text)
+                if n_tokens > remaining:
+                    if remaining >= MIN_PARTIAL_CHUNK_TOKENS:
+                        texts.append(self._truncate(text, remaining))
+                    break
+                remaining -= n_tokens
+
+            texts.append(text)
+            packed_docs.append(doc)
+            packed_shingles.append(shingles)
+
+        logging.debug(
+            f"Packed {len(texts)}/{len(documents)} documents into the context."
+        )
+        return texts
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import uuid
-from typing import Any, Iterable, Optional
+from typing import Any, AsyncIterator, Iterable, Optional, Tuple
 
 from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import START, StateGraph
 from typing_extensions import Dict, List, TypedDict
 
@@ -13,7 +15,11 @@ from ..config.langfuse_config import LangfuseConfig
 from ..cross_encoder.cross_encoder_model import CrossEncoderModel
 from ..embeddings.embeddings_model import EmbeddingsModel
 from ..llm.llm import LLM
+from ..observability.metrics import timed
 from ..vectorstore.vector_store import VectorStore
+from .context_packer import ContextPacker
+from .semantic_cache import SemanticCache
+from .session_store import InMemorySessionStore, SessionStore
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +66,15 @@ class RAG:
         langfuse_config: Optional[LangfuseConfig] = None,
         reformulation: bool = True,
         max_history: Optional[int] = 20,
+        rerank_candidates: Optional[int] = None,
+        rerank_batch_size: int = 16,
+        rerank_patience: int = 0,
+        rerank_min_score: Optional[float] = None,
+        context_max_tokens: Optional[int] = None,
+        context_duplicate_threshold: float = 0.9,
+        semantic_cache: Optional[SemanticCache] = None,
+        session_store: Optional[SessionStore] = None,
+        shared_history: bool = True,
     ) -> None:
         """
         Initializes the RAG pipeline.
@@ -71,6 +86,25 @@ class RAG:
             reformulation (bool): Whether to rewrite the question before retrieval. Defaults to True.
             max_history (Optional[int]): Maximum number of messages to keep in history.
                                          None means unlimited. Defaults to 20.
+            rerank_candidates (Optional[int]): Number of retrieved documents, in fused retrieval
+                order, passed to the cross-encoder. None means all of them. Defaults to None.
+            rerank_batch_size (int): Number of documents scored per cross-encoder batch. Defaults to 16.
+            rerank_patience (int): Stop scoring once this many consecutive batches left the
+                top-k unchanged. 0 disables early stopping. Defaults to 0.
+            rerank_min_score (Optional[float]): Reranked documents scoring below this threshold
+                are dropped from the context. Defaults to None.
+            context_max_tokens (Optional[int]): Token budget of the retrieved context put in
+                the prompt. None means unlimited. Defaults to None.
+            context_duplicate_threshold (float): Similarity above which a retrieved chunk is
+                dropped as a near-duplicate of a better one. Defaults to 0.9.
+            semantic_cache (Optional[SemanticCache]): Cache serving past answers to
+                semantically equivalent standalone questions. Defaults to None.
+            session_store (Optional[SessionStore]): Store of per-session histories used when
+                a ``session_id`` is passed to ``generate``. Defaults to an in-memory store
+                keeping ``max_history`` messages per session.
+            shared_history (bool): Whether calls without a ``session_id`` share the default
+                conversation held in ``self.state``. When False they run without history,
+                which is what a multi-user server wants. Defaults to True.
         """
         self.embeddings: EmbeddingsModel = embedding_model.get_model()
         self.cross_encoder: CrossEncoderModel = (
@@ -81,6 +115,19 @@ class RAG:
         self.k: int = k
         self.reformulation: bool = reformulation
         self.max_history: Optional[int] = max_history
+        self.rerank_candidates: Optional[int] = rerank_candidates
+        self.rerank_batch_size: int = max(1, rerank_batch_size)
+        self.rerank_patience: int = rerank_patience
+        self.rerank_min_score: Optional[float] = rerank_min_score
+        self.context_packer: ContextPacker = ContextPacker(
+            max_tokens=context_max_tokens,
+            duplicate_threshold=context_duplicate_threshold,
+        )
+        self.semantic_cache: Optional[SemanticCache] = semantic_cache
+        self.session_store: SessionStore = session_store or InMemorySessionStore(
+            max_history=max_history
+        )
+        self.shared_history: bool = shared_history
         self.langfuse_config: Optional[LangfuseConfig] = langfuse_config
         self.langfuse_session_id: str = (
             langfuse_config.session_id
@@ -92,6 +139,7 @@ class RAG:
             self._createGraph()
         )  # Here type is CompiledGraph but it's not exposed by https://github.com/langchain-ai/langgraph/blob/main/libs/langgraph/langgraph/graph/graph.py
 
+    @timed("reformulate")
     def _reformulate(self, state: State) -> Dict[str, str]:
         """
         Rewrites the question as a standalone question using the conversation history.
@@ -107,20 +155,38 @@ class RAG:
         if not state["history"]:
             return {"question": state["question"]}
 
+        prompt = self._reformulation_prompt(state)
+        reformulated = self.llm.generate({"question": prompt, "history": []})
+        logger.info(f"Reformulated question: {reformulated.strip()}")
+        return {"question": reformulated.strip()}
+
+    @timed("reformulate")
+    async def _areformulate(self, state: State) -> Dict[str, str]:
+        """
+        Async counterpart of ``_reformulate``.
+        """
+        if not state["history"]:
+            return {"question": state["question"]}
+
+        prompt = self._reformulation_prompt(state)
+        reformulated = await self.llm.agenerate({"question": prompt, "history": []})
+        logger.info(f"Reformulated question: {reformulated.strip()}")
+        return {"question": reformulated.strip()}
+
+    @staticmethod
+    def _reformulation_prompt(state: State) -> str:
         history_text = "\n".join(
             f"{msg['role'].capitalize()}: {msg['content']}" for msg in state["history"]
         )
-        prompt = (
+        return (
             f"Given the following conversation history and a follow-up question, "
             f"rewrite the follow-up question as a standalone question that captures all necessary context.\n\n"
             f"Conversation history:\n{history_text}\n\n"
             f"Follow-up question: {state['question']}\n\n"
             f"Standalone question (output ONLY the reformulated question, nothing else):"
         )
-        reformulated = self.llm.generate({"question": prompt, "history": []})
-        logger.info(f"Reformulated question: {reformulated.strip()}")
-        return {"question": reformulated.strip()}
 
+    @timed("retrieve")
     def _retrieve(self, state: State) -> Dict[str, List[Document]]:
         """
         Retrieves relevant documents based on the input question.
@@ -136,8 +202,18 @@ class RAG:
         )
         return {"context": retrieved_docs, "question": state["question"]}
 
+    @timed("retrieve")
+    async def _aretrieve(self, state: State) -> Dict[str, List[Document]]:
+        """
+        Async counterpart of ``_retrieve``.
+        """
+        retrieved_docs = await self.vector_store.asimilarity_search(
+            state["question"], k=self.k
+        )
+        return {"context": retrieved_docs, "question": state["question"]}
+
     def _build_prompt(self, state: Dict) -> str:
-        docs_content = "\n\n".join(doc.page_content for doc in state["context"])
+        docs_content = "\n\n".join(self.context_packer.pack(state["context"]))
         return f"""
             Here is the retrieved context (excerpts from the document):
             {docs_content}
@@ -149,6 +225,7 @@ class RAG:
             FINAL ANSWER (based only on the context):
             """
 
+    @timed("generate")
     def _generate_graph(self, state: Dict[str, List[Document]]) -> Dict[str, str]:
         """
         Generates an answer based on the input question and retrieved context.
@@ -165,10 +242,30 @@ class RAG:
         response = self.llm.generate({"question": prompt, "history": state["history"]})
         return {"answer": response}
 
+    @timed("generate")
+    async def _agenerate_graph(
+        self, state: Dict[str, List[Document]]
+    ) -> Dict[str, str]:
+        """
+        Async counterpart of ``_generate_graph``.
+        """
+        prompt = self._build_prompt(state)
+        response = await self.llm.agenerate(
+            {"question": prompt, "history": state["history"]}
+        )
+        return {"answer": response}
+
+    @timed("rerank")
     def _rerank(self, state: Dict[str, List[Document]]) -> Dict[str, List[Document]]:
         """
         Reranks the retrieved documents based on the cross-encoder model.
 
+        The cascade keeps the first ``rerank_candidates`` documents in fused retrieval
+        order, scores them in batches with early stopping, keeps the ``k / 4`` best and
+        drops those scoring below ``rerank_min_score``. The kept documents are copies of
+        the retrieved ones, which caches may share, with their score stored under
+        ``metadata["rerank_score"]``.
+
         Args:
             state (Dict[str, List[Document]]): A dictionary containing the list of retrieved documents under the key 'context'.
 
@@ -178,13 +275,37 @@ class RAG:
         try:
             question = state["question"]
             docs = state["context"]
+            if self.rerank_candidates:
+                docs = docs[: self.rerank_candidates]
             doc_texts = [doc.page_content for doc in docs]
 
-            ranked_texts = self.cross_encoder.predict(
-                question, doc_texts, int(self.k / 4)
-            )
-
-            ranked_docs = [Document(page_content=text) for text in ranked_texts]
+            if self.cross_encoder.supports_scoring:
+                ranked = self.cross_encoder.rank(
+                    question,
+                    doc_texts,
+                    int(self.k / 4),
+                    batch_size=self.rerank_batch_size,
+                    patience=self.rerank_patience,
+                    min_score=self.rerank_min_score,
+                )
+            else:
+                # Cross encoders that only implement predict() return texts without scores.
+                positions = {
+                    text: i for i, text in reversed(list(enumerate(doc_texts)))
+                }
+                ranked_texts = self.cross_encoder.predict(
+                    question, doc_texts, int(self.k / 4)
+                )
+                ranked = [(positions[text], None) for text in ranked_texts]
+
+            ranked_docs = []
+            for i, score in ranked:
+                doc = docs[i]
+                if score is not None:
+                    doc = doc.model_copy(
+                        update={"metadata": {**doc.metadata, "rerank_score": score}}
+                    )
+                ranked_docs.append(doc)
 
         except Exception as e:
             logger.warning(f"Reranking failed: {e}")
@@ -192,6 +313,21 @@ class RAG:
 
         return {"context": ranked_docs, "question": state["question"]}
 
+    async def _arerank(
+        self, state: Dict[str, List[Document]]
+    ) -> Dict[str, List[Document]]:
+        """
+        Async counterpart of ``_rerank``; cross-encoder scoring runs in a worker thread.
+        """
+        return await asyncio.to_thread(self._rerank, state)
+
+    @staticmethod
+    def _node(func: Any, afunc: Any) -> Tuple[str, RunnableLambda]:
+        """
+        Wraps a step so that ``graph.invoke`` runs ``func`` and ``graph.ainvoke`` runs ``afunc``.
+        """
+        return func.__name__, RunnableLambda(func, afunc=afunc, name=func.__name__)
+
     def _createGraph(self) -> Any:
         """
         Creates and compiles the state graph for the RAG pipeline.
@@ -200,26 +336,36 @@ class RAG:
             StateGraph: The compiled state graph for managing the RAG process flow.
         """
         if self.cross_encoder:
-            steps = [self._retrieve, self._rerank, self._generate_graph]
+            steps = [
+                self._node(self._retrieve, self._aretrieve),
+                self._node(self._rerank, self._arerank),
+                self._node(self._generate_graph, self._agenerate_graph),
+            ]
             self.k = 4 * self.k  # Increase retrieval window for reranking
         else:
-            steps = [self._retrieve, self._generate_graph]
+            steps = [
+                self._node(self._retrieve, self._aretrieve),
+                self._node(self._generate_graph, self._agenerate_graph),
+            ]
 
-        if self.reformulation:
-            steps = [self._reformulate] + steps
+        # With a semantic cache, reformulation runs before the cache lookup, outside the graph.
+        reformulate_in_graph = self.reformulation and not self.semantic_cache
+        if reformulate_in_graph:
+            steps = [self._node(self._reformulate, self._areformulate)] + steps
 
         graph_builder = StateGraph(State).add_sequence(steps)
-        first_step = "_reformulate" if self.reformulation else "_retrieve"
+        first_step = "_reformulate" if reformulate_in_graph else "_retrieve"
         graph_builder.add_edge(START, first_step)
         return graph_builder.compile()
 
-    def _build_langfuse_callback(self) -> Any:
+    def _build_langfuse_callback(self, session_id: Optional[str] = None) -> Any:
         """
         Builds a Langfuse ``CallbackHandler`` from the stored configuration.
 
         Sets the required environment variables and returns a handler whose
-        ``trace_id`` is fixed to ``self.langfuse_session_id`` so that all turns
-        of the same conversation are grouped under the same Langfuse trace.
+        ``trace_id`` is fixed to ``self.langfuse_session_id`` (or derived from
+        ``session_id`` when given) so that all turns of the same conversation are
+        grouped under the same Langfuse trace.
 
         Returns:
             CallbackHandler: A ready-to-use Langfuse LangChain callback.
@@ -238,39 +384,129 @@ class RAG:
         os.environ["LANGFUSE_SECRET_KEY"] = self.langfuse_config.secret_key
         os.environ["LANGFUSE_HOST"] = self.langfuse_config.host
 
-        return CallbackHandler(trace_context={"trace_id": self.langfuse_session_id})
+        trace_id = (
+            uuid.uuid5(uuid.NAMESPACE_URL, session_id).hex
+            if session_id is not None
+            else self.langfuse_session_id
+        )
+        return CallbackHandler(trace_context={"trace_id": trace_id})
+
+    def _lookup_semantic_cache(self, state: Dict) -> Optional[str]:
+        """
+        Reformulates the question, then looks its answer up in the semantic cache.
+
+        Updates ``state`` with the standalone question and its embedding so that a miss
+        can proceed with retrieval and be stored afterwards.
+
+        Returns:
+            Optional[str]: The cached answer, or None on a miss.
+        """
+        if self.reformulation:
+            state.update(self._reformulate(state))
+        state["cache_vector"] = self.semantic_cache.embed(state["question"])
+        return self._semantic_cache_hit(state)
+
+    async def _alookup_semantic_cache(self, state: Dict) -> Optional[str]:
+        """
+        Async counterpart of ``_lookup_semantic_cache``.
+        """
+        if self.reformulation:
+            state.update(await self._areformulate(state))
+        state["cache_vector"] = await asyncio.to_thread(
+            self.semantic_cache.embed, state["question"]
+        )
+        return self._semantic_cache_hit(state)
+
+    def _semantic_cache_hit(self, state: Dict) -> Optional[str]:
+        answer = self.semantic_cache.lookup(
+            state["cache_vector"], self.vector_store.index_generation
+        )
+        if answer is not None:
+            logger.info("Semantic cache hit")
+        return answer
+
+    def _store_semantic_cache(self, state: Dict, answer: str) -> None:
+        self.semantic_cache.store(
+            state["cache_vector"],
+            state["question"],
+            answer,
+            index_generation=self.vector_store.index_generation,
+        )
+
+    def _load_history(self, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """
+        Returns the history of a session, or of the default conversation when None.
+        """
+        if session_id is None:
+            if not self.shared_history:
+                return []
+            if self.max_history is not None:
+                self.state["history"] = self.state["history"][-self.max_history :]
+            return list(self.state["history"])
+        return self.session_store.get_history(session_id)
+
+    def _save_turn(self, session_id: Optional[str], question: str, answer: str) -> None:
+        turn = [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": answer},
+        ]
+        if session_id is None:
+            if self.shared_history:
+                self.state["history"].extend(turn)
+        else:
+            self.session_store.append(session_id, turn)
 
-    def generate(self, question: str) -> str:
+    def generate(self, question: str, session_id: Optional[str] = None) -> str:
         """
         Executes the RAG pipeline for a given question.
 
         Args:
             question (str): The input question.
+            session_id (Optional[str]): Conversation the question belongs to. Each session
+                has its own history, so concurrent users do not share context. None uses
+                the default conversation held in ``self.state``, or no history when
+                ``shared_history`` is False.
 
         Returns:
             str: The generated answer from the pipeline.
         """
-        self.state["question"] = question
-
-        if self.max_history is not None:
-            self.state["history"] = self.state["history"][-self.max_history :]
-
-        if self.langfuse_config:
-            callback = self._build_langfuse_callback()
-            response = self.graph.invoke(self.state, config={"callbacks": [callback]})
-        else:
-            response = self.graph.invoke(self.state)
+        if session_id is None and self.shared_history:
+            self.state["question"] = question
+        state: Dict = {
+            "question": question,
+            "context": [],
+            "history": self._load_history(session_id),
+        }
 
-        answer = response["answer"]
-        self.state["history"].extend(
-            [
-                {"role": "user", "content": question},
-                {"role": "assistant", "content": answer},
-            ]
-        )
+        answer = None
+        if self.semantic_cache:
+            answer = self._lookup_semantic_cache(state)
+
+        if answer is None:
+            graph_input = {
+                "question": state["question"],
+                "context": [],
+                "history": state["history"],
+            }
+            if self.langfuse_config:
+                callback = self._build_langfuse_callback(session_id)
+                response = self.graph.invoke(
+                    graph_input, config={"callbacks": [callback]}
+                )
+            else:
+                response = self.graph.invoke(graph_input)
+
+            answer = response["answer"]
+            if self.semantic_cache:
+                state["context"] = response.get("context", [])
+                self._store_semantic_cache(state, answer)
+
+        self._save_turn(session_id, question, answer)
         return answer
 
-    def generate_streaming(self, question: str) -> Iterable[str]:
+    def generate_streaming(
+        self, question: str, session_id: Optional[str] = None
+    ) -> Iterable[str]:
         """
         Executes the RAG pipeline and streams the answer token by token.
 
@@ -279,41 +515,149 @@ class RAG:
 
         Args:
             question (str): The input question.
+            session_id (Optional[str]): Conversation the question belongs to. None uses
+                the default conversation held in ``self.state``.
 
         Yields:
             str: Successive chunks of the generated answer.
         """
-        if self.max_history is not None:
-            self.state["history"] = self.state["history"][-self.max_history :]
-
         state: Dict = {
             "question": question,
             "context": [],
-            "history": list(self.state["history"]),
+            "history": self._load_history(session_id),
         }
 
-        if self.reformulation:
+        cached_answer = None
+        if self.semantic_cache:
+            cached_answer = self._lookup_semantic_cache(state)
+        elif self.reformulation:
             state.update(self._reformulate(state))
 
-        state.update(self._retrieve(state))
+        if cached_answer is not None:
+            full_answer = cached_answer
+            yield cached_answer
+        else:
+            state.update(self._retrieve(state))
 
-        if self.cross_encoder:
-            state.update(self._rerank(state))
+            if self.cross_encoder:
+                state.update(self._rerank(state))
 
-        prompt = self._build_prompt(state)
+            prompt = self._build_prompt(state)
+
+            callbacks = (
+                [self._build_langfuse_callback(session_id)]
+                if self.langfuse_config
+                else None
+            )
 
-        callbacks = [self._build_langfuse_callback()] if self.langfuse_config else None
+            full_answer = ""
+            for chunk in self.llm.generate_streaming(
+                {"question": prompt, "history": state["history"]}, callbacks=callbacks
+            ):
+                full_answer += chunk
+                yield chunk
 
-        full_answer = ""
-        for chunk in self.llm.generate_streaming(
-            {"question": prompt, "history": state["history"]}, callbacks=callbacks
-        ):
-            full_answer += chunk
-            yield chunk
+            if self.semantic_cache:
+                self._store_semantic_cache(state, full_answer)
 
-        self.state["history"].extend(
-            [
-                {"role": "user", "content": question},
-                {"role": "assistant", "content": full_answer},
-            ]
-        )
+        self._save_turn(session_id, question, full_answer)
+
+    async def agenerate(self, question: str, session_id: Optional[str] = None) -> str:
+        """
+        Async counterpart of ``generate``, running the graph with ``ainvoke`` so that
+        LLM calls and remote vector searches do not hold a thread.
+
+        Args:
+            question (str): The input question.
+            session_id (Optional[str]): Conversation the question belongs to.
+
+        Returns:
+            str: The generated answer from the pipeline.
+        """
+        if session_id is None and self.shared_history:
+            self.state["question"] = question
+        state: Dict = {
+            "question": question,
+            "context": [],
+            "history": self._load_history(session_id),
+        }
+
+        answer = None
+        if self.semantic_cache:
+            answer = await self._alookup_semantic_cache(state)
+
+        if answer is None:
+            graph_input = {
+                "question": state["question"],
+                "context": [],
+                "history": state["history"],
+            }
+            if self.langfuse_config:
+                callback = self._build_langfuse_callback(session_id)
+                response = await self.graph.ainvoke(
+                    graph_input, config={"callbacks": [callback]}
+                )
+            else:
+                response = await self.graph.ainvoke(graph_input)
+
+            answer = response["answer"]
+            if self.semantic_cache:
+                state["context"] = response.get("context", [])
+                self._store_semantic_cache(state, answer)
+
+        self._save_turn(session_id, question, answer)
+        return answer
+
+    async def agenerate_streaming(
+        self, question: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async counterpart of ``generate_streaming``.
+
+        Args:
+            question (str): The input question.
+            session_id (Optional[str]): Conversation the question belongs to.
+
+        Yields:
+            str: Successive chunks of the generated answer.
+        """
+        state: Dict = {
+            "question": question,
+            "context": [],
+            "history": self._load_history(session_id),
+        }
+
+        cached_answer = None
+        if self.semantic_cache:
+            cached_answer = await self._alookup_semantic_cache(state)
+        elif self.reformulation:
+            state.update(await self._areformulate(state))
+
+        if cached_answer is not None:
+            full_answer = cached_answer
+            yield cached_answer
+        else:
+            state.update(await self._aretrieve(state))
+
+            if self.cross_encoder:
+                state.update(await self._arerank(state))
+
+            prompt = self._build_prompt(state)
+
+            callbacks = (
+                [self._build_langfuse_callback(session_id)]
+                if self.langfuse_config
+                else None
+            )
+
+            full_answer = ""
+            async for chunk in self.llm.agenerate_streaming(
+                {"question": prompt, "history": state["history"]}, callbacks=callbacks
+            ):
+                full_answer += chunk
+                yield chunk
+
+            if self.semantic_cache:
+                self._store_semantic_cache(state, full_answer)
+
+        self._save_turn(session_id, question, full_answer)
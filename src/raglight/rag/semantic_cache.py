@@ -0,0 +1,172 @@
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..embeddings.embeddings_model import EmbeddingsModel
+from ..observability.metrics import record_cache_lookup
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    answer: str
+    index_generation: Any = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_hit_at: float = field(default_factory=time.monotonic)
+
+
+class SemanticCache:
+    """
+    Answer cache keyed by the meaning of the standalone question.
+
+    Questions are embedded and compared by cosine similarity against the questions of
+    previously generated answers, kept in a flat in-memory index (one normalized vector
+    per row). A cached answer is served when the best match is above
+    ``similarity_threshold``, has not expired and was produced against the current
+    index generation of the vector store, i.e. the chunks it was grounded on are still
+    the ones retrieval would see.
+
+    The index generation is a per-process counter, so entries are only invalidated by
+    writes made through the same ``VectorStore`` instance. When several processes
+    (e.g. API workers) or external jobs write to the same collection, keep ``ttl``
+    short or disable the cache.
+
+    Attributes:
+        embeddings_model (EmbeddingsModel): Model used to embed questions.
+        similarity_threshold (float): Minimum cosine similarity for a hit.
+        ttl (Optional[float]): Lifetime of an entry in seconds. None means no expiry.
+        max_entries (int): Maximum number of cached answers; least recently used are evicted.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that fell through to the pipeline.
+    """
+
+    def __init__(
+        self,
+        embeddings_model: EmbeddingsModel,
+        similarity_threshold: float = 0.95,
+        ttl: Optional[float] = 3600,
+        max_entries: int = 1024,
+    ) -> None:
+        self.embeddings_model = embeddings_model
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Optional[CachedAnswer]] = [None] * self.max_entries
+        self._lock = threading.Lock()
+
+    def embed(self, question: str) -> np.ndarray:
+        """
+        Embeds and normalizes a question for ``lookup`` and ``store``.
+        """
+        vector = np.asarray(
+            self.embeddings_model.embed_query(question), dtype=np.float32
+        )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _is_expired(self, entry: CachedAnswer, now: float) -> bool:
+        return self.ttl is not None and now - entry.created_at > self.ttl
+
+    def lookup(self, vector: np.ndarray, index_generation: Any = 0) -> Optional[str]:
+        """
+        Returns the cached answer of the most similar question, if any.
+
+        Args:
+            vector (np.ndarray): The normalized question embedding returned by ``embed``.
+            index_generation (Any): The current generation of the vector store index.
+
+        Returns:
+            Optional[str]: The cached answer, or None on a miss.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._vectors is not None:
+                similarities = self._vectors @ vector
+                for slot in np.argsort(-similarities):
+                    if similarities[slot] < self.similarity_threshold:
+                        break
+                    entry = self._entries[slot]
+                    if entry is None:
+                        continue
+                    if (
+                        self._is_expired(entry, now)
+                        or entry.index_generation != index_generation
+                    ):
+                        self._evict(slot)
+                        continue
+                    entry.last_hit_at = now
+                    self.hits += 1
+                    record_cache_lookup("semantic", True)
+                    return entry.answer
+            self.misses += 1
+            record_cache_lookup("semantic", False)
+            return None
+
+    def store(
+        self,
+        vector: np.ndarray,
+        question: str,
+        answer: str,
+        index_generation: Any = 0,
+    ) -> None:
+        """
+        Caches an answer under the embedding of its standalone question.
+
+        Args:
+            vector (np.ndarray): The normalized question embedding returned by ``embed``.
+            question (str): The standalone question.
+            answer (str): The generated answer.
+            index_generation (Any): The vector store index generation used for the answer.
+        """
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+            slot = self._free_slot()
+            self._vectors[slot] = vector
+            self._entries[slot] = CachedAnswer(
+                question=question,
+                answer=answer,
+                index_generation=index_generation,
+            )
+
+    def _free_slot(self) -> int:
+        for slot, entry in enumerate(self._entries):
+            if entry is None:
+                return slot
+        now = time.monotonic()
+        for slot, entry in enumerate(self._entries):
+            if self._is_expired(entry, now):
+                return slot
+        return min(
+            range(self.max_entries), key=lambda slot: self._entries[slot].last_hit_at
+        )
+
+    def _evict(self, slot: int) -> None:
+        self._entries[slot] = None
+        self._vectors[slot] = 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._entries = [None] * self.max_entries
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": sum(entry is not None for entry in self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
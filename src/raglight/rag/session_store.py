@@ -0,0 +1,159 @@
+from __future__ import annotations
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class SessionStore(ABC):
+    """
+    Abstract base class for per-session conversation histories.
+
+    A history is a list of ``{"role": ..., "content": ...}`` messages. Stores keep at most
+    ``max_history`` messages per session, so memory stays bounded however long a
+    conversation runs.
+
+    Attributes:
+        max_history (Optional[int]): Maximum number of messages kept per session.
+            None means unlimited.
+    """
+
+    def __init__(self, max_history: Optional[int] = 20) -> None:
+        self.max_history = max_history
+
+    def _trim(self, history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        if self.max_history is None:
+            return history
+        return history[-self.max_history :] if self.max_history > 0 else []
+
+    @abstractmethod
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """
+        Returns a copy of the history of a session, empty for an unknown session.
+        """
+        pass
+
+    @abstractmethod
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        """
+        Appends messages to the history of a session, creating it if needed.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Thread-safe session store held in process memory.
+
+    Sessions are evicted in least recently used order once ``max_sessions`` is reached.
+
+    Attributes:
+        max_sessions (int): Maximum number of sessions kept.
+    """
+
+    def __init__(
+        self, max_history: Optional[int] = 20, max_sessions: int = 10_000
+    ) -> None:
+        super().__init__(max_history)
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, List[Dict[str, str]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            return [dict(msg) for msg in history]
+
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        with self._lock:
+            history = self._sessions.get(session_id, [])
+            self._sessions[session_id] = self._trim(history + list(messages))
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store persisted in a local SQLite database, shared across workers and restarts.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+    """
+
+    def __init__(self, path: str, max_history: Optional[int] = 20) -> None:
+        super().__init__(max_history)
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+                "role TEXT NOT NULL, content TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id)"
+            )
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        if self.max_history == 0:
+            return []
+        limit = -1 if self.max_history is None else self.max_history
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? "
+                "ORDER BY id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO messages (session_id, role, content) VALUES (?, ?, ?)",
+                [(session_id, msg["role"], msg["content"]) for msg in messages],
+            )
+            if self.max_history is not None:
+                self._conn.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND id NOT IN ("
+                    "SELECT id FROM messages WHERE session_id = ? "
+                    "ORDER BY id DESC LIMIT ?)",
+                    (session_id, session_id, self.max_history),
+                )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE session_id = ?", (session_id,)
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages")
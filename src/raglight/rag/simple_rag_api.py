@@ -1,4 +1,4 @@
-from typing import Iterable, List
+from typing import AsyncIterator, Iterable, List, Optional
 import shutil
 import logging
 
@@ -6,6 +6,7 @@ from ..config.vector_store_config import VectorStoreConfig
 from ..config.rag_config import RAGConfig
 from ..rag.builder import Builder
 from ..rag.rag import RAG
+from ..rag.semantic_cache import SemanticCache
 from ..vectorstore.vector_store import VectorStore
 from ..models.data_source_model import DataSource, FolderSource, GitHubSource
 from ..scrapper.github_scrapper import GithubScrapper
@@ -44,14 +45,25 @@ class RAGPipeline:
         provider: str = config.provider
         embeddings_provider: str = vector_store_config.provider
         k: int = config.k
-        self.rag: RAG = (
-            Builder()
-            .with_embeddings(
-                embeddings_provider,
-                model_name=model_embeddings,
-                api_base=embeddings_api_base,
+        builder = Builder()
+        builder.cross_encoder = config.cross_encoder_model
+        builder.with_embeddings(
+            embeddings_provider,
+            model_name=model_embeddings,
+            api_base=embeddings_api_base,
+        )
+        semantic_cache = (
+            SemanticCache(
+                builder.embeddings,
+                similarity_threshold=config.semantic_cache_threshold,
+                ttl=config.semantic_cache_ttl,
+                max_entries=config.semantic_cache_max_entries,
             )
-            .with_vector_store(
+            if config.semantic_cache
+            else None
+        )
+        self.rag: RAG = (
+            builder.with_vector_store(
                 database,
                 persist_directory=persist_directory,
                 collection_name=collection_name,
@@ -59,18 +71,30 @@ class RAGPipeline:
                 port=vector_store_config.port,
                 search_type=vector_store_config.search_type,
                 alpha=vector_store_config.hybrid_alpha,
+                quantization=vector_store_config.quantization,
+                search_dimensions=vector_store_config.search_dimensions,
             )
             .with_llm(
                 provider,
                 model_name=model_name,
                 system_prompt=system_prompt,
                 api_base=api_base,
+                response_cache=config.response_cache,
             )
             .build_rag(
                 k=k,
                 langfuse_config=config.langfuse_config,
                 reformulation=config.reformulation,
                 max_history=config.max_history,
+                rerank_candidates=config.rerank_candidates,
+                rerank_batch_size=config.rerank_batch_size,
+                rerank_patience=config.rerank_patience,
+                rerank_min_score=config.rerank_min_score,
+                context_max_tokens=config.context_max_tokens,
+                context_duplicate_threshold=config.context_duplicate_threshold,
+                semantic_cache=semantic_cache,
+                session_store=config.session_store,
+                shared_history=config.shared_history,
             )
         )
         self.github_scrapper: GithubScrapper = GithubScrapper()
@@ -113,27 +137,62 @@ class RAGPipeline:
         shutil.rmtree(repos_path)
         logging.info("✅ GitHub repositories cleaned successfully!")
 
-    def generate(self, question: str) -> str:
+    def generate(self, question: str, session_id: Optional[str] = None) -> str:
         """
         Asks a question to the pipeline and retrieves the generated answer.
 
         Args:
             question (str): The question to ask the pipeline.
+            session_id (Optional[str]): Conversation the question belongs to.
 
         Returns:
             str: The generated answer from the pipeline.
         """
-        response: str = self.rag.generate(question)
+        response: str = self.rag.generate(question, session_id=session_id)
         return response
 
-    def generate_streaming(self, question: str) -> Iterable[str]:
+    def generate_streaming(
+        self, question: str, session_id: Optional[str] = None
+    ) -> Iterable[str]:
         """
         Asks a question to the pipeline and streams the answer token by token.
 
         Args:
             question (str): The question to ask the pipeline.
+            session_id (Optional[str]): Conversation the question belongs to.
+
+        Yields:
+            str: Successive chunks of the generated answer.
+        """
+        yield from self.rag.generate_streaming(question, session_id=session_id)
+
+    async def agenerate(self, question: str, session_id: Optional[str] = None) -> str:
+        """
+        Asks a question to the pipeline without blocking the event loop.
+
+        Args:
+            question (str): The question to ask the pipeline.
+            session_id (Optional[str]): Conversation the question belongs to.
+
+        Returns:
+            str: The generated answer from the pipeline.
+        """
+        return await self.rag.agenerate(question, session_id=session_id)
+
+    async def agenerate_streaming(
+        self, question: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Asks a question to the pipeline and streams the answer without blocking the event loop.
+
+        Args:
+            question (str): The question to ask the pipeline.
+            session_id (Optional[str]): Conversation the question belongs to.
 
         Yields:
             str: Successive chunks of the generated answer.
         """
-        yield from self.rag.generate_streaming(question)
+        async for chunk in self.rag.agenerate_streaming(
+            question, session_id=session_id
+        ):
+            yield chunk
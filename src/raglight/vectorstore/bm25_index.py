@@ -1,11 +1,47 @@
 from __future__ import annotations
 import json
 import re
+import zlib
+from collections import Counter
 from pathlib import Path
 from typing import List, Tuple, Optional
 
 from rank_bm25 import BM25Okapi
 
+# BM25 parameters of the sparse vectors stored in the vector database. The average
+# document length cannot be known when a document is indexed, so a typical chunk
+# length (in tokens) is assumed.
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_AVG_LENGTH = 256.0
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def _term_id(token: str) -> int:
+    # A stable hash, unlike hash(), so that every process agrees on the ids.
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def sparse_document_vector(text: str) -> Tuple[List[int], List[float]]:
+    """
+    Returns the sparse lexical vector of a document: term ids and their BM25 term
+    frequency weights. Vector databases apply the IDF part at query time.
+    """
+    counts = Counter(_term_id(token) for token in tokenize(text))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * sum(counts.values()) / BM25_AVG_LENGTH)
+    indices = list(counts)
+    values = [counts[i] * (BM25_K1 + 1) / (counts[i] + norm) for i in indices]
+    return indices, values
+
+
+def sparse_query_vector(text: str) -> Tuple[List[int], List[float]]:
+    """Returns the sparse lexical vector of a query: each distinct term weighs 1."""
+    indices = list(dict.fromkeys(_term_id(token) for token in tokenize(text)))
+    return indices, [1.0] * len(indices)
+
 
 class BM25Index:
     """Lightweight BM25 index over a list of text documents."""
@@ -15,9 +51,9 @@ class BM25Index:
         self._bm25: Optional[BM25Okapi] = None
 
     def _tokenize(self, text: str) -> List[str]:
-        return re.findall(r"\w+", text.lower())
+        return tokenize(text)
 
-    def _rebuild(self) -> None:
+    def rebuild(self) -> None:
         if self.corpus:
             self._bm25 = BM25Okapi([self._tokenize(t) for t in self.corpus])
         else:
@@ -25,7 +61,14 @@ class BM25Index:
 
     def add_documents(self, texts: List[str]) -> None:
         self.corpus.extend(texts)
-        self._rebuild()
+        self.rebuild()
+
+    def extend(self, texts: List[str]) -> None:
+        """
+        Appends texts without rebuilding the index, to load a corpus in several
+        batches. Call ``rebuild`` once all batches are added.
+        """
+        self.corpus.extend(texts)
 
     def search(self, query: str, k: int) -> List[Tuple[int, float]]:
         if not self._bm25 or not self.corpus:
@@ -40,4 +83,4 @@ class BM25Index:
 
     def load(self, path: Path) -> None:
         self.corpus = json.loads(path.read_text(encoding="utf-8"))
-        self._rebuild()
+        self.rebuild()
@@ -1,16 +1,20 @@
 from __future__ import annotations
 import logging
 import uuid
-from typing import List, Dict, Optional, Any, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple, cast
 from typing_extensions import override
 
 import chromadb
+import numpy as np
 from chromadb.api.types import EmbeddingFunction, Documents, Embeddings
+from chromadb.errors import InvalidCollectionException
 from langchain_core.documents import Document
 
 from ..document_processing.document_processor import DocumentProcessor
-from .vector_store import VectorStore
+from .vector_store import BM25_REBUILD_PAGE_SIZE, VectorStore
 from ..embeddings.embeddings_model import EmbeddingsModel
+from ..observability.metrics import STAGE_LATENCY
 
 
 class ChromaEmbeddingAdapter(EmbeddingFunction):
@@ -30,9 +34,51 @@ class ChromaEmbeddingAdapter(EmbeddingFunction):
             )
 
 
+# Documents read per request when filling the prefix collection of an existing one.
+PREFIX_BACKFILL_BATCH = 1000
+
+
+def _chroma_distances(vectors: np.ndarray, query: np.ndarray, space: str) -> np.ndarray:
+    """
+    Distances of ``vectors`` to ``query`` as Chroma defines them for a collection's
+    ``hnsw:space``: squared L2, ``1 - cosine similarity`` or ``1 - inner product``.
+    """
+    if space == "cosine":
+        norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+        norms[norms == 0] = 1.0
+        return 1.0 - (vectors @ query) / norms
+    if space == "ip":
+        return 1.0 - vectors @ query
+    return ((vectors - query) ** 2).sum(axis=1)
+
+
+def _collection_space(collection: Any) -> str:
+    return (collection.metadata or {}).get("hnsw:space", "l2")
+
+
+def _distance_score(distance: float, space: str) -> float:
+    """
+    Maps a Chroma distance (lower is better) to a relevance score (higher is better):
+    the inner product itself for ``ip``, whose distances can be negative, and
+    ``1 / (1 + distance)``, in (0, 1], for the non-negative L2 and cosine distances.
+    """
+    if space == "ip":
+        return 1.0 - distance
+    return 1.0 / (1.0 + distance)
+
+
 class ChromaVS(VectorStore):
     """
     Concrete implementation for ChromaDB using the official chromadb library.
+
+    With ``search_dimensions``, a companion collection indexes the first
+    ``search_dimensions`` components of each vector (Matryoshka embedding models
+    keep most of their accuracy in a prefix). Searches of the main collection
+    shortlist ``k * prefix_oversampling`` documents on the short vectors, then rank
+    them with their full vectors.
+
+    Documents are written in batches of ``write_batch_size``, capped by the client's
+    maximum batch size, with their embeddings computed ahead of the write.
     """
 
     def __init__(
@@ -45,6 +91,10 @@ class ChromaVS(VectorStore):
         port: int = None,
         search_type: str = "semantic",
         alpha: float = 0.5,
+        quantization: Optional[str] = None,
+        search_dimensions: Optional[int] = None,
+        prefix_oversampling: float = 4.0,
+        write_batch_size: int = 512,
     ) -> None:
         super().__init__(
             persist_directory, embeddings_model, custom_processors, search_type, alpha
@@ -54,6 +104,14 @@ class ChromaVS(VectorStore):
         self.host = host
         self.port = port
         self.collection_name = collection_name
+        self.write_batch_size = write_batch_size
+        self._max_batch_size: Optional[int] = None
+
+        if quantization:
+            logging.warning(
+                "ChromaDB does not support vector quantization: vectors are stored as "
+                "float32. Use Qdrant or the local store for quantized storage."
+            )
 
         self.embedding_function = ChromaEmbeddingAdapter(self.embeddings_model)
 
@@ -74,6 +132,22 @@ class ChromaVS(VectorStore):
             name=f"{collection_name}_classes",
             embedding_function=self.embedding_function,
         )
+        # Handles of the collections already searched, by name.
+        self._collection_handles: Dict[str, Any] = {
+            self.collection.name: self.collection,
+            self.collection_classes.name: self.collection_classes,
+        }
+
+        self.search_dimensions = search_dimensions
+        self.prefix_oversampling = prefix_oversampling
+        self.collection_prefix: Any = None
+        if search_dimensions:
+            self.collection_prefix = self.client.get_or_create_collection(
+                name=f"{collection_name}_prefix{search_dimensions}",
+                embedding_function=None,
+                metadata={"hnsw:space": "cosine"},
+            )
+            self._backfill_prefix_collection()
 
         bm25_path = self._bm25_path()
         if bm25_path and bm25_path.exists():
@@ -81,14 +155,67 @@ class ChromaVS(VectorStore):
         elif search_type in ("bm25", "hybrid"):
             self._rebuild_bm25_from_chroma()
 
+    def _backfill_prefix_collection(self) -> None:
+        """
+        Adds the prefix vectors of documents stored before ``search_dimensions`` was set.
+        """
+        if self.collection_prefix.count() >= self.collection.count():
+            return
+        logging.info(
+            f"⏳ Indexing {self.search_dimensions}-dimension prefixes of "
+            f"'{self.collection.name}'..."
+        )
+        offset = 0
+        while True:
+            batch = self.collection.get(
+                include=["embeddings", "metadatas"],
+                limit=PREFIX_BACKFILL_BATCH,
+                offset=offset,
+            )
+            ids = batch["ids"]
+            if not ids:
+                break
+            known = set(self.collection_prefix.get(ids=ids, include=[])["ids"])
+            rows = [
+                (doc_id, embedding, metadata)
+                for doc_id, embedding, metadata in zip(
+                    ids, batch["embeddings"], batch["metadatas"]
+                )
+                if doc_id not in known
+            ]
+            if rows:
+                self.collection_prefix.add(
+                    ids=[row[0] for row in rows],
+                    embeddings=[list(row[1][: self.search_dimensions]) for row in rows],
+                    metadatas=[row[2] or None for row in rows],
+                )
+            offset += len(ids)
+
+    @override
+    def filter_coverage(
+        self,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> Dict[str, bool]:
+        # ChromaDB indexes every metadata key (by key and value) in its SQLite store.
+        return {field: True for field in filter or {}}
+
     def _rebuild_bm25_from_chroma(self) -> None:
-        result = self.collection.get()
-        texts = result.get("documents") or []
-        if texts:
-            self._bm25.add_documents(texts)
+        def fetch_page(offset: Optional[int]) -> Tuple[List[str], Optional[int]]:
+            offset = offset or 0
+            page = self.collection.get(
+                include=["documents"], limit=BM25_REBUILD_PAGE_SIZE, offset=offset
+            )
+            ids = page["ids"]
+            texts = [text for text in page.get("documents") or [] if text]
+            more = len(ids) == BM25_REBUILD_PAGE_SIZE
+            return texts, offset + len(ids) if more else None
+
+        self._rebuild_bm25(fetch_page, total=self.collection.count())
 
     @override
     def add_documents(self, documents: List[Document]) -> None:
+        documents = self._fit_documents(documents)
         if not documents:
             return
 
@@ -98,11 +225,13 @@ class ChromaVS(VectorStore):
 
         self._add_docs_to_collection(self.collection, documents)
         self._update_bm25(documents)
+        self._mark_index_changed()
 
         logging.info("✅ Documents successfully added to the main collection.")
 
     @override
     def add_class_documents(self, documents: List[Document]) -> None:
+        documents = self._fit_documents(documents)
         if not documents:
             return
 
@@ -114,16 +243,91 @@ class ChromaVS(VectorStore):
 
         logging.info("✅ Class documents successfully added to the class collection.")
 
+    def _batch_size(self) -> int:
+        """
+        Number of documents written per ``add``: ``write_batch_size``, capped by the
+        largest batch the ChromaDB client accepts.
+        """
+        if self._max_batch_size is None:
+            get_max_batch_size = getattr(self.client, "get_max_batch_size", None)
+            self._max_batch_size = (
+                get_max_batch_size() if get_max_batch_size else self.write_batch_size
+            )
+        return max(1, min(self.write_batch_size, self._max_batch_size))
+
     def _add_docs_to_collection(
         self, collection: Any, documents: List[Document]
+    ) -> None:
+        """
+        Embeds and writes documents in batches that ChromaDB accepts.
+
+        Embeddings are computed by RAGLight and passed to ChromaDB, rather than
+        computed by the collection inside ``add``, so that the next batch is embedded
+        on a worker thread while the current one is written.
+        """
+        size = self._batch_size()
+        batches = [documents[i : i + size] for i in range(0, len(documents), size)]
+        if len(batches) == 1:
+            self._write_batch(collection, documents, self._embed_batch(documents))
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._embed_batch, batches[0])
+            for i, batch in enumerate(batches):
+                embeddings = pending.result()
+                if i + 1 < len(batches):
+                    pending = executor.submit(self._embed_batch, batches[i + 1])
+                self._write_batch(collection, batch, embeddings)
+
+    def _embed_batch(self, documents: List[Document]) -> List[List[float]]:
+        return self.embeddings_model.embed_documents(
+            [doc.page_content for doc in documents]
+        )
+
+    def _write_batch(
+        self,
+        collection: Any,
+        documents: List[Document],
+        embeddings: List[List[float]],
     ) -> None:
         ids = [str(uuid.uuid4()) for _ in documents]
         texts = [doc.page_content for doc in documents]
         metadatas = [
             doc.metadata if isinstance(doc.metadata, dict) else {} for doc in documents
         ]
+        collection.add(
+            ids=ids, documents=texts, metadatas=metadatas, embeddings=embeddings
+        )
+        if collection is self.collection and self.collection_prefix is not None:
+            self.collection_prefix.add(
+                ids=ids,
+                embeddings=[list(e[: self.search_dimensions]) for e in embeddings],
+                metadatas=[metadata or None for metadata in metadatas],
+            )
 
-        collection.add(ids=ids, documents=texts, metadatas=metadatas)
+    def _target_collection(self, collection_name: Optional[str]) -> Any:
+        return (
+            self._collection_handle(collection_name)
+            if collection_name
+            else self.collection
+        )
+
+    def _collection_handle(self, name: str) -> Optional[Any]:
+        """
+        Returns the handle of an existing collection, fetched from ChromaDB on first
+        use only. Searching a collection that does not exist does not create it.
+        """
+        handle = self._collection_handles.get(name)
+        if handle is None:
+            try:
+                handle = self.client.get_collection(
+                    name=name, embedding_function=self.embedding_function
+                )
+            except (InvalidCollectionException, ValueError):
+                logging.warning(f"ChromaDB collection '{name}' does not exist")
+                return None
+            self._collection_handles[name] = handle
+        return handle
 
     @override
     def _semantic_search(
@@ -133,12 +337,21 @@ class ChromaVS(VectorStore):
         filter: Optional[Dict[str, Any]],
         collection_name: Optional[str] = None,
     ) -> List[Document]:
-        target_collection = self.collection
-        if collection_name and collection_name != self.collection.name:
-            target_collection = self.client.get_or_create_collection(
-                name=collection_name, embedding_function=self.embedding_function
-            )
-        return self._query_collection(target_collection, question, k, filter)
+        return self._query_collection(
+            self._target_collection(collection_name), question, k, filter
+        )
+
+    @override
+    def _semantic_search_with_scores(
+        self,
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> List[Tuple[Document, Optional[float]]]:
+        return self._query_collection_with_scores(
+            self._target_collection(collection_name), question, k, filter
+        )
 
     @override
     def similarity_search_class(
@@ -149,22 +362,51 @@ class ChromaVS(VectorStore):
         collection_name: Optional[str] = None,
     ) -> List[Document]:
         target_collection = self.collection_classes
-
         if collection_name:
-            class_col_name = f"{collection_name}_classes"
-            if class_col_name != self.collection_classes.name:
-                target_collection = self.client.get_or_create_collection(
-                    name=class_col_name, embedding_function=self.embedding_function
-                )
-
+            target_collection = self._collection_handle(f"{collection_name}_classes")
         return self._query_collection(target_collection, question, k, filter)
 
     def _query_collection(
         self, collection: Any, question: str, k: int, filter: Optional[Dict[str, Any]]
     ) -> List[Document]:
-        results = collection.query(query_texts=[question], n_results=k, where=filter)
+        return [
+            doc
+            for doc, _ in self._query_collection_with_scores(
+                collection, question, k, filter
+            )
+        ]
+
+    def _query_collection_with_scores(
+        self,
+        collection: Optional[Any],
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+    ) -> List[Tuple[Document, Optional[float]]]:
+        if collection is None:
+            return []
+        query = self._embed_query(question)
+        with STAGE_LATENCY.time(stage="vector_search"):
+            if collection is self.collection and self.collection_prefix is not None:
+                return self._two_stage_query(query, k, filter)
+            return self._query_embedding(collection, query, k, filter)
+
+    def _query_embedding(
+        self,
+        collection: Any,
+        query: List[float],
+        k: int,
+        filter: Optional[Dict[str, Any]],
+    ) -> List[Tuple[Document, Optional[float]]]:
+        results = collection.query(
+            query_embeddings=[query],
+            n_results=k,
+            where=filter,
+            include=["documents", "metadatas", "distances"],
+        )
 
-        found_docs: List[Document] = []
+        found_docs: List[Tuple[Document, Optional[float]]] = []
+        space = _collection_space(collection)
         if results["documents"] and results["documents"][0]:
             docs_list = results["documents"][0]
             metas_list = (
@@ -172,12 +414,65 @@ class ChromaVS(VectorStore):
                 if results["metadatas"]
                 else [{}] * len(docs_list)
             )
-            for text, meta in zip(docs_list, metas_list):
+            ids_list = (
+                results["ids"][0] if results.get("ids") else [None] * len(docs_list)
+            )
+            distances = (
+                results["distances"][0]
+                if results.get("distances")
+                else [None] * len(docs_list)
+            )
+            for doc_id, text, meta, distance in zip(
+                ids_list, docs_list, metas_list, distances
+            ):
                 safe_meta = meta if isinstance(meta, dict) else {}
-                found_docs.append(Document(page_content=text, metadata=safe_meta))
+                score = (
+                    None
+                    if distance is None
+                    else _distance_score(float(distance), space)
+                )
+                found_docs.append(
+                    (Document(id=doc_id, page_content=text, metadata=safe_meta), score)
+                )
 
         return found_docs
 
+    def _two_stage_query(
+        self, query_embedding: List[float], k: int, filter: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Document, Optional[float]]]:
+        """
+        Shortlists documents on their prefix vectors, then ranks the shortlist by the
+        distance of their full vectors in the main collection's space, scored like
+        ``_query_embedding``.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        shortlist = self.collection_prefix.query(
+            query_embeddings=[query[: self.search_dimensions].tolist()],
+            n_results=max(k, int(k * self.prefix_oversampling)),
+            where=filter,
+            include=[],
+        )
+        ids = shortlist["ids"][0] if shortlist["ids"] else []
+        if not ids:
+            return []
+        full = self.collection.get(
+            ids=ids, include=["embeddings", "documents", "metadatas"]
+        )
+        vectors = np.asarray(full["embeddings"], dtype=np.float32)
+        space = _collection_space(self.collection)
+        distances = _chroma_distances(vectors, query, space)
+        return [
+            (
+                Document(
+                    id=full["ids"][i],
+                    page_content=full["documents"][i],
+                    metadata=full["metadatas"][i] or {},
+                ),
+                _distance_score(float(distances[i]), space),
+            )
+            for i in np.argsort(distances)[:k]
+        ]
+
     @override
     def get_available_collections(self) -> List[str]:
         try:
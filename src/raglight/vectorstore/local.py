@@ -0,0 +1,789 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing_extensions import override
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process.
+    fcntl = None
+
+import numpy as np
+from langchain_core.documents import Document
+
+from ..config.settings import Settings
+from ..document_processing.document_processor import DocumentProcessor
+from ..embeddings.embeddings_model import EmbeddingsModel
+from ..observability.metrics import STAGE_LATENCY
+from .vector_store import VectorStore
+
+MANIFEST_FILE = "manifest.json"
+HNSW_FILE = "hnsw.bin"
+LOCK_FILE = "write.lock"
+
+# Segment sizes grow by this factor from one compaction tier to the next, and this
+# many adjacent segments of a tier are merged together.
+MERGE_FACTOR = 4
+
+INDEX_FLAT = "flat"
+INDEX_HNSW = "hnsw"
+INDEX_AUTO = "auto"
+
+# Rows scored at once by quantized searches, to bound the float32 temporaries.
+QUANTIZED_BLOCK_ROWS = 16_384
+
+# Number of set bits of every byte value, for Hamming distances on binary codes.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def _tmp_path(path: Path) -> Path:
+    # Unique per writer, so that concurrent writers never share a temporary file.
+    return path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _write_atomic(path: Path, write: Any) -> None:
+    tmp = _tmp_path(path)
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _tier(rows: int) -> int:
+    """Returns the compaction tier of a segment: the base ``MERGE_FACTOR`` log of its size."""
+    tier = 0
+    while rows >= MERGE_FACTOR:
+        rows //= MERGE_FACTOR
+        tier += 1
+    return tier
+
+
+class _Segment:
+    """
+    An immutable slice of a collection: float32 vectors memory-mapped from a ``.npy``
+    file, and a JSON sidecar holding the ids, texts and metadata column by column.
+    """
+
+    def __init__(self, directory: Path, name: str) -> None:
+        self.name = name
+        self.vectors: np.ndarray = np.load(directory / f"{name}.npy", mmap_mode="r")
+        columns = json.loads((directory / f"{name}.json").read_text(encoding="utf-8"))
+        self.ids: List[str] = columns["ids"]
+        self.texts: List[str] = columns["page_content"]
+        self.directory = directory
+        self._codes: Dict[str, Dict[str, np.ndarray]] = {}
+        self._prefix_norms: Dict[int, np.ndarray] = {}
+        self.metadata: Dict[str, np.ndarray] = {}
+        for key, values in columns["metadata"].items():
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            self.metadata[key] = column
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def write(
+        directory: Path,
+        name: str,
+        vectors: np.ndarray,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        keys = sorted({key for metadata in metadatas for key in metadata})
+        columns = {
+            "ids": ids,
+            "page_content": texts,
+            "metadata": {key: [m.get(key) for m in metadatas] for key in keys},
+        }
+        _write_atomic(directory / f"{name}.npy", lambda f: np.save(f, vectors))
+        _write_atomic(
+            directory / f"{name}.json",
+            lambda f: f.write(json.dumps(columns, ensure_ascii=False).encode("utf-8")),
+        )
+
+    def codes(self, quantization: str) -> Dict[str, np.ndarray]:
+        """
+        Returns the quantized codes of the vectors, held in RAM: int8 codes with a
+        per-dimension scale for ``scalar``, one bit per dimension for ``binary``.
+        They are computed on first use and saved next to the segment.
+        """
+        codes = self._codes.get(quantization)
+        if codes is not None:
+            return codes
+        path = self.directory / f"{self.name}.{quantization}.npz"
+        if not path.exists():
+            vectors = np.asarray(self.vectors)
+            if quantization == Settings.QUANTIZATION_SCALAR:
+                scale = np.abs(vectors).max(axis=0) if len(vectors) else np.ones(1)
+                scale[scale == 0] = 1.0
+                arrays = {
+                    "codes": np.round(vectors / scale * 127).astype(np.int8),
+                    "scale": (scale / 127).astype(np.float32),
+                }
+            else:
+                arrays = {"codes": np.packbits(vectors > 0, axis=1)}
+            _write_atomic(path, lambda f: np.savez(f, **arrays))
+        with np.load(path) as data:
+            codes = {key: data[key] for key in data.files}
+        self._codes[quantization] = codes
+        return codes
+
+    def approximate_scores(self, query: np.ndarray, quantization: str) -> np.ndarray:
+        """
+        Scores every row from its quantized code: the dot product with the dequantized
+        vector for ``scalar``, minus the Hamming distance of the signs for ``binary``.
+        """
+        codes = self.codes(quantization)
+        if quantization == Settings.QUANTIZATION_SCALAR:
+            scaled_query = (query * codes["scale"]).astype(np.float32)
+            return np.concatenate(
+                [
+                    codes["codes"][start : start + QUANTIZED_BLOCK_ROWS] @ scaled_query
+                    for start in range(0, len(self), QUANTIZED_BLOCK_ROWS)
+                ]
+            )
+        query_bits = np.packbits(query > 0)
+        return -np.concatenate(
+            [
+                _POPCOUNT[
+                    codes["codes"][start : start + QUANTIZED_BLOCK_ROWS] ^ query_bits
+                ].sum(axis=1, dtype=np.float32)
+                for start in range(0, len(self), QUANTIZED_BLOCK_ROWS)
+            ]
+        )
+
+    def prefix_scores(self, query: np.ndarray, dims: int) -> np.ndarray:
+        """
+        Cosine similarity of the first ``dims`` components of every row with those of
+        the query, up to the query's norm, which does not change the ranking.
+        """
+        norms = self._prefix_norms.get(dims)
+        if norms is None:
+            norms = np.linalg.norm(self.vectors[:, :dims], axis=1)
+            norms[norms == 0] = 1.0
+            self._prefix_norms[dims] = norms
+        return (self.vectors[:, :dims] @ query[:dims]) / norms
+
+    def metadata_rows(self) -> List[Dict[str, Any]]:
+        return [self.row_metadata(i) for i in range(len(self))]
+
+    def row_metadata(self, i: int) -> Dict[str, Any]:
+        return {
+            key: column[i]
+            for key, column in self.metadata.items()
+            if column[i] is not None
+        }
+
+    def mask(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Rows whose metadata equals every value of ``filter``, or None without filter."""
+        if not filter:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in filter.items():
+            column = self.metadata.get(key)
+            if column is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= column == value
+        return mask
+
+    def document(self, i: int) -> Document:
+        return Document(
+            id=self.ids[i], page_content=self.texts[i], metadata=self.row_metadata(i)
+        )
+
+
+class LocalCollection:
+    """
+    One collection of a ``LocalVS``: a directory of append-only segments listed in a
+    manifest.
+
+    Each write adds a new segment and atomically replaces the manifest, so segments
+    never change once written. They are memory-mapped rather than read, which makes
+    opening a collection instant whatever its size and lets processes sharing the
+    directory share the page cache. Readers pick up segments written by another
+    process the next time they search.
+
+    Writes (appends, compactions, the HNSW graph and the manifest) hold an exclusive
+    ``fcntl`` lock on the collection's ``write.lock`` file, so several processes can
+    write to the same directory. Searches never write: only a writer builds and saves
+    the HNSW graph, and a reader falls back to the flat scan while the graph it
+    loaded does not cover every row. Without ``fcntl`` (Windows), writes are only
+    serialized within a process.
+
+    Searches are exact (a matrix-vector product over each segment) until the
+    collection reaches ``hnsw_threshold`` vectors; beyond that, unfiltered searches go
+    through an HNSW graph when ``hnswlib`` is installed. Filtered searches stay exact
+    over the matching rows.
+
+    With ``quantization``, flat searches scan int8 (``scalar``, 4x smaller) or 1-bit
+    (``binary``, 32x smaller) codes kept in RAM, then rescore the
+    ``k * oversampling`` best candidates against the float32 vectors, read from the
+    memory-mapped segments. The HNSW graph holds its own float32 copy of the vectors,
+    so a quantized collection is not switched to HNSW by ``auto``.
+
+    With ``search_dimensions``, flat searches first score the rows on the first
+    ``search_dimensions`` components only (Matryoshka embeddings), then rescore the
+    ``k * prefix_oversampling`` best rows with the full vectors.
+
+    Attributes:
+        directory (Path): Directory of the collection.
+        index_type (str): ``flat``, ``hnsw`` or ``auto``.
+        hnsw_threshold (int): Number of vectors from which ``auto`` uses HNSW.
+        ef_search (int): Size of the HNSW candidate list at query time.
+        max_segments (int): Number of segments beyond which similarly sized ones are merged.
+        quantization (Optional[str]): ``scalar``, ``binary`` or None.
+        oversampling (float): Candidates rescored per result with quantization.
+        search_dimensions (Optional[int]): Prefix length of the first pass.
+        prefix_oversampling (float): Candidates rescored per result after it.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        index_type: str = INDEX_AUTO,
+        hnsw_threshold: int = 50_000,
+        ef_search: int = 64,
+        max_segments: int = 16,
+        quantization: Optional[str] = None,
+        oversampling: float = 4.0,
+        search_dimensions: Optional[int] = None,
+        prefix_oversampling: float = 4.0,
+    ) -> None:
+        if index_type not in (INDEX_FLAT, INDEX_HNSW, INDEX_AUTO):
+            raise ValueError(f"Unknown index_type: {index_type}")
+        if quantization not in (
+            None,
+            Settings.QUANTIZATION_SCALAR,
+            Settings.QUANTIZATION_BINARY,
+        ):
+            raise ValueError(f"Unknown quantization: {quantization}")
+        if quantization and index_type == INDEX_HNSW:
+            raise ValueError("Quantization applies to the flat index, not to HNSW")
+        if quantization and search_dimensions:
+            raise ValueError("quantization and search_dimensions cannot be combined")
+        if index_type == INDEX_HNSW:
+            self._import_hnswlib()
+        self.directory = directory
+        self.index_type = index_type
+        self.hnsw_threshold = hnsw_threshold
+        self.ef_search = ef_search
+        self.max_segments = max_segments
+        self.quantization = quantization
+        self.oversampling = oversampling
+        self.search_dimensions = search_dimensions
+        self.prefix_oversampling = prefix_oversampling
+        self.dim: Optional[int] = None
+        self.segments: List[_Segment] = []
+        self._next_segment = 0
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._hnsw: Any = None
+        self._hnsw_count = 0
+        self._manifest_stamp: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+        self.refresh()
+
+    @staticmethod
+    def _import_hnswlib() -> Any:
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImportError(
+                "hnswlib is required for the HNSW index of LocalVS. "
+                "Install it with: pip install raglight[hnsw]"
+            )
+        return hnswlib
+
+    @property
+    def count(self) -> int:
+        return int(self._offsets[-1])
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILE
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Serializes writers, across threads and, with ``fcntl``, across processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / LOCK_FILE, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self) -> None:
+        """Reloads the manifest if it changed since it was last read."""
+        for attempt in range(3):
+            try:
+                self._reload()
+                return
+            except FileNotFoundError:
+                # A concurrent compaction removed segments of the manifest just read;
+                # the manifest replacing it lists the merged segment instead.
+                if attempt == 2:
+                    raise
+
+    def _reload(self) -> None:
+        try:
+            stat = os.stat(self._manifest_path)
+        except FileNotFoundError:
+            return
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._manifest_stamp:
+            return
+        with self._lock:
+            manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+            loaded = {segment.name: segment for segment in self.segments}
+            segments = [
+                loaded.get(name) or _Segment(self.directory, name)
+                for name in manifest["segments"]
+            ]
+            self.dim = manifest["dim"]
+            self._next_segment = manifest["next_segment"]
+            self.segments = segments
+            self._update_offsets()
+            self._hnsw = None
+            self._hnsw_count = 0
+            hnsw_count = manifest.get("hnsw_count", 0)
+            hnsw_path = self.directory / HNSW_FILE
+            if hnsw_count and hnsw_path.exists() and self._use_hnsw():
+                hnswlib = self._import_hnswlib()
+                hnsw = hnswlib.Index(space="ip", dim=self.dim)
+                hnsw.load_index(
+                    str(hnsw_path), max_elements=max(self.count, hnsw_count)
+                )
+                # The graph may already be the one of a newer manifest; it is picked
+                # up with that manifest.
+                if hnsw.get_current_count() == hnsw_count:
+                    self._hnsw, self._hnsw_count = hnsw, hnsw_count
+            self._manifest_stamp = stamp
+
+    def _update_offsets(self) -> None:
+        self._offsets = np.concatenate(
+            [[0], np.cumsum([len(s) for s in self.segments], dtype=np.int64)]
+        )
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "dim": self.dim,
+            "segments": [segment.name for segment in self.segments],
+            "next_segment": self._next_segment,
+            "hnsw_count": self._hnsw_count if self._hnsw is not None else 0,
+        }
+        _write_atomic(
+            self._manifest_path, lambda f: f.write(json.dumps(manifest).encode())
+        )
+        stat = os.stat(self._manifest_path)
+        self._manifest_stamp = (stat.st_ino, stat.st_mtime_ns)
+
+    def _new_segment_name(self) -> str:
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def add(
+        self,
+        vectors: np.ndarray,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[str]:
+        """
+        Appends documents as a new segment.
+
+        Args:
+            vectors (np.ndarray): Normalized float32 vectors, one row per document.
+            texts (List[str]): The document texts.
+            metadatas (List[Dict[str, Any]]): The flat metadata of each document.
+
+        Returns:
+            List[str]: The ids assigned to the documents.
+
+        Raises:
+            ValueError: If the vectors do not have the collection's dimension.
+        """
+        with self._write_lock():
+            self.refresh()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self.directory.mkdir(parents=True, exist_ok=True)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Vectors of dimension {vectors.shape[1]} cannot be added to "
+                    f"'{self.directory.name}', which holds dimension {self.dim}"
+                )
+            ids = [uuid.uuid4().hex for _ in texts]
+            name = self._new_segment_name()
+            _Segment.write(self.directory, name, vectors, ids, texts, metadatas)
+            self.segments.append(_Segment(self.directory, name))
+            obsolete = self._compact()
+            if self.quantization:
+                # Readers never write: the writer saves the codes of new segments.
+                for segment in self.segments:
+                    segment.codes(self.quantization)
+            self._update_offsets()
+            self._sync_hnsw()
+            self._write_manifest()
+            for old in obsolete:
+                for path in self.directory.glob(f"{old}.*"):
+                    path.unlink(missing_ok=True)
+            return ids
+
+    def _compact(self) -> List[str]:
+        """
+        Merges runs of adjacent segments, keeping the row order so that HNSW labels
+        stay valid. Returns the names of the merged segments.
+
+        Segments fall into tiers of sizes growing by ``MERGE_FACTOR``. Whenever
+        ``MERGE_FACTOR`` adjacent segments share a tier they are merged, smallest tier
+        first, and a large merged segment is left alone until enough segments of its
+        size exist: each row is rewritten about once per tier it climbs. Beyond
+        ``max_segments``, runs of two similarly sized segments are merged too, then
+        the two adjacent segments holding the fewest rows.
+        """
+        obsolete: List[str] = []
+        while True:
+            run = self._tier_run(MERGE_FACTOR)
+            if run is None:
+                if len(self.segments) <= max(1, self.max_segments):
+                    return obsolete
+                run = self._tier_run(2) or self._smallest_pair()
+            start, end = run
+            merged = self.segments[start:end]
+            name = self._new_segment_name()
+            _Segment.write(
+                self.directory,
+                name,
+                np.concatenate([s.vectors for s in merged]),
+                [i for s in merged for i in s.ids],
+                [t for s in merged for t in s.texts],
+                [m for s in merged for m in s.metadata_rows()],
+            )
+            self.segments[start:end] = [_Segment(self.directory, name)]
+            obsolete.extend(s.name for s in merged)
+
+    def _tier_run(self, min_length: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns the newest run of at least ``min_length`` adjacent segments of the
+        lowest tier that has one, as ``self.segments[start:end]`` bounds.
+        """
+        tiers = [_tier(len(segment)) for segment in self.segments]
+        best: Optional[Tuple[int, int]] = None
+        start = 0
+        for end in range(1, len(tiers) + 1):
+            if end < len(tiers) and tiers[end] == tiers[start]:
+                continue
+            if end - start >= min_length and (
+                best is None or tiers[start] <= tiers[best[0]]
+            ):
+                best = (start, end)
+            start = end
+        return best
+
+    def _smallest_pair(self) -> Tuple[int, int]:
+        sizes = [len(segment) for segment in self.segments]
+        start = min(range(len(sizes) - 1), key=lambda i: (sizes[i] + sizes[i + 1], -i))
+        return start, start + 2
+
+    def _use_hnsw(self) -> bool:
+        if self.index_type == INDEX_HNSW:
+            return True
+        if (
+            self.index_type == INDEX_FLAT
+            or self.quantization
+            or self.count < self.hnsw_threshold
+        ):
+            return False
+        try:
+            self._import_hnswlib()
+        except ImportError:
+            return False
+        return True
+
+    def build_index(self) -> None:
+        """
+        Builds or extends the HNSW graph of the collection and saves it, e.g. after
+        opening an existing collection with ``index_type="hnsw"``. ``add`` keeps the
+        graph up to date on its own.
+        """
+        with self._write_lock():
+            self.refresh()
+            if self._sync_hnsw():
+                self._write_manifest()
+
+    def _sync_hnsw(self) -> bool:
+        """
+        Adds the rows not indexed yet to the HNSW graph, building it if needed, and
+        saves it. Only called with the write lock held. Returns whether it changed.
+        """
+        if self.dim is None or self.count == self._hnsw_count or not self._use_hnsw():
+            return False
+        if self._hnsw is None:
+            hnswlib = self._import_hnswlib()
+            self._hnsw = hnswlib.Index(space="ip", dim=self.dim)
+            self._hnsw.init_index(max_elements=max(2 * self.count, 1024))
+            self._hnsw_count = 0
+            logging.info(
+                f"Building the HNSW index of '{self.directory.name}' "
+                f"({self.count} vectors)..."
+            )
+        if self.count > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(2 * self.count)
+        for segment, start in zip(self.segments, self._offsets[:-1]):
+            end = start + len(segment)
+            if end <= self._hnsw_count:
+                continue
+            first = max(self._hnsw_count - start, 0)
+            self._hnsw.add_items(
+                np.asarray(segment.vectors[first:]),
+                np.arange(start + first, end),
+            )
+        self._hnsw_count = self.count
+        hnsw_path = self.directory / HNSW_FILE
+        tmp = _tmp_path(hnsw_path)
+        self._hnsw.save_index(str(tmp))
+        os.replace(tmp, hnsw_path)
+        return True
+
+    def search(
+        self, query: np.ndarray, k: int, filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Returns the ``k`` documents closest to a normalized query, with their cosine
+        similarity, best first.
+        """
+        self.refresh()
+        # Writers hold the lock for a whole append, so this is a consistent view.
+        with self._lock:
+            segments, offsets = self.segments, self._offsets
+            hnsw, hnsw_count = self._hnsw, self._hnsw_count
+        count = int(offsets[-1])
+        if not count or k <= 0:
+            return []
+        # A graph written with other settings may miss the newest rows.
+        if hnsw is not None and hnsw_count == count and not filter:
+            hnsw.set_ef(max(self.ef_search, k))
+            labels, distances = hnsw.knn_query(query, k=min(k, count))
+            results = []
+            for label, distance in zip(labels[0], distances[0]):
+                n = int(np.searchsorted(offsets, label, side="right")) - 1
+                document = segments[n].document(int(label - offsets[n]))
+                results.append((document, 1.0 - float(distance)))
+            return results
+        return self._flat_search(segments, query, k, filter)
+
+    def _flat_search(
+        self,
+        segments: List[_Segment],
+        query: np.ndarray,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+    ) -> List[Tuple[Document, float]]:
+        candidates: List[Tuple[float, int, int]] = []
+        for n, segment in enumerate(segments):
+            mask = segment.mask(filter)
+            if mask is not None and not mask.any():
+                continue
+            approximate = True
+            if self.quantization:
+                scores = segment.approximate_scores(query, self.quantization)
+                top = int(np.ceil(k * self.oversampling))
+            elif self.search_dimensions and self.search_dimensions < len(query):
+                scores = segment.prefix_scores(query, self.search_dimensions)
+                top = int(np.ceil(k * self.prefix_oversampling))
+            else:
+                scores = segment.vectors @ query
+                top = k
+                approximate = False
+            if mask is not None:
+                scores = np.where(mask, scores, -np.inf)
+            top = min(top, len(scores))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = np.sort(best[scores[best] > -np.inf])
+            if approximate:
+                # Rescore with the full-precision vectors, read only for these rows.
+                best_scores = segment.vectors[best] @ query
+            else:
+                best_scores = scores[best]
+            candidates.extend(
+                (float(score), n, int(i)) for score, i in zip(best_scores, best)
+            )
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        return [(segments[n].document(i), score) for score, n, i in candidates[:k]]
+
+    def texts(self) -> List[str]:
+        self.refresh()
+        return [text for segment in self.segments for text in segment.texts]
+
+
+class LocalVS(VectorStore):
+    """
+    Built-in vector store keeping its collections in memory-mapped NumPy files.
+
+    It has no dependency beyond NumPy (``hnswlib`` is optional) and no server: each
+    collection is a directory of ``.npy`` vector segments under ``persist_directory``.
+    Searches are exact on small collections and use an HNSW graph on large ones, see
+    ``LocalCollection``. Metadata filters match values exactly, as with Qdrant.
+    ``quantization`` (``"scalar"`` or ``"binary"``) keeps only compact codes in RAM
+    and rescores the best candidates with the float32 vectors on disk.
+    ``search_dimensions`` runs a first pass on a prefix of the vectors.
+
+    Supports search_type: "semantic" (default), "bm25", "hybrid".
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        embeddings_model: EmbeddingsModel,
+        persist_directory: str = None,
+        custom_processors: Optional[Dict[str, DocumentProcessor]] = None,
+        search_type: str = "semantic",
+        alpha: float = 0.5,
+        index_type: str = INDEX_AUTO,
+        hnsw_threshold: int = 50_000,
+        ef_search: int = 64,
+        max_segments: int = 16,
+        quantization: Optional[str] = None,
+        oversampling: float = 4.0,
+        search_dimensions: Optional[int] = None,
+        prefix_oversampling: float = 4.0,
+    ) -> None:
+        if not persist_directory:
+            raise ValueError("LocalVS requires a persist_directory.")
+        super().__init__(
+            persist_directory, embeddings_model, custom_processors, search_type, alpha
+        )
+        self.collection_name = collection_name
+        self._classes_collection_name = f"{collection_name}_classes"
+        self._collection_options = {
+            "index_type": index_type,
+            "hnsw_threshold": hnsw_threshold,
+            "ef_search": ef_search,
+            "max_segments": max_segments,
+            "quantization": quantization,
+            "oversampling": oversampling,
+            "search_dimensions": search_dimensions,
+            "prefix_oversampling": prefix_oversampling,
+        }
+        self._collections: Dict[str, LocalCollection] = {}
+        Path(persist_directory).mkdir(parents=True, exist_ok=True)
+        collection = self._collection(self.collection_name)
+
+        bm25_path = self._bm25_path()
+        if bm25_path and bm25_path.exists():
+            self._bm25.load(bm25_path)
+        elif search_type in ("bm25", "hybrid"):
+            texts = collection.texts()
+            if texts:
+                self._bm25.add_documents(texts)
+
+    def _collection(self, name: str) -> LocalCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = LocalCollection(
+                Path(self.persist_directory) / name, **self._collection_options
+            )
+            self._collections[name] = collection
+        return collection
+
+    def _add_to_collection(
+        self, collection_name: str, documents: List[Document]
+    ) -> None:
+        texts = [doc.page_content for doc in documents]
+        vectors = _normalize(
+            np.asarray(self.embeddings_model.embed_documents(texts), dtype=np.float32)
+        )
+        metadatas = [
+            doc.metadata if isinstance(doc.metadata, dict) else {} for doc in documents
+        ]
+        self._collection(collection_name).add(vectors, texts, metadatas)
+
+    @override
+    def _semantic_search(
+        self,
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> List[Document]:
+        return [
+            doc
+            for doc, _ in self._semantic_search_with_scores(
+                question, k, filter, collection_name
+            )
+        ]
+
+    @override
+    def _semantic_search_with_scores(
+        self,
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> List[Tuple[Document, Optional[float]]]:
+        target = collection_name or self.collection_name
+        query = _normalize(np.asarray(self._embed_query(question), dtype=np.float32))
+        with STAGE_LATENCY.time(stage="vector_search"):
+            return self._collection(target).search(query, k, filter)
+
+    @override
+    def add_documents(self, documents: List[Document]) -> None:
+        documents = self._fit_documents(documents)
+        if not documents:
+            return
+        logging.info(
+            f"⏳ Adding {len(documents)} document chunks to local collection '{self.collection_name}'..."
+        )
+        self._add_to_collection(self.collection_name, documents)
+        self._update_bm25(documents)
+        self._mark_index_changed()
+        logging.info("✅ Documents successfully added.")
+
+    @override
+    def add_class_documents(self, documents: List[Document]) -> None:
+        documents = self._fit_documents(documents)
+        if not documents:
+            return
+        logging.info(
+            f"⏳ Adding {len(documents)} class documents to local collection '{self._classes_collection_name}'..."
+        )
+        self._add_to_collection(self._classes_collection_name, documents)
+        logging.info("✅ Class documents successfully added.")
+
+    @override
+    def similarity_search_class(
+        self,
+        question: str,
+        k: int = 5,
+        filter: Optional[Dict[str, str]] = None,
+        collection_name: Optional[str] = None,
+    ) -> List[Document]:
+        if collection_name:
+            target = f"{collection_name}_classes"
+        else:
+            target = self._classes_collection_name
+        return self._semantic_search(question, k, filter, target)
+
+    @override
+    def get_available_collections(self) -> List[str]:
+        root = Path(self.persist_directory)
+        return sorted(
+            path.name for path in root.iterdir() if (path / MANIFEST_FILE).exists()
+        )
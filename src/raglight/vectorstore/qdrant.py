@@ -1,14 +1,25 @@
 from __future__ import annotations
+import asyncio
 import logging
 import uuid
-from typing import List, Dict, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
 from typing_extensions import override
 
 from langchain_core.documents import Document
 
 from ..document_processing.document_processor import DocumentProcessor
-from .vector_store import VectorStore
+from .vector_store import BM25_REBUILD_PAGE_SIZE, VectorStore
 from ..embeddings.embeddings_model import EmbeddingsModel
+from ..config.settings import Settings
+from ..observability.metrics import STAGE_LATENCY
+from .bm25_index import sparse_document_vector, sparse_query_vector
+
+# Name of the sparse lexical vector of collections created with native hybrid search.
+SPARSE_VECTOR_NAME = "bm25"
+
+# Payload fields indexed by default, with their Qdrant schema type.
+DEFAULT_INDEXED_FIELDS = {"source": "keyword"}
 
 
 class QdrantVS(VectorStore):
@@ -17,6 +28,34 @@ class QdrantVS(VectorStore):
 
     Supports local (on-disk) and remote (HTTP) modes.
     Supports search_type: "semantic" (default), "bm25", "hybrid".
+
+    ``quantization`` (``"scalar"`` for int8, ``"binary"`` for 1 bit per dimension)
+    enables Qdrant's native quantization on new collections: the compact codes stay
+    in RAM and searches fetch ``oversampling`` times more candidates, rescored with
+    the original vectors. ``on_disk`` keeps the original vectors on disk only.
+
+    ``search_dimensions`` creates new collections with two named vectors, ``full``
+    and ``prefix`` (its first ``search_dimensions`` components, as produced by
+    Matryoshka embedding models). Searches then shortlist
+    ``k * prefix_oversampling`` points on the short vector and rank them with the
+    full one, in a single query.
+
+    ``native_hybrid`` moves the ``bm25`` and ``hybrid`` search types into Qdrant: the
+    main collection stores a sparse BM25 vector next to each dense one (Qdrant
+    applies the IDF weights), and hybrid searches run the dense and sparse queries as
+    prefetches fused with reciprocal rank fusion in one ``query_points`` call. The
+    in-process BM25 index and its JSON copy of the corpus are then not used.
+
+    Documents are written in batches of ``upsert_batch_size`` points. With a Qdrant
+    server, up to ``upsert_parallelism`` batches are uploaded concurrently while the
+    next one is embedded. Every batch is sent with ``wait=True``, so that once
+    ingestion returns, every document is searchable. ``prefer_grpc`` uses the gRPC
+    API on ``grpc_port`` instead of HTTP.
+
+    ``indexed_fields`` maps metadata fields to Qdrant payload schema types
+    (``keyword``, ``integer``, ``float``, ``bool``...). Their payload indexes are
+    created on every collection, so that filters on them do not scan the payloads.
+    Payload indexes only exist on a Qdrant server, not in the embedded mode.
     """
 
     def __init__(
@@ -29,10 +68,27 @@ class QdrantVS(VectorStore):
         port: int = 6333,
         search_type: str = "semantic",
         alpha: float = 0.5,
+        quantization: Optional[str] = None,
+        on_disk: bool = False,
+        oversampling: float = 2.0,
+        search_dimensions: Optional[int] = None,
+        prefix_oversampling: float = 4.0,
+        native_hybrid: bool = False,
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        upsert_batch_size: int = 256,
+        upsert_parallelism: int = 4,
+        indexed_fields: Optional[Dict[str, str]] = None,
     ) -> None:
+        if quantization not in (
+            None,
+            Settings.QUANTIZATION_SCALAR,
+            Settings.QUANTIZATION_BINARY,
+        ):
+            raise ValueError(f"Unknown quantization: {quantization}")
         try:
             from qdrant_client import QdrantClient
-            from qdrant_client.models import Distance, VectorParams
+            from qdrant_client.models import PayloadSchemaType
         except ImportError:
             raise ImportError(
                 "qdrant-client is required to use QdrantVS. "
@@ -46,8 +102,35 @@ class QdrantVS(VectorStore):
         self.collection_name = collection_name
         self._classes_collection_name = f"{collection_name}_classes"
 
+        self.quantization = quantization
+        self.on_disk = on_disk
+        self.oversampling = oversampling
+        self.search_dimensions = search_dimensions
+        self.prefix_oversampling = prefix_oversampling
+        # Size of the "prefix" vector of each known collection, None without one.
+        self._prefix_dims: Dict[str, Optional[int]] = {}
+        self.native_hybrid = native_hybrid
+        # Whether each known collection stores sparse BM25 vectors.
+        self._sparse: Dict[str, bool] = {}
+        self.host = host
+        self.port = port
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_parallelism = upsert_parallelism
+        self.indexed_fields_schema: Dict[str, str] = {
+            field: PayloadSchemaType(schema).value
+            for field, schema in (
+                DEFAULT_INDEXED_FIELDS if indexed_fields is None else indexed_fields
+            ).items()
+        }
+        # Payload fields indexed on each known collection.
+        self._payload_indexes: Dict[str, List[str]] = {}
+        self._async_client: Any = None
         if host:
-            self.client = QdrantClient(host=host, port=port)
+            self.client = QdrantClient(
+                host=host, port=port, grpc_port=grpc_port, prefer_grpc=prefer_grpc
+            )
         elif persist_directory:
             self.client = QdrantClient(path=persist_directory)
         else:
@@ -58,9 +141,23 @@ class QdrantVS(VectorStore):
         # Probe vector dimension using a dummy embedding
         sample = embeddings_model.embed_query("probe")
         self._vector_size = len(sample)
+        if search_dimensions is not None and not (
+            0 < search_dimensions < self._vector_size
+        ):
+            raise ValueError(
+                f"search_dimensions must be between 1 and {self._vector_size - 1}"
+            )
 
         self._ensure_collection(self.collection_name)
         self._ensure_collection(self._classes_collection_name)
+        if native_hybrid and not self._sparse[self.collection_name]:
+            logging.warning(
+                f"Qdrant collection '{collection_name}' was created without sparse "
+                "vectors: BM25 and hybrid searches use the in-process index."
+            )
+            self.native_hybrid = False
+        if self.native_hybrid:
+            return
 
         bm25_path = self._bm25_path()
         if bm25_path and bm25_path.exists():
@@ -69,43 +166,243 @@ class QdrantVS(VectorStore):
             self._rebuild_bm25_from_qdrant()
 
     def _rebuild_bm25_from_qdrant(self) -> None:
-        try:
-            records, _ = self.client.scroll(
-                collection_name=self.collection_name, limit=10_000, with_payload=True
+        def fetch_page(offset: Any) -> Tuple[List[str], Any]:
+            records, next_offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=BM25_REBUILD_PAGE_SIZE,
+                offset=offset,
+                with_payload=["page_content"],
+                with_vectors=False,
             )
             texts = [
                 r.payload.get("page_content", "")
                 for r in records
                 if r.payload and r.payload.get("page_content")
             ]
-            if texts:
-                self._bm25.add_documents(texts)
+            return texts, next_offset
+
+        try:
+            total = self.client.count(self.collection_name, exact=True).count
+            self._rebuild_bm25(fetch_page, total=total)
         except Exception as e:
             logging.warning(f"Could not rebuild BM25 from Qdrant: {e}")
 
+    def _quantization_config(self) -> Any:
+        from qdrant_client.models import (
+            BinaryQuantization,
+            BinaryQuantizationConfig,
+            ScalarQuantization,
+            ScalarQuantizationConfig,
+            ScalarType,
+        )
+
+        if self.quantization == Settings.QUANTIZATION_SCALAR:
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if self.quantization == Settings.QUANTIZATION_BINARY:
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def _search_params(self) -> Any:
+        from qdrant_client.models import QuantizationSearchParams, SearchParams
+
+        if not self.quantization:
+            return None
+        return SearchParams(
+            quantization=QuantizationSearchParams(
+                rescore=True, oversampling=self.oversampling
+            )
+        )
+
     def _ensure_collection(self, name: str) -> None:
-        from qdrant_client.models import Distance, VectorParams
+        from qdrant_client.models import (
+            Distance,
+            Modifier,
+            SparseVectorParams,
+            VectorParams,
+        )
 
         existing = [c.name for c in self.client.get_collections().collections]
         if name not in existing:
+            full = VectorParams(
+                size=self._vector_size, distance=Distance.COSINE, on_disk=self.on_disk
+            )
+            if self.search_dimensions:
+                vectors_config = {
+                    "full": full,
+                    "prefix": VectorParams(
+                        size=self.search_dimensions, distance=Distance.COSINE
+                    ),
+                }
+            else:
+                vectors_config = full
+            # Only the main collection is searched with BM25.
+            sparse = self.native_hybrid and name == self.collection_name
             self.client.create_collection(
                 collection_name=name,
-                vectors_config=VectorParams(
-                    size=self._vector_size, distance=Distance.COSINE
+                vectors_config=vectors_config,
+                sparse_vectors_config=(
+                    {SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)}
+                    if sparse
+                    else None
                 ),
+                quantization_config=self._quantization_config(),
             )
+            self._prefix_dims[name] = self.search_dimensions
+            self._sparse[name] = sparse
+        else:
+            self._detect_vectors(name)
+        self._ensure_payload_indexes(name)
 
-    def _add_to_collection(
-        self, collection_name: str, documents: List[Document]
-    ) -> None:
+    def _ensure_payload_indexes(self, name: str) -> None:
+        if not self.host:
+            self._payload_indexes[name] = []
+            return
+        existing = self.client.get_collection(name).payload_schema or {}
+        for field, schema in self.indexed_fields_schema.items():
+            if field not in existing:
+                logging.info(f"Creating Qdrant payload index on '{name}.{field}'")
+                self.client.create_payload_index(
+                    collection_name=name, field_name=field, field_schema=schema
+                )
+        self._payload_indexes[name] = sorted(
+            set(existing) | set(self.indexed_fields_schema)
+        )
+
+    @override
+    def indexed_fields(self, collection_name: Optional[str] = None) -> List[str]:
+        name = collection_name or self.collection_name
+        if name not in self._payload_indexes:
+            payload_schema = self.client.get_collection(name).payload_schema or {}
+            self._payload_indexes[name] = sorted(payload_schema)
+        return self._payload_indexes[name]
+
+    def _detect_vectors(self, name: str) -> None:
+        params = self.client.get_collection(name).config.params
+        vectors = params.vectors
+        self._sparse[name] = SPARSE_VECTOR_NAME in (params.sparse_vectors or {})
+        if isinstance(vectors, dict) and "prefix" in vectors:
+            self._prefix_dims[name] = vectors["prefix"].size
+            return
+        self._prefix_dims[name] = None
+        if self.search_dimensions:
+            logging.warning(
+                f"Qdrant collection '{name}' was created without a prefix vector: "
+                "it is searched with full vectors only."
+            )
+
+    def _prefix_dim(self, name: str) -> Optional[int]:
+        if name not in self._prefix_dims:
+            self._detect_vectors(name)
+        return self._prefix_dims[name]
+
+    def _point_vector(
+        self, collection_name: str, vector: List[float], text: str
+    ) -> Any:
+        from qdrant_client.models import SparseVector
+
+        dims = self._prefix_dim(collection_name)
+        vectors: Dict[str, Any] = (
+            {"": vector} if dims is None else {"full": vector, "prefix": vector[:dims]}
+        )
+        if self._sparse[collection_name]:
+            indices, values = sparse_document_vector(text)
+            vectors[SPARSE_VECTOR_NAME] = SparseVector(indices=indices, values=values)
+        return vector if list(vectors) == [""] else vectors
+
+    def _query_kwargs(
+        self,
+        collection_name: str,
+        query_vector: List[float],
+        k: int,
+        filter: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Arguments of ``query_points`` for a dense search: a single nearest-neighbour
+        query, or a prefix-vector prefetch reranked with the full vector.
+        """
+        from qdrant_client.models import Prefetch
+
+        query_filter = self._build_filter(filter)
+        kwargs: Dict[str, Any] = {
+            "collection_name": collection_name,
+            "query": query_vector,
+            "limit": k,
+            "query_filter": query_filter,
+            "search_params": self._search_params(),
+        }
+        dims = self._prefix_dim(collection_name)
+        if dims is not None:
+            kwargs["using"] = "full"
+            kwargs["prefetch"] = Prefetch(
+                query=query_vector[:dims],
+                using="prefix",
+                filter=query_filter,
+                limit=max(k, int(k * self.prefix_oversampling)),
+            )
+        return kwargs
+
+    def _hybrid_query_kwargs(
+        self,
+        question: str,
+        query_vector: Optional[List[float]],
+        k: int,
+        filter: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Arguments of ``query_points`` for a native BM25 search, or for a hybrid search
+        when ``query_vector`` is given: dense and sparse prefetches fused with RRF.
+        """
+        from qdrant_client.models import Fusion, FusionQuery, Prefetch, SparseVector
+
+        indices, values = sparse_query_vector(question)
+        sparse_query = SparseVector(indices=indices, values=values)
+        query_filter = self._build_filter(filter)
+        if query_vector is None:
+            return {
+                "collection_name": self.collection_name,
+                "query": sparse_query,
+                "using": SPARSE_VECTOR_NAME,
+                "limit": k,
+                "query_filter": query_filter,
+            }
+
+        fetch_k = k * 2
+        dense = self._query_kwargs(self.collection_name, query_vector, fetch_k, filter)
+        return {
+            "collection_name": self.collection_name,
+            "prefetch": [
+                Prefetch(
+                    query=dense["query"],
+                    using=dense.get("using"),
+                    prefetch=dense.get("prefetch"),
+                    filter=query_filter,
+                    params=dense["search_params"],
+                    limit=fetch_k,
+                ),
+                Prefetch(
+                    query=sparse_query,
+                    using=SPARSE_VECTOR_NAME,
+                    filter=query_filter,
+                    limit=fetch_k,
+                ),
+            ],
+            "query": FusionQuery(fusion=Fusion.RRF),
+            "limit": k,
+        }
+
+    def _to_points(self, collection_name: str, documents: List[Document]) -> List[Any]:
         from qdrant_client.models import PointStruct
 
         texts = [doc.page_content for doc in documents]
         vectors = self.embeddings_model.embed_documents(texts)
-        points = [
+        return [
             PointStruct(
                 id=str(uuid.uuid4()),
-                vector=vector,
+                vector=self._point_vector(collection_name, vector, text),
                 payload={
                     "page_content": text,
                     **(doc.metadata if isinstance(doc.metadata, dict) else {}),
@@ -113,7 +410,75 @@ class QdrantVS(VectorStore):
             )
             for text, vector, doc in zip(texts, vectors, documents)
         ]
-        self.client.upsert(collection_name=collection_name, points=points)
+
+    def _add_to_collection(
+        self, collection_name: str, documents: List[Document]
+    ) -> None:
+        """
+        Embeds and upserts documents batch by batch.
+
+        With a Qdrant server, each batch is uploaded on a worker thread while the
+        next one is embedded, with at most ``upsert_parallelism`` uploads in flight.
+        Every upload waits for Qdrant to apply it (``wait=True``): updates are only
+        ordered within a shard, so a final waiting upload would not cover batches
+        routed to other shards or replicas.
+        """
+        size = max(1, self.upsert_batch_size)
+        batches = [documents[i : i + size] for i in range(0, len(documents), size)]
+        if not self.host or self.upsert_parallelism <= 1 or len(batches) == 1:
+            # The embedded (on-disk) mode is not safe for concurrent writes.
+            for batch in batches:
+                self.client.upsert(
+                    collection_name=collection_name,
+                    points=self._to_points(collection_name, batch),
+                )
+            return
+
+        with ThreadPoolExecutor(max_workers=self.upsert_parallelism) as executor:
+            in_flight: List[Future] = []
+            try:
+                for batch in batches:
+                    points = self._to_points(collection_name, batch)
+                    if len(in_flight) >= self.upsert_parallelism:
+                        in_flight.pop(0).result()
+                    in_flight.append(
+                        executor.submit(
+                            self.client.upsert,
+                            collection_name=collection_name,
+                            points=points,
+                            wait=True,
+                        )
+                    )
+                for future in in_flight:
+                    future.result()
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+    @staticmethod
+    def _build_filter(filter: Optional[Dict[str, Any]]) -> Any:
+        from qdrant_client.models import Filter, FieldCondition, MatchValue
+
+        if not filter:
+            return None
+        return Filter(
+            must=[
+                FieldCondition(key=key, match=MatchValue(value=value))
+                for key, value in filter.items()
+            ]
+        )
+
+    @staticmethod
+    def _to_documents(points: List[Any]) -> List[Document]:
+        docs = []
+        for hit in points:
+            payload = hit.payload or {}
+            page_content = payload.pop("page_content", "")
+            docs.append(
+                Document(id=str(hit.id), page_content=page_content, metadata=payload)
+            )
+        return docs
 
     @override
     def _semantic_search(
@@ -123,47 +488,121 @@ class QdrantVS(VectorStore):
         filter: Optional[Dict[str, Any]],
         collection_name: Optional[str] = None,
     ) -> List[Document]:
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
+        return [
+            doc
+            for doc, _ in self._semantic_search_with_scores(
+                question, k, filter, collection_name
+            )
+        ]
 
+    @override
+    def _semantic_search_with_scores(
+        self,
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> List[Tuple[Document, Optional[float]]]:
         target = collection_name or self.collection_name
-        query_vector = self.embeddings_model.embed_query(question)
+        query_vector = self._embed_query(question)
+
+        with STAGE_LATENCY.time(stage="vector_search"):
+            results = self.client.query_points(
+                **self._query_kwargs(target, query_vector, k, filter)
+            ).points
+        return list(zip(self._to_documents(results), (hit.score for hit in results)))
+
+    @override
+    def _bm25_search_with_scores(
+        self, question: str, k: int
+    ) -> List[Tuple[Document, float]]:
+        if not self.native_hybrid:
+            return super()._bm25_search_with_scores(question, k)
+        with STAGE_LATENCY.time(stage="bm25_search"):
+            results = self.client.query_points(
+                **self._hybrid_query_kwargs(question, None, k, None)
+            ).points
+        return list(zip(self._to_documents(results), (hit.score for hit in results)))
+
+    @override
+    def _hybrid_search_with_scores(
+        self, question: str, k: int, filter: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Document, float]]:
+        if not self.native_hybrid:
+            return super()._hybrid_search_with_scores(question, k, filter)
+        query_vector = self._embed_query(question)
+        with STAGE_LATENCY.time(stage="vector_search"):
+            results = self.client.query_points(
+                **self._hybrid_query_kwargs(question, query_vector, k, filter)
+            ).points
+        return list(zip(self._to_documents(results), (hit.score for hit in results)))
+
+    @override
+    async def _ahybrid_search(
+        self, question: str, k: int, filter: Optional[Dict[str, Any]]
+    ) -> List[Document]:
+        if not self.native_hybrid:
+            return await super()._ahybrid_search(question, k, filter)
+        # The embedded (on-disk) mode cannot be opened by a second client.
+        if not self.host:
+            return await asyncio.to_thread(self._hybrid_search, question, k, filter)
 
-        qdrant_filter = None
-        if filter:
-            qdrant_filter = Filter(
-                must=[
-                    FieldCondition(key=key, match=MatchValue(value=value))
-                    for key, value in filter.items()
-                ]
+        query_vector = await self._aembed_query(question)
+        with STAGE_LATENCY.time(stage="vector_search"):
+            response = await self._get_async_client().query_points(
+                **self._hybrid_query_kwargs(question, query_vector, k, filter)
             )
+        return self._to_documents(response.points)
 
-        results = self.client.query_points(
-            collection_name=target,
-            query=query_vector,
-            limit=k,
-            query_filter=qdrant_filter,
-        ).points
+    def _get_async_client(self) -> Any:
+        if self._async_client is None:
+            from qdrant_client import AsyncQdrantClient
 
-        docs = []
-        for hit in results:
-            payload = hit.payload or {}
-            page_content = payload.pop("page_content", "")
-            docs.append(Document(page_content=page_content, metadata=payload))
-        return docs
+            self._async_client = AsyncQdrantClient(
+                host=self.host,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+            )
+        return self._async_client
+
+    @override
+    async def _asemantic_search(
+        self,
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> List[Document]:
+        # The embedded (on-disk) mode cannot be opened by a second client.
+        if not self.host:
+            return await super()._asemantic_search(question, k, filter, collection_name)
+
+        target = collection_name or self.collection_name
+        query_vector = await self._aembed_query(question)
+        with STAGE_LATENCY.time(stage="vector_search"):
+            response = await self._get_async_client().query_points(
+                **self._query_kwargs(target, query_vector, k, filter)
+            )
+        return self._to_documents(response.points)
 
     @override
     def add_documents(self, documents: List[Document]) -> None:
+        documents = self._fit_documents(documents)
         if not documents:
             return
         logging.info(
             f"⏳ Adding {len(documents)} document chunks to Qdrant collection '{self.collection_name}'..."
         )
         self._add_to_collection(self.collection_name, documents)
-        self._update_bm25(documents)
+        if not self.native_hybrid:
+            self._update_bm25(documents)
+        self._mark_index_changed()
         logging.info("✅ Documents successfully added.")
 
     @override
     def add_class_documents(self, documents: List[Document]) -> None:
+        documents = self._fit_documents(documents)
         if not documents:
             return
         logging.info(
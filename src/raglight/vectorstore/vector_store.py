@@ -1,18 +1,41 @@
+import asyncio
+import json
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple
 import os
 import logging
 from langchain_core.documents import Document
 import copy
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..document_processing.document_processor import DocumentProcessor
+from ..observability.metrics import (
+    INGESTED_CHUNKS,
+    INGESTED_FILES,
+    REGISTRY,
+    STAGE_LATENCY,
+    timed,
+)
 from ..document_processing.document_processor_factory import DocumentProcessorFactory
 from ..embeddings.embeddings_model import EmbeddingsModel
+from ..embeddings.query_embedding_cache import QueryEmbeddingCache
 from ..config.settings import Settings
 from .bm25_index import BM25Index
 
+# Documents read per request when the BM25 index is rebuilt from the backend.
+BM25_REBUILD_PAGE_SIZE = 1000
+
+# Query embeddings kept by each vector store.
+QUERY_EMBEDDING_CACHE_SIZE = 256
+
+FILTER_CONDITIONS = REGISTRY.counter(
+    "raglight_filter_conditions_total",
+    "Metadata filter conditions of searches, by whether an index serves them.",
+    ["indexed"],
+)
+
 
 class VectorStore(ABC):
     """
@@ -38,6 +61,14 @@ class VectorStore(ABC):
         self.search_type = search_type
         self.alpha = alpha
         self._bm25 = BM25Index()
+        # Incremented whenever the main collection changes, so caches built on
+        # search results can tell whether they are still valid.
+        self.index_generation: int = 0
+        # Serializes ingestions so that concurrent requests do not interleave writes.
+        self.ingest_lock = threading.RLock()
+        self.query_embedding_cache = QueryEmbeddingCache(QUERY_EMBEDDING_CACHE_SIZE)
+        # Filtered fields already reported as not indexed.
+        self._unindexed_reported: Set[str] = set()
 
     # ------------------------------------------------------------------
     # BM25 / hybrid helpers (shared across all backends)
@@ -49,6 +80,165 @@ class VectorStore(ABC):
             return None
         return Path(self.persist_directory) / f"bm25_{collection_name}.json"
 
+    def _bm25_checkpoint_path(self) -> Optional[Path]:
+        bm25_path = self._bm25_path()
+        if not bm25_path or not bm25_path.parent.is_dir():
+            return None
+        return bm25_path.with_suffix(".partial.jsonl")
+
+    def _load_bm25_checkpoint(
+        self, checkpoint: Path, total: Optional[int]
+    ) -> Tuple[Any, bool]:
+        """
+        Reloads the pages of an interrupted rebuild into the BM25 index.
+
+        The checkpoint starts with the document count of the collection when the
+        rebuild began. Cursors (offsets for Chroma) are only valid for that state of
+        the collection, so a checkpoint written for another count is discarded.
+
+        Returns:
+            Tuple[Any, bool]: The cursor of the next page, and whether the last page
+                was already read.
+        """
+        cursor, finished = None, False
+        valid_bytes = 0
+        with open(checkpoint, "rb") as f:
+            for number, line in enumerate(f):
+                try:
+                    record = json.loads(line) if line.endswith(b"\n") else None
+                except json.JSONDecodeError:
+                    record = None
+                if record is None:
+                    # Last line cut short by the interruption: drop it.
+                    break
+                if number == 0:
+                    if "total" not in record or record["total"] != total:
+                        break
+                else:
+                    self._bm25.extend(record["texts"])
+                    cursor, finished = record["cursor"], record["cursor"] is None
+                valid_bytes += len(line)
+        if valid_bytes == 0:
+            logging.info(
+                "The collection changed since the BM25 rebuild was interrupted: "
+                "starting over."
+            )
+            checkpoint.unlink()
+            return None, False
+        os.truncate(checkpoint, valid_bytes)
+        logging.info(
+            f"⏳ Resuming BM25 rebuild after {len(self._bm25.corpus)} documents..."
+        )
+        return cursor, finished
+
+    def _rebuild_bm25(
+        self,
+        fetch_page: Callable[[Any], Tuple[List[str], Any]],
+        total: Optional[int] = None,
+    ) -> None:
+        """
+        Rebuilds the BM25 index by paging through the backend.
+
+        Each page read is appended to a checkpoint file next to the BM25 index, so that
+        a rebuild interrupted by a restart resumes after the last page it read, as long
+        as the collection still holds ``total`` documents. The checkpoint is removed
+        once the index is saved.
+
+        Paging bounds the size of each backend request, not the memory of the
+        rebuild: the in-process BM25 index holds the whole corpus, as it does once
+        loaded. Use Qdrant's ``native_hybrid`` when the corpus should not live in
+        the application's memory.
+
+        Args:
+            fetch_page (Callable[[Any], Tuple[List[str], Any]]): Returns the texts of
+                the page starting at a cursor (``None`` for the first page) and the
+                cursor of the next page, ``None`` after the last one.
+            total (Optional[int]): Number of documents, used to report progress and to
+                tell whether a checkpoint still matches the collection.
+        """
+        checkpoint = self._bm25_checkpoint_path()
+        cursor, finished = None, False
+        if checkpoint and checkpoint.exists():
+            cursor, finished = self._load_bm25_checkpoint(checkpoint, total)
+
+        journal = None
+        if checkpoint:
+            new = not checkpoint.exists()
+            journal = open(checkpoint, "a", encoding="utf-8")
+            if new:
+                journal.write(json.dumps({"total": total}) + "\n")
+                journal.flush()
+        try:
+            while not finished:
+                texts, cursor = fetch_page(cursor)
+                finished = cursor is None
+                self._bm25.extend(texts)
+                if journal:
+                    journal.write(
+                        json.dumps(
+                            {"cursor": cursor, "texts": texts}, ensure_ascii=False
+                        )
+                        + "\n"
+                    )
+                    journal.flush()
+                logging.info(
+                    f"⏳ BM25 rebuild: {len(self._bm25.corpus)}"
+                    + (f"/{total}" if total is not None else "")
+                    + " documents read"
+                )
+        except Exception:
+            # The checkpoint keeps the pages read; do not serve a partial index.
+            self._bm25 = BM25Index()
+            raise
+        finally:
+            if journal:
+                journal.close()
+
+        self._bm25.rebuild()
+        bm25_path = self._bm25_path()
+        if bm25_path and self._bm25.corpus:
+            self._bm25.save(bm25_path)
+        if checkpoint:
+            checkpoint.unlink(missing_ok=True)
+
+    def _embed_query(self, question: str) -> List[float]:
+        """
+        Embeds a search query, reusing the embedding of a recent identical query.
+        """
+        vector = self.query_embedding_cache.get(question)
+        if vector is None:
+            vector = self.embeddings_model.embed_query(question)
+            self.query_embedding_cache.put(question, vector)
+        return vector
+
+    def embed_queries(self, questions: List[str]) -> None:
+        """
+        Embeds several search queries with a single model call and caches them, so
+        that the searches that follow do not embed them one by one.
+        """
+        missing = list(
+            dict.fromkeys(
+                q for q in questions if self.query_embedding_cache.get(q) is None
+            )
+        )
+        if missing:
+            vectors = self.embeddings_model.embed_queries(missing)
+            for question, vector in zip(missing, vectors):
+                self.query_embedding_cache.put(question, vector)
+
+    async def _aembed_query(self, question: str) -> List[float]:
+        """
+        Async counterpart of ``_embed_query``, sharing the same cache.
+        """
+        vector = self.query_embedding_cache.get(question)
+        if vector is None:
+            vector = await self.embeddings_model.aembed_query(question)
+            self.query_embedding_cache.put(question, vector)
+        return vector
+
+    def _mark_index_changed(self) -> None:
+        self.index_generation += 1
+
     def _update_bm25(self, documents: List[Document]) -> None:
         texts = [doc.page_content for doc in documents]
         self._bm25.add_documents(texts)
@@ -56,17 +246,25 @@ class VectorStore(ABC):
         if bm25_path:
             self._bm25.save(bm25_path)
 
-    def _bm25_search(self, question: str, k: int) -> List[Document]:
+    @timed("bm25_search")
+    def _bm25_search_with_scores(
+        self, question: str, k: int
+    ) -> List[Tuple[Document, float]]:
         results = self._bm25.search(question, k)
-        docs = []
-        for idx, _score in results:
+        scored = []
+        for idx, score in results:
             if idx < len(self._bm25.corpus):
-                docs.append(Document(page_content=self._bm25.corpus[idx]))
-        return docs
+                scored.append(
+                    (Document(page_content=self._bm25.corpus[idx]), float(score))
+                )
+        return scored
 
-    def _rrf(
+    def _bm25_search(self, question: str, k: int) -> List[Document]:
+        return [doc for doc, _ in self._bm25_search_with_scores(question, k)]
+
+    def _rrf_with_scores(
         self, ranked_lists: List[List[Document]], k_rrf: int = 60
-    ) -> List[Document]:
+    ) -> List[Tuple[Document, float]]:
         scores: Dict[str, float] = {}
         doc_map: Dict[str, Document] = {}
         for ranked in ranked_lists:
@@ -75,14 +273,34 @@ class VectorStore(ABC):
                 scores[key] = scores.get(key, 0) + 1 / (k_rrf + rank + 1)
                 doc_map[key] = doc
         sorted_keys = sorted(scores, key=scores.__getitem__, reverse=True)
-        return [doc_map[k] for k in sorted_keys]
+        return [(doc_map[k], scores[k]) for k in sorted_keys]
 
-    def _hybrid_search(
-        self, question: str, k: int, filter: Optional[Dict[str, Any]]
+    def _rrf(
+        self, ranked_lists: List[List[Document]], k_rrf: int = 60
     ) -> List[Document]:
+        return [doc for doc, _ in self._rrf_with_scores(ranked_lists, k_rrf)]
+
+    def _hybrid_search_with_scores(
+        self, question: str, k: int, filter: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Document, float]]:
         fetch_k = k * 2
         semantic_docs = self._semantic_search(question, fetch_k, filter)
         bm25_docs = self._bm25_search(question, fetch_k)
+        return self._rrf_with_scores([semantic_docs, bm25_docs])[:k]
+
+    def _hybrid_search(
+        self, question: str, k: int, filter: Optional[Dict[str, Any]]
+    ) -> List[Document]:
+        return [doc for doc, _ in self._hybrid_search_with_scores(question, k, filter)]
+
+    async def _ahybrid_search(
+        self, question: str, k: int, filter: Optional[Dict[str, Any]]
+    ) -> List[Document]:
+        fetch_k = k * 2
+        semantic_docs, bm25_docs = await asyncio.gather(
+            self._asemantic_search(question, fetch_k, filter),
+            asyncio.to_thread(self._bm25_search, question, fetch_k),
+        )
         return self._rrf([semantic_docs, bm25_docs])[:k]
 
     # ------------------------------------------------------------------
@@ -100,6 +318,37 @@ class VectorStore(ABC):
         """Backend-specific dense vector search."""
         pass
 
+    def _semantic_search_with_scores(
+        self,
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> List[Tuple[Document, Optional[float]]]:
+        """
+        Dense vector search returning a relevance score (higher is better) with each
+        document. Backends that cannot report scores return None.
+        """
+        return [
+            (doc, None)
+            for doc in self._semantic_search(question, k, filter, collection_name)
+        ]
+
+    async def _asemantic_search(
+        self,
+        question: str,
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> List[Document]:
+        """
+        Async dense vector search. Backends without an async client run
+        ``_semantic_search`` in a worker thread.
+        """
+        return await asyncio.to_thread(
+            self._semantic_search, question, k, filter, collection_name
+        )
+
     @abstractmethod
     def add_documents(self, documents: List[Document]) -> None:
         pass
@@ -118,6 +367,45 @@ class VectorStore(ABC):
     def get_available_collections(self) -> List[str]:
         pass
 
+    # ------------------------------------------------------------------
+    # Metadata filter indexes
+    # ------------------------------------------------------------------
+
+    def indexed_fields(self, collection_name: Optional[str] = None) -> List[str]:
+        """
+        Metadata fields of a collection (the default one if not given) whose filters
+        are served by an index rather than by scanning every document.
+        """
+        return []
+
+    def filter_coverage(
+        self,
+        filter: Optional[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> Dict[str, bool]:
+        """
+        Tells, for each field of a metadata filter, whether an index serves it.
+
+        Returns:
+            Dict[str, bool]: ``True`` for the indexed fields of the filter.
+        """
+        indexed = set(self.indexed_fields(collection_name))
+        return {field: field in indexed for field in filter or {}}
+
+    def _record_filter_coverage(
+        self, filter: Optional[Dict[str, Any]], collection_name: Optional[str]
+    ) -> None:
+        if not filter:
+            return
+        for field, indexed in self.filter_coverage(filter, collection_name).items():
+            FILTER_CONDITIONS.inc(indexed=str(indexed).lower())
+            if not indexed and field not in self._unindexed_reported:
+                self._unindexed_reported.add(field)
+                logging.warning(
+                    f"Filters on metadata field '{field}' are not served by an "
+                    "index: they scan the whole collection."
+                )
+
     # ------------------------------------------------------------------
     # Shared similarity_search with search_type routing
     # ------------------------------------------------------------------
@@ -131,15 +419,77 @@ class VectorStore(ABC):
     ) -> List[Document]:
         if self.search_type == "bm25":
             return self._bm25_search(question, k)
-        elif self.search_type == "hybrid":
+        self._record_filter_coverage(filter, collection_name)
+        if self.search_type == "hybrid":
             return self._hybrid_search(question, k, filter)
         return self._semantic_search(question, k, filter, collection_name)
 
+    def similarity_search_with_scores(
+        self,
+        question: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        collection_name: Optional[str] = None,
+        search_type: Optional[str] = None,
+    ) -> List[Tuple[Document, Optional[float]]]:
+        """
+        Like ``similarity_search``, with the score of each document.
+
+        Scores depend on the search type: backend relevance for ``semantic``, BM25
+        score for ``bm25`` and reciprocal rank fusion score for ``hybrid``. Higher is
+        always better.
+
+        Args:
+            question (str): The query.
+            k (int): Number of documents to return.
+            filter (Optional[Dict[str, Any]]): Metadata filter.
+            collection_name (Optional[str]): Collection to search instead of the default.
+            search_type (Optional[str]): Overrides the store's ``search_type``.
+
+        Returns:
+            List[Tuple[Document, Optional[float]]]: Documents with their scores, best first.
+        """
+        search_type = search_type or self.search_type
+        if search_type not in ("semantic", "bm25", "hybrid"):
+            raise ValueError(f"Unknown search_type: {search_type}")
+        if search_type != "semantic" and collection_name not in (
+            None,
+            getattr(self, "collection_name", None),
+        ):
+            # The BM25 index only covers the store's own collection.
+            raise ValueError(
+                f"search_type '{search_type}' is only available on the default collection"
+            )
+        if search_type == "bm25":
+            return self._bm25_search_with_scores(question, k)
+        self._record_filter_coverage(filter, collection_name)
+        if search_type == "hybrid":
+            return self._hybrid_search_with_scores(question, k, filter)
+        return self._semantic_search_with_scores(question, k, filter, collection_name)
+
+    async def asimilarity_search(
+        self,
+        question: str,
+        k: int = 5,
+        filter: Optional[Dict[str, str]] = None,
+        collection_name: Optional[str] = None,
+    ) -> List[Document]:
+        """
+        Async counterpart of ``similarity_search``, with the same search_type routing.
+        """
+        if self.search_type == "bm25":
+            return await asyncio.to_thread(self._bm25_search, question, k)
+        self._record_filter_coverage(filter, collection_name)
+        if self.search_type == "hybrid":
+            return await self._ahybrid_search(question, k, filter)
+        return await self._asemantic_search(question, k, filter, collection_name)
+
     # ------------------------------------------------------------------
     # Ingestion pipeline (shared)
     # ------------------------------------------------------------------
 
     @staticmethod
+    @timed("ingest_process_file")
     def _process_file(
         file_path: str, factory: DocumentProcessorFactory, flatten_metadata
     ):
@@ -157,18 +507,23 @@ class VectorStore(ABC):
             logging.warning(f"⚠️ Error processing {file_path}: {e}")
             return [], []
 
-    def ingest(self, data_path: str, ignore_folders: List[str] = None) -> None:
-        if not os.path.isdir(data_path):
-            logging.error(f"Provided data_path '{data_path}' is not a valid directory.")
-            return
+    def collect_files(
+        self, data_path: str, ignore_folders: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Lists the files under ``data_path`` that a document processor can ingest.
+
+        Args:
+            data_path (str): The directory to walk.
+            ignore_folders (Optional[List[str]]): Folder names to skip.
 
+        Returns:
+            List[str]: The paths of the ingestible files.
+        """
         if ignore_folders is None:
             ignore_folders = Settings.DEFAULT_IGNORE_FOLDERS
 
         factory = DocumentProcessorFactory(custom_processors=self.custom_processors)
-
-        logging.info(f"⏳ Starting ingestion from '{data_path}'...")
-
         files_to_process = []
         for root, dirs, files in os.walk(data_path, topdown=True):
             dirs[:] = [
@@ -183,28 +538,102 @@ class VectorStore(ABC):
                     logging.info(
                         f"  -> Queuing '{file_path}' with {processor.__class__.__name__}"
                     )
-                    files_to_process.append((file_path, processor))
+                    files_to_process.append(file_path)
+        return files_to_process
 
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [
+    def ingest_files(
+        self,
+        file_paths: List[str],
+        on_file_done: Optional[Callable[[str, int, Optional[str]], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Processes and stores a list of files, four at a time.
+
+        Args:
+            file_paths (List[str]): The files to ingest.
+            on_file_done (Optional[Callable[[str, int, Optional[str]], None]]): Called
+                after each file with its path, the number of chunks stored and an error
+                message (None on success).
+            should_stop (Optional[Callable[[], bool]]): Polled between files; when it
+                returns True, files not started yet are skipped.
+        """
+        factory = DocumentProcessorFactory(custom_processors=self.custom_processors)
+
+        with self.ingest_lock, ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
                 executor.submit(
                     self._process_file, file_path, factory, self._flatten_metadata
-                )
-                for file_path, _ in files_to_process
-            ]
+                ): file_path
+                for file_path in file_paths
+            }
 
             for future in as_completed(futures):
+                if should_stop and should_stop():
+                    logging.info("Ingestion stopped before completion.")
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    return
+                n_chunks, error = 0, None
                 try:
                     chunks, classes = future.result()
-                    if chunks:
-                        self.add_documents(chunks)
-                    if classes:
-                        self.add_class_documents(classes)
+                    with STAGE_LATENCY.time(stage="ingest_store"):
+                        if chunks:
+                            self.add_documents(chunks)
+                            n_chunks = len(chunks)
+                        if classes:
+                            self.add_class_documents(classes)
                 except Exception as e:
                     logging.warning(f"⚠️ Future raised an exception: {e}")
+                    error = str(e)
+                INGESTED_FILES.inc(status="error" if error else "ok")
+                INGESTED_CHUNKS.inc(n_chunks)
+                if on_file_done:
+                    on_file_done(futures[future], n_chunks, error)
+
+    def ingest(
+        self,
+        data_path: str,
+        ignore_folders: List[str] = None,
+        on_file_done: Optional[Callable[[str, int, Optional[str]], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        if not os.path.isdir(data_path):
+            logging.error(f"Provided data_path '{data_path}' is not a valid directory.")
+            return
 
+        logging.info(f"⏳ Starting ingestion from '{data_path}'...")
+        self.ingest_files(
+            self.collect_files(data_path, ignore_folders),
+            on_file_done=on_file_done,
+            should_stop=should_stop,
+        )
         logging.info("🎉 Ingestion process completed successfully!")
 
+    def _fit_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Validates chunks against the embedding model's token limit before embedding.
+
+        Empty chunks are dropped and chunks longer than the model's maximum sequence
+        length are split into several chunks sharing the same metadata, so that no
+        input is rejected or silently truncated by the provider.
+        """
+        fitted: List[Document] = []
+        for doc in documents:
+            if not doc.page_content or not doc.page_content.strip():
+                continue
+            pieces = self.embeddings_model.split_to_fit(doc.page_content)
+            if len(pieces) == 1:
+                fitted.append(doc)
+                continue
+            logging.debug(
+                f"Splitting chunk from '{doc.metadata.get('source')}' into {len(pieces)} pieces to fit the embedding model."
+            )
+            fitted.extend(
+                Document(page_content=piece, metadata=dict(doc.metadata))
+                for piece in pieces
+            )
+        return fitted
+
     def _flatten_metadata(self, documents: List[Document]) -> List[Document]:
         cloned_documents = copy.deepcopy(documents)
         for doc in cloned_documents:
@@ -0,0 +1,300 @@
+import asyncio
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from raglight.api.admission import GENERATE, INGEST, STREAM, AdmissionController
+from raglight.api.concurrency import ConcurrencyLimiter, QueueFullError
+from raglight.api.router import GenerateRequest, create_router
+
+
+def _endpoint(router, path: str):
+    return next(route.endpoint for route in router.routes if route.path == path)
+
+
+def _admission(**limiters) -> AdmissionController:
+    return AdmissionController(
+        {
+            name: limiters.get(name, ConcurrencyLimiter(4, 4))
+            for name in ("generate", "stream", "ingest")
+        }
+    )
+
+
+class TestConcurrencyLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_queue_and_release(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=1)
+        first = limiter.reserve()
+        self.assertTrue(await first.acquire())
+        second = limiter.reserve()
+        with self.assertRaises(QueueFullError):
+            limiter.reserve()
+        self.assertFalse(await second.acquire(timeout=0.01))
+
+        first.release()
+        first.release()  # idempotent
+        self.assertTrue(await second.acquire(timeout=1))
+        self.assertEqual((limiter.active, limiter.queued), (1, 0))
+        second.release()
+        self.assertEqual((limiter.active, limiter.queued), (0, 0))
+
+    async def test_timed_out_acquire_keeps_its_place(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=2)
+        first = limiter.reserve()
+        await first.acquire()
+        second = limiter.reserve()
+        self.assertFalse(await second.acquire(timeout=0.01))
+        third = limiter.reserve()
+        third_acquire = asyncio.ensure_future(third.acquire())
+        await asyncio.sleep(0)
+
+        first.release()
+        self.assertTrue(await second.acquire(timeout=1))
+        self.assertFalse(third_acquire.done())
+
+        second.release()
+        self.assertTrue(await third_acquire)
+        third.release()
+        self.assertEqual((limiter.active, limiter.queued), (0, 0))
+
+    async def test_release_after_a_timed_out_acquire_frees_the_place(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=2)
+        first = limiter.reserve()
+        await first.acquire()
+        second = limiter.reserve()
+        self.assertFalse(await second.acquire(timeout=0.01))
+        second.release()
+
+        first.release()
+        third = limiter.reserve()
+        self.assertTrue(await third.acquire(timeout=1))
+        self.assertEqual((limiter.active, limiter.queued), (1, 0))
+
+    async def test_release_while_queued(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=0)
+        ticket = limiter.reserve()
+        ticket.release()
+        self.assertEqual(limiter.queued, 0)
+        limiter.reserve()
+
+    def test_retry_after_grows_with_queue(self):
+        limiter = ConcurrencyLimiter(max_concurrent=2, max_queued=10)
+        limiter._observe(4.0)
+        self.assertEqual(limiter.retry_after(), 2)
+        limiter.queued = 5
+        self.assertEqual(limiter.retry_after(), 12)
+
+
+class TestAdmission(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.app = FastAPI()
+        self.app.include_router(create_router())
+        self.app.state.pipeline = MagicMock()
+        self.client = TestClient(self.app)
+
+    def test_full_queue_returns_429_with_retry_after(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=0)
+        limiter.reserve()
+        self.app.state.admission = _admission(stream=limiter)
+
+        response = self.client.post("/generate/stream", json={"question": "q"})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers["Retry-After"]), 1)
+
+    def test_route_classes_are_independent(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=0)
+        limiter.reserve()
+        self.app.state.admission = _admission(stream=limiter)
+        self.app.state.pipeline.agenerate = AsyncMock(return_value="ok")
+
+        response = self.client.post("/generate", json={"question": "q"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_deadline_exceeded_returns_504(self):
+        async def slow(question, session_id=None):
+            await asyncio.sleep(5)
+
+        self.app.state.admission = _admission(
+            generate=ConcurrencyLimiter(1, 1, timeout=0.05)
+        )
+        self.app.state.pipeline.agenerate = slow
+
+        response = self.client.post("/generate", json={"question": "q"})
+        self.assertEqual(response.status_code, 504)
+        limiter = self.app.state.admission.limiters[GENERATE]
+        self.assertEqual((limiter.active, limiter.queued), (0, 0))
+
+    async def test_queued_request_times_out(self):
+        limiter = ConcurrencyLimiter(1, 1, timeout=0.05)
+        running = limiter.reserve()
+        await running.acquire()
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+
+        with self.assertRaises(Exception) as ctx:
+            await _admission(generate=limiter).admit(GENERATE, request)
+        self.assertEqual(ctx.exception.status_code, 504)
+        self.assertEqual(limiter.queued, 0)
+
+    async def test_queued_requests_are_admitted_in_arrival_order(self):
+        limiter = ConcurrencyLimiter(1, 5)
+        running = limiter.reserve()
+        await running.acquire()
+        admission = _admission(generate=limiter)
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+        admitted = []
+
+        async def queue(name):
+            ticket = await admission.admit(GENERATE, request)
+            admitted.append(name)
+            await asyncio.sleep(0.02)
+            ticket.release()
+
+        with patch("raglight.api.admission.DISCONNECT_POLL_INTERVAL", 0.005):
+            tasks = []
+            for name in range(4):
+                tasks.append(asyncio.ensure_future(queue(name)))
+                await asyncio.sleep(0.012)
+            running.release()
+            await asyncio.gather(*tasks)
+
+        self.assertEqual(admitted, [0, 1, 2, 3])
+        self.assertEqual((limiter.active, limiter.queued), (0, 0))
+
+    async def test_disconnect_while_queued_returns_499(self):
+        limiter = ConcurrencyLimiter(1, 1)
+        running = limiter.reserve()
+        await running.acquire()
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(side_effect=[False, True])
+
+        with patch("raglight.api.admission.DISCONNECT_POLL_INTERVAL", 0.01):
+            with self.assertRaises(Exception) as ctx:
+                await _admission(generate=limiter).admit(GENERATE, request)
+        self.assertEqual(ctx.exception.status_code, 499)
+        self.assertEqual(limiter.queued, 0)
+
+    async def test_disconnect_cancels_generation(self):
+        closed = asyncio.Event()
+        produced = []
+
+        async def agenerate_streaming(question, session_id=None):
+            try:
+                for i in range(100):
+                    produced.append(i)
+                    yield f"chunk {i}"
+            finally:
+                closed.set()
+
+        admission = _admission()
+        request = MagicMock()
+        request.app.state = SimpleNamespace(
+            pipeline=SimpleNamespace(agenerate_streaming=agenerate_streaming),
+            admission=admission,
+        )
+        request.is_disconnected = AsyncMock(side_effect=[False, False, True])
+
+        endpoint = _endpoint(create_router(), "/generate/stream")
+        response = await endpoint(request, GenerateRequest(question="q"))
+        events = [event async for event in response.body_iterator]
+
+        self.assertEqual(len(events), 2)
+        self.assertTrue(closed.is_set())
+        self.assertLess(len(produced), 100)
+        limiter = admission.limiters[STREAM]
+        self.assertEqual((limiter.active, limiter.queued), (0, 0))
+
+    @patch("raglight.api.admission.DISCONNECT_POLL_INTERVAL", 0.01)
+    async def test_upload_queued_behind_another_ingest(self):
+        admission = _admission(ingest=ConcurrencyLimiter(1, 1))
+        self.app.state.admission = admission
+        first_started = threading.Event()
+        finish_first = threading.Event()
+        ingested = []
+
+        def ingest_files(paths):
+            for path in paths:
+                with open(path, "rb") as f:
+                    ingested.append((os.path.basename(path), f.read()))
+            if len(ingested) == 1:
+                first_started.set()
+                finish_first.wait(5)
+
+        self.app.state.pipeline.get_vector_store.return_value.ingest_files = (
+            ingest_files
+        )
+        transport = httpx.ASGITransport(app=self.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            def upload(name: str, content: bytes):
+                return client.post(
+                    "/ingest/upload",
+                    files=[("files", (name, content, "text/plain"))],
+                )
+
+            first = asyncio.ensure_future(upload("first.txt", b"first"))
+            await asyncio.to_thread(first_started.wait, 5)
+            second = asyncio.ensure_future(upload("second.txt", b"second"))
+            while admission.limiters[INGEST].queued == 0:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)  # several disconnect polls while queued
+            finish_first.set()
+            responses = await asyncio.gather(first, second)
+
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual(ingested, [("first.txt", b"first"), ("second.txt", b"second")])
+
+    async def test_upload_ingests_files_while_receiving_the_rest(self):
+        first_ingested = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        ingested = []
+
+        def ingest_files(paths):
+            ingested.extend(os.path.basename(path) for path in paths)
+            loop.call_soon_threadsafe(first_ingested.set)
+
+        self.app.state.pipeline.get_vector_store.return_value.ingest_files = (
+            ingest_files
+        )
+        boundary = "boundary"
+
+        def part(name: str) -> bytes:
+            return (
+                f'Content-Disposition: form-data; name="files"; filename="{name}"\r\n'
+                "Content-Type: text/plain\r\n\r\n"
+                f"{name}\r\n--{boundary}"
+            ).encode()
+
+        async def body():
+            # The first file ends with the next boundary, so it is complete before
+            # the second one is sent, which only happens once the first is ingested.
+            yield f"--{boundary}\r\n".encode() + part("first.txt") + b"\r\n"
+            await asyncio.wait_for(first_ingested.wait(), 5)
+            yield part("second.txt") + b"--\r\n"
+
+        transport = httpx.ASGITransport(app=self.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/ingest/upload",
+                content=body(),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ingested, ["first.txt", "second.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from raglight.api.ingest_jobs import (
+    CANCELLED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    IngestJobJournal,
+    IngestJobManager,
+)
+from raglight.api.router import create_router
+
+
+def _wait_for(manager, job_id, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.status in statuses:
+            break
+        time.sleep(0.01)
+    return job
+
+
+class TestIngestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp.name, "data")
+        os.makedirs(self.data_dir)
+        self.files = []
+        for name in ("a.txt", "b.txt"):
+            path = os.path.join(self.data_dir, name)
+            with open(path, "w") as f:
+                f.write(name)
+            self.files.append(path)
+
+        self.vector_store = MagicMock()
+        self.vector_store.collect_files.return_value = self.files
+        self.ingested = []
+
+        def ingest_files(paths, on_file_done=None, should_stop=None):
+            for path in paths:
+                self.ingested.append(path)
+                on_file_done(path, 3, None)
+
+        self.vector_store.ingest_files.side_effect = ingest_files
+        self.journal_path = os.path.join(self.tmp.name, "jobs", "jobs.db")
+        self.manager = self._manager()
+        poll = patch("raglight.api.ingest_jobs.JOB_POLL_INTERVAL", 0.01)
+        poll.start()
+        self.addCleanup(poll.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _manager(self) -> IngestJobManager:
+        return IngestJobManager(
+            self.vector_store,
+            journal_path=self.journal_path,
+            upload_dir=os.path.join(self.tmp.name, "uploads"),
+        )
+
+    def test_job_reports_progress(self):
+        self.manager.start()
+        job = self.manager.submit("data_path", {"data_path": self.data_dir})
+        job = _wait_for(self.manager, job.id, (SUCCEEDED,))
+        self.manager.stop(timeout=5)
+        self.assertEqual(job.status, SUCCEEDED)
+        self.assertEqual(job.files_total, 2)
+        self.assertEqual(job.files_done, 2)
+        self.assertEqual(job.chunks_embedded, 6)
+        self.assertGreater(job.throughput, 0)
+        self.assertEqual(job.errors, [])
+
+    def test_cancel_queued_job(self):
+        job = self.manager.submit("data_path", {"data_path": self.data_dir})
+        self.assertEqual(self.manager.cancel(job.id).status, CANCELLED)
+        self.manager.start()
+        time.sleep(0.05)
+        self.assertEqual(self.manager.get(job.id).status, CANCELLED)
+        self.manager.stop(timeout=5)
+        self.vector_store.ingest_files.assert_not_called()
+
+    def test_interrupted_job_resumes_with_remaining_files(self):
+        job = self.manager.submit("data_path", {"data_path": self.data_dir})
+        journal = IngestJobJournal(self.journal_path)
+        journal.claim_next("gone")
+        journal.record_file(job.id, "a.txt", 3)
+        journal.close()
+        self.manager.stop()
+
+        manager = self._manager()
+        manager.start()
+        resumed = _wait_for(manager, job.id, (SUCCEEDED,))
+        manager.stop(timeout=5)
+        self.assertEqual(resumed.status, SUCCEEDED)
+        self.assertEqual(self.ingested, [self.files[1]])
+        self.assertEqual(resumed.files_done, 2)
+        self.assertEqual(resumed.chunks_embedded, 6)
+
+    def test_jobs_run_one_at_a_time(self):
+        release = threading.Event()
+        self.vector_store.ingest_files.side_effect = lambda *a, **k: release.wait(5)
+        self.manager.start()
+        first = self.manager.submit("data_path", {"data_path": self.data_dir})
+        second = self.manager.submit("data_path", {"data_path": self.data_dir})
+        _wait_for(self.manager, first.id, (RUNNING,))
+        self.assertEqual(self.manager.get(second.id).status, QUEUED)
+        release.set()
+        second = _wait_for(self.manager, second.id, (SUCCEEDED,))
+        self.manager.stop(timeout=5)
+        self.assertEqual(second.status, SUCCEEDED)
+
+    def test_processes_share_jobs_and_run_each_once(self):
+        release = threading.Event()
+        calls = []
+
+        def ingest_files(paths, on_file_done=None, should_stop=None):
+            calls.append(paths)
+            for path in paths:
+                on_file_done(path, 3, None)
+                release.wait(5)
+                if should_stop():
+                    return
+
+        self.vector_store.ingest_files.side_effect = ingest_files
+        other = self._manager()
+        self.manager.start()
+        other.start()
+        try:
+            job = other.submit("data_path", {"data_path": self.data_dir})
+            self.assertEqual(
+                _wait_for(self.manager, job.id, (RUNNING,)).status, RUNNING
+            )
+            self.assertEqual(other.get(job.id).status, RUNNING)
+            self.assertEqual([j.id for j in other.list()], [job.id])
+
+            other.cancel(job.id)
+            release.set()
+            cancelled = _wait_for(self.manager, job.id, (CANCELLED,))
+            self.assertEqual(cancelled.status, CANCELLED)
+            self.assertEqual(other.get(job.id).files_done, 1)
+        finally:
+            release.set()
+            self.manager.stop(timeout=5)
+            other.stop(timeout=5)
+        self.assertEqual(len(calls), 1)
+
+    def test_only_the_lock_holder_requeues_running_jobs(self):
+        release = threading.Event()
+        self.vector_store.ingest_files.side_effect = lambda *a, **k: release.wait(5)
+        self.manager.start()
+        job = self.manager.submit("data_path", {"data_path": self.data_dir})
+        _wait_for(self.manager, job.id, (RUNNING,))
+
+        # A second process starting up must not run the job again.
+        other = self._manager()
+        other.start()
+        time.sleep(0.1)
+        self.assertEqual(other.get(job.id).owner, self.manager.owner)
+        release.set()
+        _wait_for(other, job.id, (SUCCEEDED,))
+        self.manager.stop(timeout=5)
+        other.stop(timeout=5)
+        self.assertEqual(self.vector_store.ingest_files.call_count, 1)
+
+
+class TestIngestJobRoutes(unittest.TestCase):
+    def setUp(self):
+        self.jobs = MagicMock()
+        job = MagicMock(
+            id="job-1",
+            kind="data_path",
+            status=QUEUED,
+            files_total=0,
+            files_done=0,
+            chunks_embedded=0,
+            throughput=0.0,
+            errors=[],
+            created_at=1.0,
+            started_at=None,
+            finished_at=None,
+        )
+        self.jobs.submit.return_value = job
+        self.jobs.get.return_value = job
+        app = FastAPI()
+        app.include_router(create_router())
+        app.state.pipeline = MagicMock()
+        app.state.ingest_jobs = self.jobs
+        self.client = TestClient(app)
+
+    def test_submit_returns_job_id(self):
+        response = self.client.post("/ingest/jobs", json={"data_path": "/data"})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["id"], "job-1")
+        self.jobs.submit.assert_called_once_with("data_path", {"data_path": "/data"})
+
+    def test_submit_requires_one_source(self):
+        response = self.client.post(
+            "/ingest/jobs", json={"data_path": "/data", "file_paths": ["/a"]}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_upload_job_spools_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.jobs.new_upload_dir.side_effect = lambda job_id: os.path.join(
+                tmp, job_id
+            )
+            response = self.client.post(
+                "/ingest/jobs/upload",
+                files=[("files", ("notes.txt", b"hello", "text/plain"))],
+            )
+            self.assertEqual(response.status_code, 202)
+            kind, params = self.jobs.submit.call_args[0]
+            self.assertEqual(kind, "upload")
+            self.assertEqual(os.listdir(params["dir"]), ["notes.txt"])
+
+    def test_unknown_job_returns_404(self):
+        self.jobs.get.return_value = None
+        response = self.client.get("/ingest/jobs/missing")
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,13 @@
+import json
+import os
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from raglight.api.router import create_router
+from raglight.api.server_config import ServerConfig
 
 
 def make_app(pipeline_mock: MagicMock) -> FastAPI:
@@ -19,7 +22,8 @@ class TestRouter(unittest.TestCase):
         self.pipeline = MagicMock()
         self.vector_store = MagicMock()
         self.pipeline.get_vector_store.return_value = self.vector_store
-        self.client = TestClient(make_app(self.pipeline), raise_server_exceptions=True)
+        self.app = make_app(self.pipeline)
+        self.client = TestClient(self.app, raise_server_exceptions=True)
 
     # ── /health ──────────────────────────────────────────────────────────────
 
@@ -31,20 +35,45 @@ class TestRouter(unittest.TestCase):
     # ── /generate ─────────────────────────────────────────────────────────────
 
     def test_generate(self):
-        self.pipeline.generate.return_value = "Paris is the capital of France."
+        self.pipeline.agenerate = AsyncMock(
+            return_value="Paris is the capital of France."
+        )
         response = self.client.post(
             "/generate", json={"question": "What is the capital of France?"}
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"answer": "Paris is the capital of France."})
-        self.pipeline.generate.assert_called_once_with("What is the capital of France?")
+        self.pipeline.agenerate.assert_awaited_once_with(
+            "What is the capital of France?", session_id=None
+        )
 
     def test_generate_error(self):
-        self.pipeline.generate.side_effect = RuntimeError("LLM unavailable")
+        self.pipeline.agenerate = AsyncMock(side_effect=RuntimeError("LLM unavailable"))
         response = self.client.post("/generate", json={"question": "test"})
         self.assertEqual(response.status_code, 500)
         self.assertIn("LLM unavailable", response.json()["detail"])
 
+    def test_generate_stream(self):
+        async def chunks(question, session_id=None):
+            for chunk in ["Paris", " is", " the capital."]:
+                yield chunk
+
+        self.pipeline.agenerate_streaming = chunks
+        response = self.client.post(
+            "/generate/stream", json={"question": "Capital of France?"}
+        )
+        self.assertEqual(response.status_code, 200)
+        events = [
+            line[len("data: ") :]
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        self.assertEqual(events[-1], "[DONE]")
+        self.assertEqual(
+            [json.loads(e)["chunk"] for e in events[:-1]],
+            ["Paris", " is", " the capital."],
+        )
+
     # ── /ingest ───────────────────────────────────────────────────────────────
 
     def test_ingest_local(self):
@@ -104,10 +133,14 @@ class TestRouter(unittest.TestCase):
     # ── /ingest/upload ────────────────────────────────────────────────────────
 
     def test_ingest_upload(self):
-        self.vector_store.add_documents.return_value = None
-        self.vector_store.add_class_documents.return_value = None
-        self.vector_store._flatten_metadata.side_effect = lambda docs: docs
-        self.vector_store._process_file = lambda fp, factory, flatten: (["chunk"], [])
+        ingested = []
+
+        def ingest_files(paths):
+            for path in paths:
+                with open(path, "rb") as f:
+                    ingested.append((os.path.basename(path), f.read()))
+
+        self.vector_store.ingest_files.side_effect = ingest_files
         response = self.client.post(
             "/ingest/upload",
             files=[
@@ -117,11 +150,54 @@ class TestRouter(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertIn("2 file(s)", response.json()["message"])
+        self.assertEqual(
+            ingested, [("doc1.txt", b"hello world"), ("doc2.txt", b"another doc")]
+        )
+
+    def test_ingest_upload_strips_directories_from_filenames(self):
+        response = self.client.post(
+            "/ingest/upload",
+            files=[("files", ("../../etc/passwd", b"x", "text/plain"))],
+        )
+        self.assertEqual(response.status_code, 200)
+        (path,) = self.vector_store.ingest_files.call_args[0][0]
+        self.assertEqual(os.path.basename(path), "passwd")
+        self.assertIn("raglight_upload_", path)
+
+    def test_ingest_upload_file_too_large(self):
+        self.app.state.server_config = ServerConfig(max_upload_file_mb=1)
+        response = self.client.post(
+            "/ingest/upload",
+            files=[
+                ("files", ("small.txt", b"ok", "text/plain")),
+                ("files", ("big.bin", b"x" * (1024 * 1024 + 1), "text/plain")),
+            ],
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("big.bin", response.json()["detail"])
+
+    def test_ingest_upload_total_too_large(self):
+        self.app.state.server_config = ServerConfig(max_upload_total_mb=1)
+        response = self.client.post(
+            "/ingest/upload",
+            files=[("files", ("big.bin", b"x" * (2 * 1024 * 1024), "text/plain"))],
+        )
+        self.assertEqual(response.status_code, 413)
+        self.vector_store.ingest_files.assert_not_called()
 
     def test_ingest_upload_no_files(self):
         response = self.client.post("/ingest/upload", files=[])
         self.assertIn(response.status_code, (400, 422))
 
+    # ── /metrics ──────────────────────────────────────────────────────────────
+
+    def test_metrics(self):
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn("# TYPE raglight_stage_duration_seconds histogram", response.text)
+        self.assertIn('raglight_requests_queued{route="generate"} 0', response.text)
+
     # ── /collections ──────────────────────────────────────────────────────────
 
     def test_collections(self):
@@ -0,0 +1,183 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+
+from raglight.api.admission import SEARCH, AdmissionController
+from raglight.api.concurrency import ConcurrencyLimiter
+from raglight.api.router import create_router
+from raglight.api.search_cache import SearchCache
+
+
+class TestSearchCache(unittest.TestCase):
+    def test_key_normalizes_request(self):
+        self.assertEqual(
+            SearchCache.make_key("  what  is RAG ", 5, {"a": 1, "b": 2}, None, None),
+            SearchCache.make_key("what is RAG", 5, {"b": 2, "a": 1}, None, None),
+        )
+        self.assertNotEqual(
+            SearchCache.make_key("what is RAG", 5, None, None, None),
+            SearchCache.make_key("what is RAG", 6, None, None, None),
+        )
+
+    def test_new_index_generation_invalidates(self):
+        cache = SearchCache()
+        cache.set("key", 1, [{"content": "a"}])
+        self.assertEqual(cache.get("key", 1), [{"content": "a"}])
+        self.assertIsNone(cache.get("key", 2))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_entries_expire_after_ttl(self):
+        cache = SearchCache(ttl=60)
+        with patch("raglight.api.search_cache.time.monotonic", return_value=100.0):
+            cache.set("key", 1, [])
+        with patch("raglight.api.search_cache.time.monotonic", return_value=150.0):
+            self.assertTrue(cache.contains("key", 1))
+            self.assertEqual(cache.get("key", 1), [])
+        with patch("raglight.api.search_cache.time.monotonic", return_value=161.0):
+            self.assertFalse(cache.contains("key", 1))
+            self.assertIsNone(cache.get("key", 1))
+
+    def test_lru_eviction(self):
+        cache = SearchCache(max_entries=1)
+        cache.set("a", 0, [])
+        cache.set("b", 0, [])
+        self.assertIsNone(cache.get("a", 0))
+        self.assertEqual(cache.get("b", 0), [])
+
+    def test_contains_does_not_count_lookups(self):
+        cache = SearchCache()
+        cache.set("key", 1, [])
+        self.assertTrue(cache.contains("key", 1))
+        self.assertFalse(cache.contains("key", 2))
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+
+class TestSearchRoutes(unittest.TestCase):
+    def setUp(self):
+        self.vector_store = MagicMock()
+        self.vector_store.index_generation = 0
+        self.vector_store.similarity_search_with_scores.side_effect = (
+            lambda query, **kwargs: [
+                (
+                    Document(
+                        id="chunk-1",
+                        page_content=f"about {query}",
+                        metadata={"source": "doc.pdf"},
+                    ),
+                    0.9,
+                )
+            ]
+        )
+        pipeline = MagicMock()
+        pipeline.get_vector_store.return_value = self.vector_store
+        app = FastAPI()
+        app.include_router(create_router())
+        app.state.pipeline = pipeline
+        self.app = app
+        self.client = TestClient(app)
+
+    def test_search_returns_ids_metadata_and_scores(self):
+        response = self.client.post(
+            "/search",
+            json={"query": "RAG", "k": 3, "filter": {"source": "doc.pdf"}},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {
+                        "id": "chunk-1",
+                        "content": "about RAG",
+                        "metadata": {"source": "doc.pdf"},
+                        "score": 0.9,
+                    }
+                ]
+            },
+        )
+        self.vector_store.similarity_search_with_scores.assert_called_once_with(
+            "RAG",
+            k=3,
+            filter={"source": "doc.pdf"},
+            collection_name=None,
+            search_type=None,
+        )
+
+    def test_search_is_cached_until_the_index_changes(self):
+        self.client.post("/search", json={"query": "RAG"})
+        self.client.post("/search", json={"query": " RAG "})
+        self.assertEqual(self.vector_store.similarity_search_with_scores.call_count, 1)
+        self.vector_store.index_generation = 1
+        self.client.post("/search", json={"query": "RAG"})
+        self.assertEqual(self.vector_store.similarity_search_with_scores.call_count, 2)
+
+    def test_batch_search(self):
+        response = self.client.post(
+            "/search/batch",
+            json={"requests": [{"query": "one"}, {"query": "two", "k": 1}]},
+        )
+        self.assertEqual(response.status_code, 200)
+        contents = [r["results"][0]["content"] for r in response.json()["responses"]]
+        self.assertEqual(contents, ["about one", "about two"])
+        self.vector_store.embed_queries.assert_called_once_with(["one", "two"])
+
+    def test_batch_search_embeds_only_uncached_dense_queries(self):
+        self.client.post("/search", json={"query": "one"})
+        self.client.post(
+            "/search/batch",
+            json={
+                "requests": [
+                    {"query": "one"},
+                    {"query": "two", "search_type": "bm25"},
+                    {"query": "three"},
+                ]
+            },
+        )
+        self.vector_store.embed_queries.assert_called_once_with(["three"])
+        self.assertEqual(self.vector_store.similarity_search_with_scores.call_count, 3)
+
+    def test_invalid_search_type(self):
+        response = self.client.post(
+            "/search", json={"query": "RAG", "search_type": "fuzzy"}
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_value_error_returns_400(self):
+        self.vector_store.similarity_search_with_scores.side_effect = ValueError(
+            "only available on the default collection"
+        )
+        response = self.client.post(
+            "/search", json={"query": "RAG", "search_type": "bm25", "collection": "x"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_timed_out_search_keeps_its_slot_until_the_thread_ends(self):
+        limiter = ConcurrencyLimiter(1, 0, timeout=0.05)
+        self.app.state.admission = AdmissionController({SEARCH: limiter})
+        finish = threading.Event()
+        self.vector_store.similarity_search_with_scores.side_effect = (
+            lambda *args, **kwargs: finish.wait(5) and []
+        )
+
+        # Keep the event loop running between requests, as a server does.
+        with TestClient(self.app) as client:
+            response = client.post("/search", json={"query": "slow"})
+
+            self.assertEqual(response.status_code, 504)
+            self.assertEqual(limiter.active, 1)
+            busy = client.post("/search", json={"query": "other"})
+            self.assertEqual(busy.status_code, 429)
+            finish.set()
+            deadline = time.monotonic() + 5
+            while limiter.active and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(limiter.active, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
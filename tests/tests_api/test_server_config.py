@@ -96,6 +96,50 @@ class TestServerConfigDefaults(unittest.TestCase):
         self.assertEqual(vs_config.persist_directory, "/tmp/testdb")
         self.assertIsNone(vs_config.host)
 
+    def test_to_vector_store_config_model_server(self):
+        env = {**_clean_env(), "RAGLIGHT_MODEL_SERVER": "/tmp/models.sock"}
+        with patch.dict(os.environ, env, clear=True):
+            cfg = ServerConfig()
+        vs_config = cfg.to_vector_store_config()
+        self.assertEqual(vs_config.provider, Settings.MODEL_SERVER)
+        self.assertEqual(vs_config.api_base, "/tmp/models.sock")
+
+    def test_to_rag_config_cross_encoder_from_model_server(self):
+        env = {
+            **_clean_env(),
+            "RAGLIGHT_MODEL_SERVER": "/tmp/models.sock",
+            "RAGLIGHT_CROSS_ENCODER_MODEL": "my-reranker",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            cfg = ServerConfig()
+        with patch(
+            "raglight.cross_encoder.model_server_cross_encoder."
+            "ModelServerCrossEncoderModel.load"
+        ):
+            rag_config = cfg.to_rag_config()
+        self.assertEqual(rag_config.cross_encoder_model.model_name, "my-reranker")
+        self.assertEqual(rag_config.cross_encoder_model.address, "/tmp/models.sock")
+
+    def test_model_server_requires_huggingface_embeddings(self):
+        env = {
+            **_clean_env(),
+            "RAGLIGHT_MODEL_SERVER": "/tmp/models.sock",
+            "RAGLIGHT_EMBEDDINGS_PROVIDER": "Ollama",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            cfg = ServerConfig()
+        with self.assertRaises(ValueError):
+            cfg.to_vector_store_config()
+
+    def test_to_rag_config_sessions(self):
+        env = {**_clean_env(), "RAGLIGHT_MAX_HISTORY": "6"}
+        with patch.dict(os.environ, env, clear=True):
+            cfg = ServerConfig()
+        rag_config = cfg.to_rag_config()
+        self.assertEqual(rag_config.max_history, 6)
+        self.assertEqual(rag_config.session_store.max_history, 6)
+        self.assertFalse(rag_config.shared_history)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from raglight.cross_encoder.huggingface_cross_encoder import (
+    HuggingfaceCrossEncoderModel,
+)
+
+MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L6-v2"
+
+
+def _fake_predict(pairs):
+    # Longer documents are considered more relevant.
+    return [float(len(doc)) for _, doc in pairs]
+
+
+class TestHuggingfaceCrossEncoder(unittest.TestCase):
+
+    @patch("raglight.cross_encoder.huggingface_cross_encoder.CrossEncoder")
+    def test_predict_returns_top_k_by_score(self, MockCrossEncoder: MagicMock):
+        MockCrossEncoder.return_value.predict.side_effect = _fake_predict
+        model = HuggingfaceCrossEncoderModel(MODEL_NAME)
+
+        result = model.predict("query", ["a", "abc", "ab"], top_k=2)
+
+        self.assertEqual(result, ["abc", "ab"])
+
+    @patch("raglight.cross_encoder.huggingface_cross_encoder.CrossEncoder")
+    def test_rank_returns_indices_and_scores(self, MockCrossEncoder: MagicMock):
+        MockCrossEncoder.return_value.predict.side_effect = _fake_predict
+        model = HuggingfaceCrossEncoderModel(MODEL_NAME)
+
+        ranked = model.rank("query", ["a", "abc", "ab"], top_k=3, min_score=2.0)
+
+        self.assertEqual(ranked, [(1, 3.0), (2, 2.0)])
+
+    @patch("raglight.cross_encoder.huggingface_cross_encoder.CrossEncoder")
+    def test_score_only_computes_missing_pairs(self, MockCrossEncoder: MagicMock):
+        mock_instance = MockCrossEncoder.return_value
+        mock_instance.predict.side_effect = _fake_predict
+        model = HuggingfaceCrossEncoderModel(MODEL_NAME)
+
+        model.score("query", ["a", "ab"])
+        scores = model.score("query", ["ab", "abc"])
+
+        self.assertEqual(scores, [2.0, 3.0])
+        self.assertEqual(mock_instance.predict.call_count, 2)
+        mock_instance.predict.assert_called_with([("query", "abc")])
+        self.assertEqual(model.score_cache.hits, 1)
+
+    @patch("raglight.cross_encoder.huggingface_cross_encoder.CrossEncoder")
+    def test_cache_is_bounded(self, MockCrossEncoder: MagicMock):
+        MockCrossEncoder.return_value.predict.side_effect = _fake_predict
+        model = HuggingfaceCrossEncoderModel(MODEL_NAME, cache_size=2)
+
+        model.score("query", ["a", "ab", "abc"])
+
+        self.assertEqual(model.score_cache.stats()["size"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
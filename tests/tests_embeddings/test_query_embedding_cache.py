@@ -0,0 +1,26 @@
+import unittest
+
+from raglight.embeddings.query_embedding_cache import QueryEmbeddingCache
+
+
+class TestQueryEmbeddingCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = QueryEmbeddingCache(max_size=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+        cache.put("c", [3.0])
+
+        self.assertEqual(cache.get("a"), [1.0])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_disabled(self):
+        cache = QueryEmbeddingCache(max_size=0)
+        cache.put("a", [1.0])
+
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
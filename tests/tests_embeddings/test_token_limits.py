@@ -0,0 +1,51 @@
+import unittest
+from typing import List
+
+from raglight.embeddings.embeddings_model import EmbeddingsModel
+
+
+class _WordEmbeddings(EmbeddingsModel):
+    """Embeddings model counting one token per word, for deterministic limits."""
+
+    def load(self):
+        return None
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[float(self.count_tokens(t))] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(self.count_tokens(text))]
+
+
+class TestTokenLimits(unittest.TestCase):
+    def test_no_limit_keeps_text(self):
+        model = _WordEmbeddings("words")
+        text = "one two three"
+        self.assertEqual(model.truncate(text), text)
+        self.assertEqual(model.split_to_fit(text), [text])
+
+    def test_truncate_fits_limit(self):
+        model = _WordEmbeddings("words", max_tokens=3)
+        truncated = model.truncate("one two three four five six")
+        self.assertLessEqual(model.count_tokens(truncated), 3)
+        self.assertTrue("one two three four five six".startswith(truncated))
+
+    def test_split_to_fit_keeps_all_words(self):
+        model = _WordEmbeddings("words", max_tokens=4)
+        text = " ".join(f"w{i}" for i in range(10))
+        pieces = model.split_to_fit(text)
+        self.assertGreater(len(pieces), 1)
+        for piece in pieces:
+            self.assertLessEqual(model.count_tokens(piece), 4)
+        self.assertEqual(" ".join(pieces).split(), text.split())
+
+    def test_split_to_fit_short_text_unchanged(self):
+        model = _WordEmbeddings("words", max_tokens=4)
+        self.assertEqual(model.split_to_fit("a b"), ["a b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
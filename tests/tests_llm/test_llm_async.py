@@ -0,0 +1,79 @@
+import unittest
+from typing import Any, Dict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from raglight.llm.bedrock_model import BedrockModel
+from raglight.llm.llm import LLM
+from raglight.llm.response_cache import InMemoryResponseCache
+from ..test_config import TestsConfig
+
+
+def _chunk(content: str) -> MagicMock:
+    chunk = MagicMock()
+    chunk.content = content
+    return chunk
+
+
+class _SyncOnlyLLM(LLM):
+    """LLM without _build_messages, to exercise the worker thread fallback."""
+
+    def load(self):
+        return None
+
+    def generate(self, input: Dict[str, Any]) -> str:
+        return f"echo: {input['question']}"
+
+    def generate_streaming(self, input: Dict[str, Any], callbacks=None):
+        yield from ["echo", ": ", input["question"]]
+
+
+class TestLLMAsync(unittest.IsolatedAsyncioTestCase):
+    @patch("raglight.llm.bedrock_model.ChatBedrock")
+    def setUp(self, mock_chat_bedrock: MagicMock):
+        mock_chat_bedrock.return_value = MagicMock()
+        self.model = BedrockModel(
+            model_name=TestsConfig.BEDROCK_LLM_MODEL,
+            region_name="us-east-1",
+            response_cache=InMemoryResponseCache(),
+        )
+        self.model.model.ainvoke = AsyncMock(return_value=_chunk("async answer"))
+
+        async def astream(messages, config=None):
+            for content in ["as", "ync"]:
+                yield _chunk(content)
+
+        self.model.model.astream = astream
+
+    async def test_agenerate_uses_async_client(self):
+        answer = await self.model.agenerate({"question": "Q"})
+        self.assertEqual(answer, "async answer")
+        self.model.model.ainvoke.assert_awaited_once()
+        self.model.model.invoke.assert_not_called()
+
+    async def test_agenerate_shares_response_cache(self):
+        await self.model.agenerate({"question": "Q"})
+        self.assertEqual(self.model.generate({"question": "Q"}), "async answer")
+        self.model.model.invoke.assert_not_called()
+
+    async def test_agenerate_streaming(self):
+        chunks = [c async for c in self.model.agenerate_streaming({"question": "Q"})]
+        self.assertEqual(chunks, ["as", "ync"])
+
+    async def test_fallback_to_sync_methods(self):
+        llm = _SyncOnlyLLM("sync-only")
+        self.assertFalse(llm.supports_messages)
+        self.assertEqual(await llm.agenerate({"question": "hi"}), "echo: hi")
+        chunks = [c async for c in llm.agenerate_streaming({"question": "hi"})]
+        self.assertEqual(chunks, ["echo", ": ", "hi"])
+
+    async def test_message_builder_errors_are_not_swallowed(self):
+        self.assertTrue(self.model.supports_messages)
+        with patch.object(
+            BedrockModel, "_build_messages", side_effect=NotImplementedError
+        ):
+            with self.assertRaises(NotImplementedError):
+                await self.model.agenerate({"question": "Q"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from raglight.llm.bedrock_model import BedrockModel
+from raglight.llm.response_cache import (
+    InMemoryResponseCache,
+    ResponseCache,
+    SQLiteResponseCache,
+)
+from ..test_config import TestsConfig
+
+
+def _chunk(content: str) -> MagicMock:
+    chunk = MagicMock()
+    chunk.content = content
+    return chunk
+
+
+class TestResponseCache(unittest.TestCase):
+    @patch("raglight.llm.bedrock_model.ChatBedrock")
+    def setUp(self, mock_chat_bedrock: MagicMock):
+        mock_chat_bedrock.return_value = MagicMock()
+        self.cache = InMemoryResponseCache(max_entries=2)
+        self.model = BedrockModel(
+            model_name=TestsConfig.BEDROCK_LLM_MODEL,
+            region_name="us-east-1",
+            response_cache=self.cache,
+        )
+        self.model.model.invoke = MagicMock(return_value=_chunk("answer"))
+        self.model.model.stream = MagicMock(
+            side_effect=lambda *args, **kwargs: iter([_chunk("ans"), _chunk("wer")])
+        )
+
+    def test_generate_hits_cache_on_identical_messages(self):
+        first = self.model.generate({"question": "Same question"})
+        second = self.model.generate({"question": "Same question"})
+        self.assertEqual(first, "answer")
+        self.assertEqual(second, "answer")
+        self.model.model.invoke.assert_called_once()
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_different_history_misses(self):
+        self.model.generate({"question": "Q"})
+        self.model.generate(
+            {"question": "Q", "history": [{"role": "user", "content": "earlier"}]}
+        )
+        self.assertEqual(self.model.model.invoke.call_count, 2)
+
+    def test_streaming_replays_cached_chunks(self):
+        first = list(self.model.generate_streaming({"question": "Q"}))
+        second = list(self.model.generate_streaming({"question": "Q"}))
+        self.assertEqual(first, ["ans", "wer"])
+        self.assertEqual(second, ["ans", "wer"])
+        self.model.model.stream.assert_called_once()
+        self.assertEqual(self.model.generate({"question": "Q"}), "answer")
+        self.model.model.invoke.assert_not_called()
+
+    def test_interrupted_stream_is_not_cached(self):
+        stream = self.model.generate_streaming({"question": "Q"})
+        next(stream)
+        stream.close()
+        list(self.model.generate_streaming({"question": "Q"}))
+        self.assertEqual(self.model.model.stream.call_count, 2)
+
+    def test_lru_eviction(self):
+        self.cache.set("a", ["1"])
+        self.cache.set("b", ["2"])
+        self.cache.get("a")
+        self.cache.set("c", ["3"])
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), ["1"])
+
+    def test_key_depends_on_model_name(self):
+        messages = [_chunk("hello")]
+        self.assertNotEqual(
+            ResponseCache.make_key("model-a", messages),
+            ResponseCache.make_key("model-b", messages),
+        )
+
+
+class TestSQLiteResponseCache(unittest.TestCase):
+    def test_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "responses.db")
+            SQLiteResponseCache(path).set("key", ["a", "b"])
+            cache = SQLiteResponseCache(path)
+            self.assertEqual(cache.get("key"), ["a", "b"])
+            self.assertIsNone(cache.get("missing"))
+            self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_max_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SQLiteResponseCache(os.path.join(tmp, "r.db"), max_entries=1)
+            cache.set("old", ["1"])
+            cache.set("new", ["2"])
+            self.assertIsNone(cache.get("old"))
+            self.assertEqual(cache.get("new"), ["2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import typer
+
+from raglight.cross_encoder.cross_encoder_model import CrossEncoderModel
+from raglight.cross_encoder.model_server_cross_encoder import (
+    ModelServerCrossEncoderModel,
+)
+from raglight.embeddings.embeddings_model import EmbeddingsModel
+from raglight.embeddings.model_server_embeddings import ModelServerEmbeddingsModel
+from raglight.model_server.client import ModelServerClient
+from raglight.model_server.server import (
+    EMBED_DOCUMENTS,
+    SOCKET_NAME,
+    ModelServer,
+    ModelServerError,
+    default_address,
+)
+
+
+class FakeEmbeddings(EmbeddingsModel):
+    def __init__(self) -> None:
+        super().__init__("fake-embeddings", max_tokens=128)
+        self.document_calls: List[List[str]] = []
+        self.query_calls: List[List[str]] = []
+
+    def load(self):
+        return None
+
+    def embed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        return [[float(len(t)), 0.0] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts):
+        self.query_calls.append(list(texts))
+        return [[0.0, float(len(t))] for t in texts]
+
+
+class FakeCrossEncoder(CrossEncoderModel):
+    def load(self):
+        return None
+
+    def _compute_scores(self, query, documents):
+        return [float(len(d)) for d in documents]
+
+
+class TestModelServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmp.name, "models.sock")
+        self.embeddings = FakeEmbeddings()
+        self.server = ModelServer(
+            self.embeddings,
+            FakeCrossEncoder("fake-ce"),
+            address=self.address,
+            max_wait=0.05,
+        )
+        self.server.start()
+
+    def tearDown(self):
+        self.server.close()
+        self.tmp.cleanup()
+
+    def test_embeddings_through_server(self):
+        model = ModelServerEmbeddingsModel("fake-embeddings", api_base=self.address)
+
+        self.assertEqual(model.get_max_tokens(), 128)
+        self.assertEqual(
+            model.embed_documents(["ab", "abcd"]), [[2.0, 0.0], [4.0, 0.0]]
+        )
+        self.assertEqual(model.embed_query("abc"), [0.0, 3.0])
+        self.assertEqual(model.count_tokens("abcdef"), 2)
+
+    def test_model_name_mismatch(self):
+        with self.assertRaises(ValueError):
+            ModelServerEmbeddingsModel("other-model", api_base=self.address)
+
+    def test_concurrent_requests_are_batched(self):
+        client = ModelServerClient(self.address)
+        results = {}
+        barrier = threading.Barrier(8)
+
+        def worker(i):
+            barrier.wait()
+            results[i] = client.call(EMBED_DOCUMENTS, ["x" * i, "y"])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for i in range(1, 9):
+            self.assertEqual(results[i], [[float(i), 0.0], [1.0, 0.0]])
+        self.assertLess(len(self.embeddings.document_calls), 8)
+        self.assertEqual(sum(len(c) for c in self.embeddings.document_calls), 16)
+
+    def test_cross_encoder_through_server(self):
+        model = ModelServerCrossEncoderModel("fake-ce", address=self.address)
+
+        self.assertEqual(model.score("q", ["a", "abc"]), [1.0, 3.0])
+        self.assertEqual(model.predict("q", ["a", "abc", "ab"], top_k=2), ["abc", "ab"])
+
+    def test_errors_are_returned_to_the_client(self):
+        client = ModelServerClient(self.address)
+
+        with self.assertRaises(ModelServerError):
+            client.call("unknown")
+
+        self.assertEqual(client.call(EMBED_DOCUMENTS, ["a"]), [[1.0, 0.0]])
+
+    def test_unreachable_server(self):
+        client = ModelServerClient(os.path.join(self.tmp.name, "missing.sock"))
+
+        with self.assertRaises(ModelServerError):
+            client.call(EMBED_DOCUMENTS, ["a"])
+
+    def test_socket_is_private(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.address).st_mode), 0o600)
+
+    def test_socket_owned_by_another_user_is_refused(self):
+        other_uid = os.getuid() + 1
+        with patch("raglight.model_server.server.os.getuid", return_value=other_uid):
+            with self.assertRaises(ModelServerError):
+                ModelServerClient(self.address).call(EMBED_DOCUMENTS, ["a"])
+            with self.assertRaises(ModelServerError):
+                ModelServer(self.embeddings, address=self.address).start()
+
+
+class TestModelServerSecurity(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_authkey_is_required(self):
+        address = os.path.join(self.tmp.name, "models.sock")
+        server = ModelServer(FakeEmbeddings(), address=address, authkey=b"secret")
+        server.start()
+        try:
+            with self.assertRaises(ModelServerError):
+                ModelServerClient(address, authkey=b"wrong").call(
+                    EMBED_DOCUMENTS, ["a"]
+                )
+            client = ModelServerClient(address, authkey=b"secret")
+            self.assertEqual(client.call(EMBED_DOCUMENTS, ["a"]), [[1.0, 0.0]])
+            client.close()
+        finally:
+            server.close()
+
+    def test_default_address_uses_runtime_dir(self):
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.tmp.name}):
+            self.assertEqual(
+                default_address(), os.path.join(self.tmp.name, SOCKET_NAME)
+            )
+
+    def test_default_address_fallback_is_private(self):
+        env = {k: v for k, v in os.environ.items() if k != "XDG_RUNTIME_DIR"}
+        with (
+            patch.dict(os.environ, env, clear=True),
+            patch(
+                "raglight.model_server.server.tempfile.gettempdir",
+                return_value=self.tmp.name,
+            ),
+        ):
+            address = default_address()
+            runtime_dir = os.path.dirname(address)
+            self.assertEqual(stat.S_IMODE(os.stat(runtime_dir).st_mode), 0o700)
+
+            os.chmod(runtime_dir, 0o755)
+            with self.assertRaises(ModelServerError):
+                default_address()
+
+    def test_serve_waits_for_a_live_server_not_a_stale_socket(self):
+        from raglight.cli import main
+
+        address = os.path.join(self.tmp.name, "models.sock")
+        with open(address, "w"):
+            pass
+        proc = MagicMock()
+        proc.poll.side_effect = [None, None, 1]
+        with patch("subprocess.Popen", return_value=proc), patch("time.sleep"):
+            with self.assertRaises(typer.Exit):
+                main._start_model_server(address)
+        proc.terminate.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from raglight.llm.bedrock_model import BedrockModel
+from raglight.observability.metrics import (
+    LLM_TOKENS,
+    STAGE_LATENCY,
+    MetricsRegistry,
+    timed,
+)
+from ..test_config import TestsConfig
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_render(self):
+        counter = self.registry.counter("hits_total", "Hits.", ["cache"])
+        counter.inc(cache="search")
+        counter.inc(2, cache="search")
+        text = self.registry.render()
+        self.assertIn("# TYPE hits_total counter", text)
+        self.assertIn('hits_total{cache="search"} 3', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram(
+            "latency_seconds", "Latency.", ["stage"], buckets=[0.1, 1.0]
+        )
+        histogram.observe(0.05, stage="retrieve")
+        histogram.observe(0.5, stage="retrieve")
+        histogram.observe(5.0, stage="retrieve")
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{stage="retrieve",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{stage="retrieve",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{stage="retrieve",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{stage="retrieve"} 3', text)
+        self.assertIn('latency_seconds_sum{stage="retrieve"} 5.55', text)
+
+    def test_same_name_returns_same_metric(self):
+        first = self.registry.gauge("depth", "Depth.")
+        self.assertIs(first, self.registry.gauge("depth", "Depth."))
+        with self.assertRaises(ValueError):
+            self.registry.counter("depth", "Depth.")
+
+    def test_wrong_labels_raise(self):
+        counter = self.registry.counter("c_total", "C.", ["route"])
+        with self.assertRaises(ValueError):
+            counter.inc(stage="x")
+
+    def test_label_values_are_escaped(self):
+        self.registry.counter("c_total", "C.", ["name"]).inc(name='a"b')
+        self.assertIn('c_total{name="a\\"b"} 1', self.registry.render())
+
+
+class TestTimed(unittest.TestCase):
+    def test_sync_and_async_functions(self):
+        @timed("test_sync_stage")
+        def sync_step(x):
+            return x + 1
+
+        @timed("test_async_stage")
+        async def async_step(x):
+            return x * 2
+
+        self.assertEqual(sync_step(1), 2)
+        self.assertEqual(asyncio.run(async_step(2)), 4)
+        self.assertEqual(sync_step.__name__, "sync_step")
+        self.assertEqual(STAGE_LATENCY.count(stage="test_sync_stage"), 1)
+        self.assertEqual(STAGE_LATENCY.count(stage="test_async_stage"), 1)
+
+    def test_failures_are_timed(self):
+        @timed("test_failing_stage")
+        def failing():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            failing()
+        self.assertEqual(STAGE_LATENCY.count(stage="test_failing_stage"), 1)
+
+
+class TestLLMTokens(unittest.TestCase):
+    @patch("raglight.llm.bedrock_model.ChatBedrock")
+    def test_usage_metadata_is_counted(self, mock_chat_bedrock: MagicMock):
+        mock_chat_bedrock.return_value = MagicMock()
+        model = BedrockModel(
+            model_name=TestsConfig.BEDROCK_LLM_MODEL, region_name="us-east-1"
+        )
+        response = MagicMock(content="answer")
+        response.usage_metadata = {"input_tokens": 12, "output_tokens": 3}
+        model.model.invoke = MagicMock(return_value=response)
+        before = LLM_TOKENS.value(model=model.model_name, kind="output")
+
+        model.generate({"question": "Q"})
+
+        self.assertEqual(
+            LLM_TOKENS.value(model=model.model_name, kind="output"), before + 3
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from langchain_core.documents import Document
+
+from raglight.rag.context_packer import ContextPacker
+
+
+def _word_count(text: str) -> int:
+    return len(text.split())
+
+
+class TestContextPacker(unittest.TestCase):
+    def test_keeps_everything_without_budget(self):
+        docs = [Document(page_content="alpha beta"), Document(page_content="gamma")]
+        self.assertEqual(ContextPacker().pack(docs), ["alpha beta", "gamma"])
+
+    def test_respects_token_budget(self):
+        docs = [
+            Document(page_content=" ".join(f"a{i}" for i in range(40))),
+            Document(page_content=" ".join(f"b{i}" for i in range(40))),
+        ]
+        packer = ContextPacker(max_tokens=50, token_counter=_word_count)
+        texts = packer.pack(docs)
+        self.assertLessEqual(sum(_word_count(t) for t in texts), 50)
+        self.assertEqual(texts[0], docs[0].page_content)
+
+    def test_drops_near_duplicates(self):
+        text = "the quick brown fox jumps over the lazy dog near the river bank"
+        docs = [Document(page_content=text), Document(page_content=text + " today")]
+        texts = ContextPacker(duplicate_threshold=0.8).pack(docs)
+        self.assertEqual(texts, [text])
+
+    def test_trims_chunk_overlap_from_same_source(self):
+        overlap = "shared sentence between the two chunks. "
+        first = Document(
+            page_content="Start of the file. " + overlap, metadata={"source": "f"}
+        )
+        second = Document(
+            page_content=overlap + "End of the file.", metadata={"source": "f"}
+        )
+        texts = ContextPacker().pack([first, second])
+        self.assertEqual(texts[1], "End of the file.")
+
+    def test_orders_by_rerank_score(self):
+        docs = [
+            Document(page_content="low", metadata={"rerank_score": 0.1}),
+            Document(page_content="high", metadata={"rerank_score": 0.9}),
+        ]
+        self.assertEqual(ContextPacker().pack(docs), ["high", "low"])
+
+
+if __name__ == "__main__":
+    unittest.main()
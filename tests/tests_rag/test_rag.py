@@ -1,10 +1,22 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from langchain_core.documents import Document
 
+from raglight.cross_encoder.cross_encoder_model import CrossEncoderModel
 from raglight.rag.rag import RAG
 
 
+class _NumberCrossEncoder(CrossEncoderModel):
+    """Scores documents by the number in their text: "doc 7" -> 7.0"""
+
+    def load(self):
+        return MagicMock()
+
+    def _compute_scores(self, query, documents):
+        self.model(documents)
+        return [float(doc.split()[-1]) for doc in documents]
+
+
 def _make_rag(llm=None, reformulation=False):
     embedding_model = MagicMock()
     embedding_model.get_model.return_value = MagicMock()
@@ -96,5 +108,119 @@ class TestRAGGenerateStreaming(unittest.TestCase):
         self.assertEqual(history[1], {"role": "assistant", "content": full_answer})
 
 
+class TestRAGAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.llm = MagicMock()
+        self.llm.agenerate = AsyncMock(return_value="RAGLight is a Python library.")
+        self.rag = _make_rag(llm=self.llm, reformulation=True)
+        self.rag.vector_store.asimilarity_search = AsyncMock(
+            return_value=[Document(page_content="RAGLight is a RAG library.")]
+        )
+
+    async def test_agenerate_uses_async_paths(self):
+        answer = await self.rag.agenerate("What is RAGLight?", session_id="s1")
+        self.assertEqual(answer, "RAGLight is a Python library.")
+        self.rag.vector_store.asimilarity_search.assert_awaited_once()
+        self.rag.vector_store.similarity_search.assert_not_called()
+        self.llm.generate.assert_not_called()
+        self.assertEqual(len(self.rag.session_store.get_history("s1")), 2)
+
+    async def test_agenerate_reformulates_with_history(self):
+        await self.rag.agenerate("First question")
+        await self.rag.agenerate("And then?")
+        # Second turn: one reformulation call plus one generation call.
+        self.assertEqual(self.llm.agenerate.await_count, 3)
+
+    async def test_agenerate_streaming_yields_chunks(self):
+        async def stream(input, callbacks=None):
+            for chunk in ["RAGLight", " rocks"]:
+                yield chunk
+
+        self.llm.agenerate_streaming = stream
+        chunks = [c async for c in self.rag.agenerate_streaming("What is RAGLight?")]
+        self.assertEqual(chunks, ["RAGLight", " rocks"])
+        self.assertEqual(self.rag.state["history"][-1]["content"], "RAGLight rocks")
+
+
+class TestRAGRerank(unittest.TestCase):
+    def setUp(self):
+        self.cross_encoder = _NumberCrossEncoder("numbers", cache_size=0)
+        self.rag = _make_rag()
+        self.rag.cross_encoder = self.cross_encoder
+        self.rag.k = 8  # keeps int(k / 4) == 2 documents
+        self.docs = [
+            Document(page_content=f"doc {i}", metadata={"source": f"s{i}"})
+            for i in (5, 9, 1, 7, 0, 2, 3, 4)
+        ]
+
+    def test_rerank_keeps_best_documents_with_metadata(self):
+        result = self.rag._rerank({"question": "q", "context": self.docs})
+        self.assertEqual(
+            [d.page_content for d in result["context"]], ["doc 9", "doc 7"]
+        )
+        self.assertEqual(result["context"][0].id, self.docs[1].id)
+        self.assertEqual(result["context"][0].metadata["source"], "s9")
+        self.assertEqual(result["context"][0].metadata["rerank_score"], 9.0)
+        # Retrieved documents may be shared with caches: they are left untouched.
+        self.assertNotIn("rerank_score", self.docs[1].metadata)
+
+    def test_rerank_stops_early_when_top_k_is_stable(self):
+        self.rag.rerank_batch_size = 2
+        self.rag.rerank_patience = 1
+        self.rag._rerank({"question": "q", "context": self.docs})
+        # Batch 3 ("doc 0", "doc 2") leaves the top-2 unchanged, so batch 4 is skipped.
+        self.assertEqual(self.cross_encoder.model.call_count, 3)
+
+    def test_rerank_scores_every_batch_by_default(self):
+        self.rag.rerank_batch_size = 2
+        self.rag._rerank({"question": "q", "context": self.docs})
+        self.assertEqual(self.cross_encoder.model.call_count, 4)
+
+    def test_rerank_applies_min_score(self):
+        self.rag.rerank_min_score = 8.0
+        result = self.rag._rerank({"question": "q", "context": self.docs})
+        self.assertEqual([d.page_content for d in result["context"]], ["doc 9"])
+
+    def test_rerank_candidates_prefilter(self):
+        self.rag.rerank_candidates = 2
+        result = self.rag._rerank({"question": "q", "context": self.docs})
+        self.assertEqual(
+            [d.page_content for d in result["context"]], ["doc 9", "doc 5"]
+        )
+
+    def test_rerank_with_predict_only_cross_encoder(self):
+        class _LengthPredictor(CrossEncoderModel):
+            def load(self):
+                return None
+
+            def predict(self, query, documents, top_k):
+                return sorted(documents, reverse=True)[:top_k]
+
+        self.rag.cross_encoder = _LengthPredictor("predict-only")
+        result = self.rag._rerank({"question": "q", "context": self.docs})
+
+        self.assertEqual(
+            [d.page_content for d in result["context"]], ["doc 9", "doc 7"]
+        )
+        self.assertNotIn("rerank_score", result["context"][0].metadata)
+
+    def test_scorer_errors_do_not_fall_back_to_predict(self):
+        self.cross_encoder.model.side_effect = NotImplementedError("no GPU kernel")
+
+        with patch.object(_NumberCrossEncoder, "predict") as predict:
+            result = self.rag._rerank({"question": "q", "context": self.docs})
+
+        predict.assert_not_called()
+        self.assertEqual(result["context"], self.docs)
+
+    def test_cross_encoder_without_scoring_or_predict(self):
+        class _Incomplete(CrossEncoderModel):
+            def load(self):
+                return None
+
+        with self.assertRaises(TypeError):
+            _Incomplete("incomplete")
+
+
 if __name__ == "__main__":
     unittest.main()
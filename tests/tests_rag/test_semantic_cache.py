@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import MagicMock
+
+from raglight.rag.semantic_cache import SemanticCache
+from .test_rag import _make_rag
+
+VECTORS = {
+    "What is RAGLight?": [1.0, 0.0, 0.0],
+    "what is raglight": [0.99, 0.05, 0.0],
+    "How do I install it?": [0.0, 1.0, 0.0],
+}
+
+
+def _make_cache(**kwargs) -> SemanticCache:
+    embeddings = MagicMock()
+    embeddings.embed_query.side_effect = lambda q: VECTORS[q]
+    return SemanticCache(embeddings, **kwargs)
+
+
+class TestSemanticCache(unittest.TestCase):
+    def test_hit_on_similar_question(self):
+        cache = _make_cache(similarity_threshold=0.95)
+        cache.store(cache.embed("What is RAGLight?"), "What is RAGLight?", "A library.")
+        self.assertEqual(cache.lookup(cache.embed("what is raglight")), "A library.")
+        self.assertIsNone(cache.lookup(cache.embed("How do I install it?")))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_miss_when_index_generation_changed(self):
+        cache = _make_cache()
+        vector = cache.embed("What is RAGLight?")
+        cache.store(vector, "What is RAGLight?", "A library.", index_generation=1)
+        self.assertIsNone(cache.lookup(vector, index_generation=2))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_expired_entries_are_not_served(self):
+        cache = _make_cache(ttl=0)
+        vector = cache.embed("What is RAGLight?")
+        cache.store(vector, "What is RAGLight?", "A library.")
+        self.assertIsNone(cache.lookup(vector))
+
+    def test_size_is_bounded(self):
+        cache = _make_cache(max_entries=1)
+        for question in ("What is RAGLight?", "How do I install it?"):
+            cache.store(cache.embed(question), question, "answer")
+        self.assertEqual(cache.stats()["size"], 1)
+        self.assertIsNone(cache.lookup(cache.embed("What is RAGLight?")))
+
+
+class TestRAGWithSemanticCache(unittest.TestCase):
+    def setUp(self):
+        self.rag = _make_rag()
+        self.rag.semantic_cache = _make_cache()
+        self.rag.vector_store.index_generation = 0
+
+    def test_second_similar_question_skips_pipeline(self):
+        first = self.rag.generate("What is RAGLight?")
+        second = self.rag.generate("what is raglight")
+        self.assertEqual(first, second)
+        self.rag.vector_store.similarity_search.assert_called_once()
+        self.rag.llm.generate.assert_called_once()
+        self.assertEqual(len(self.rag.state["history"]), 4)
+
+    def test_streaming_hit_yields_cached_answer(self):
+        answer = self.rag.generate("What is RAGLight?")
+        chunks = list(self.rag.generate_streaming("what is raglight"))
+        self.assertEqual(chunks, [answer])
+        self.rag.llm.generate_streaming.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from raglight.rag.session_store import InMemorySessionStore, SQLiteSessionStore
+from .test_rag import _make_rag
+
+
+def _turn(question: str, answer: str):
+    return [
+        {"role": "user", "content": question},
+        {"role": "assistant", "content": answer},
+    ]
+
+
+class TestInMemorySessionStore(unittest.TestCase):
+    def test_sessions_are_isolated(self):
+        store = InMemorySessionStore()
+        store.append("a", _turn("qa", "ra"))
+        store.append("b", _turn("qb", "rb"))
+        self.assertEqual(store.get_history("a"), _turn("qa", "ra"))
+        self.assertEqual(store.get_history("b"), _turn("qb", "rb"))
+        self.assertEqual(store.get_history("unknown"), [])
+
+    def test_max_history_and_max_sessions(self):
+        store = InMemorySessionStore(max_history=2, max_sessions=2)
+        store.append("a", _turn("q1", "r1"))
+        store.append("a", _turn("q2", "r2"))
+        self.assertEqual(store.get_history("a"), _turn("q2", "r2"))
+        store.append("b", _turn("q", "r"))
+        store.append("c", _turn("q", "r"))
+        self.assertEqual(store.get_history("a"), [])
+        self.assertEqual(len(store), 2)
+
+
+class TestSQLiteSessionStore(unittest.TestCase):
+    def test_persists_and_trims(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sessions.db")
+            SQLiteSessionStore(path, max_history=2).append("a", _turn("q1", "r1"))
+            store = SQLiteSessionStore(path, max_history=2)
+            store.append("a", _turn("q2", "r2"))
+            self.assertEqual(store.get_history("a"), _turn("q2", "r2"))
+            store.delete("a")
+            self.assertEqual(store.get_history("a"), [])
+
+
+class TestRAGSessions(unittest.TestCase):
+    def setUp(self):
+        self.rag = _make_rag()
+
+    def test_session_history_is_separate(self):
+        self.rag.generate("Question A", session_id="alice")
+        self.rag.generate("Question B", session_id="bob")
+        alice = self.rag.session_store.get_history("alice")
+        self.assertEqual(alice[0], {"role": "user", "content": "Question A"})
+        self.assertEqual(len(alice), 2)
+        self.assertEqual(len(self.rag.session_store.get_history("bob")), 2)
+        self.assertEqual(self.rag.state["history"], [])
+
+    def test_session_history_reaches_llm(self):
+        self.rag.generate("First", session_id="alice")
+        self.rag.generate("Second", session_id="alice")
+        history = self.rag.llm.generate.call_args[0][0]["history"]
+        self.assertEqual(history[0], {"role": "user", "content": "First"})
+
+    def test_streaming_uses_session(self):
+        self.rag.llm.generate_streaming.return_value = iter(["Hi", "!"])
+        list(self.rag.generate_streaming("Hello", session_id="carol"))
+        self.assertEqual(
+            self.rag.session_store.get_history("carol"), _turn("Hello", "Hi!")
+        )
+
+    def test_concurrent_sessions(self):
+        sessions = [f"user-{i}" for i in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(
+                pool.map(
+                    lambda sid: [
+                        self.rag.generate(f"{sid} q{n}", session_id=sid)
+                        for n in range(3)
+                    ],
+                    sessions,
+                )
+            )
+        for sid in sessions:
+            history = self.rag.session_store.get_history(sid)
+            questions = [msg["content"] for msg in history if msg["role"] == "user"]
+            self.assertEqual(questions, [f"{sid} q{n}" for n in range(3)])
+
+    def test_no_session_is_stateless_without_shared_history(self):
+        self.rag.shared_history = False
+        self.rag.generate("First")
+        self.rag.generate("Second")
+        self.assertEqual(self.rag.llm.generate.call_args[0][0]["history"], [])
+        self.assertEqual(self.rag.state["history"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
 import os
+import tempfile
 import unittest
-from raglight.vectorstore.chroma import ChromaVS
+from unittest.mock import MagicMock, patch
+
+import chromadb
+from langchain_core.documents import Document
+from raglight.vectorstore.chroma import ChromaVS, _distance_score
 from raglight.embeddings.huggingface_embeddings import HuggingfaceEmbeddingsModel
 from ..test_config import TestsConfig
 
@@ -25,5 +30,241 @@ class TestVectorStore(unittest.TestCase):
         self.assertEqual(True, True, "Embedding should be added to the store.")
 
 
+def _make_embeddings():
+    embeddings = MagicMock()
+    embeddings.embed_query.side_effect = lambda text: [1.0, float(len(text)), 0.5, 0.0]
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [1.0, float(len(t)), 0.5, 0.0] for t in texts
+    ]
+    embeddings.split_to_fit.side_effect = lambda text: [text]
+    return embeddings
+
+
+class TestChromaPrefixSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        return ChromaVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+            **kwargs,
+        )
+
+    def test_two_stage_search(self):
+        vs = self._store(search_dimensions=2)
+        vs.add_documents(
+            [
+                Document(page_content=t, metadata={"source": t})
+                for t in ("a", "abc", "abcdef")
+            ]
+        )
+
+        self.assertEqual(vs.collection_prefix.count(), 3)
+        self.assertEqual(vs.similarity_search("abc", k=1)[0].page_content, "abc")
+
+    def test_prefix_collection_is_backfilled(self):
+        self._store().add_documents(
+            [Document(page_content="abc", metadata={"source": "abc"})]
+        )
+
+        vs = self._store(search_dimensions=2)
+
+        self.assertEqual(vs.collection_prefix.count(), 1)
+        self.assertEqual(vs.similarity_search("abc", k=1)[0].page_content, "abc")
+
+    def test_rescoring_uses_the_collection_space(self):
+        texts = ["a", "abc", "abcdef", "abcdefghij"]
+        for space in ("l2", "cosine", "ip"):
+            with self.subTest(space=space):
+                name = f"space_{space}"
+                chromadb.PersistentClient(path=self.tmp.name).get_or_create_collection(
+                    name=name, metadata={"hnsw:space": space}
+                )
+                vs = ChromaVS(
+                    collection_name=name,
+                    embeddings_model=_make_embeddings(),
+                    persist_directory=self.tmp.name,
+                    search_dimensions=2,
+                    prefix_oversampling=4,
+                )
+                vs.add_documents(
+                    [Document(page_content=t, metadata={"source": t}) for t in texts]
+                )
+                query = vs._embed_query("abcd")
+
+                two_stage = vs._two_stage_query(query, 4, None)
+                exact = vs._query_embedding(vs.collection, query, 4, None)
+
+                self.assertEqual(
+                    [doc.id for doc, _ in two_stage], [doc.id for doc, _ in exact]
+                )
+                for (_, score), (_, expected) in zip(two_stage, exact):
+                    self.assertAlmostEqual(score, expected, places=4)
+
+
+class TestChromaScores(unittest.TestCase):
+    def test_scores_decrease_with_distance(self):
+        for space, distances in (
+            ("l2", [0.0, 0.5, 4.0]),
+            ("cosine", [0.0, 0.5, 2.0]),
+            # Inner-product distances (1 - dot product) can be negative.
+            ("ip", [-3.0, -1.0, -0.5, 0.0, 1.5]),
+        ):
+            with self.subTest(space=space):
+                scores = [_distance_score(d, space) for d in distances]
+                self.assertEqual(scores, sorted(scores, reverse=True))
+                self.assertEqual(len(set(scores)), len(scores))
+
+
+class TestChromaBM25Rebuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        texts = [f"document number {i}" for i in range(5)]
+        store = ChromaVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+        )
+        store.add_documents(
+            [Document(page_content=t, metadata={"source": t}) for t in texts]
+        )
+        self.bm25_path = store._bm25_path()
+        self.checkpoint_path = store._bm25_checkpoint_path()
+        os.remove(self.bm25_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _reopen(self):
+        with patch("raglight.vectorstore.chroma.BM25_REBUILD_PAGE_SIZE", 2):
+            return ChromaVS(
+                collection_name="test",
+                embeddings_model=_make_embeddings(),
+                persist_directory=self.tmp.name,
+                search_type="bm25",
+            )
+
+    def test_rebuild_reads_every_page(self):
+        vs = self._reopen()
+
+        self.assertEqual(len(vs._bm25.corpus), 5)
+        self.assertTrue(self.bm25_path.exists())
+        self.assertFalse(self.checkpoint_path.exists())
+        self.assertEqual(
+            vs.similarity_search("number 3", k=1)[0].page_content, "document number 3"
+        )
+
+    def test_rebuild_resumes_from_checkpoint(self):
+        self.checkpoint_path.write_text(
+            '{"total": 5}\n'
+            '{"cursor": 2, "texts": ["checkpointed one", "checkpointed two"]}\n'
+            '{"cursor": 4, "te',
+            encoding="utf-8",
+        )
+
+        vs = self._reopen()
+
+        self.assertEqual(vs._bm25.corpus[:2], ["checkpointed one", "checkpointed two"])
+        self.assertEqual(len(vs._bm25.corpus), 5)
+        self.assertFalse(self.checkpoint_path.exists())
+
+    def test_rebuild_restarts_when_the_collection_changed(self):
+        # Offsets from a 4-document collection would skip or repeat documents.
+        self.checkpoint_path.write_text(
+            '{"total": 4}\n'
+            '{"cursor": 2, "texts": ["checkpointed one", "checkpointed two"]}\n',
+            encoding="utf-8",
+        )
+
+        vs = self._reopen()
+
+        self.assertEqual(
+            sorted(vs._bm25.corpus), [f"document number {i}" for i in range(5)]
+        )
+        self.assertFalse(self.checkpoint_path.exists())
+
+
+class TestChromaQueryPath(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.vs = ChromaVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+        )
+        self.vs.add_documents([Document(page_content="abc", metadata={"source": "a"})])
+        self.vs.client.get_or_create_collection(name="other", embedding_function=None)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_query_is_embedded_once(self):
+        self.vs.similarity_search("abc", k=1)
+        self.vs.similarity_search_class("abc", k=1)
+
+        self.vs.embeddings_model.embed_query.assert_called_once_with("abc")
+        self.vs.embeddings_model.embed_documents.assert_called_once_with(["abc"])
+
+    def test_collection_handles_are_cached(self):
+        with patch.object(
+            self.vs.client, "get_collection", wraps=self.vs.client.get_collection
+        ) as get_collection:
+            for _ in range(3):
+                self.vs.similarity_search("abc", k=1, collection_name="other")
+
+        get_collection.assert_called_once()
+
+    def test_missing_collection_is_not_created(self):
+        docs = self.vs.similarity_search("abc", k=1, collection_name="missing")
+
+        self.assertEqual(docs, [])
+        self.assertNotIn("missing", self.vs.get_available_collections())
+
+
+class TestChromaBulkWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        return ChromaVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+            **kwargs,
+        )
+
+    def _docs(self, n):
+        return [
+            Document(page_content=f"doc {i}", metadata={"source": str(i)})
+            for i in range(n)
+        ]
+
+    def test_writes_in_batches_with_precomputed_embeddings(self):
+        vs = self._store(write_batch_size=2, search_dimensions=2)
+
+        with patch.object(vs.collection, "add", wraps=vs.collection.add) as add:
+            vs.add_documents(self._docs(5))
+
+        self.assertEqual([len(c.kwargs["ids"]) for c in add.call_args_list], [2, 2, 1])
+        self.assertTrue(all(c.kwargs["embeddings"] for c in add.call_args_list))
+        self.assertEqual(vs.embeddings_model.embed_documents.call_count, 3)
+        self.assertEqual(vs.collection.count(), 5)
+        self.assertEqual(vs.collection_prefix.count(), 5)
+
+    def test_batch_size_is_capped_by_the_client(self):
+        vs = self._store(write_batch_size=10)
+
+        with patch.object(vs.client, "get_max_batch_size", return_value=3):
+            self.assertEqual(vs._batch_size(), 3)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,11 @@ import unittest
 from unittest.mock import MagicMock, patch
 from langchain_core.documents import Document
 
-from raglight.vectorstore.bm25_index import BM25Index
+from raglight.vectorstore.bm25_index import (
+    BM25Index,
+    sparse_document_vector,
+    sparse_query_vector,
+)
 from raglight.vectorstore.chroma import ChromaVS
 
 
@@ -59,6 +63,23 @@ class TestBM25Index(unittest.TestCase):
             self.assertEqual(len(results), 1)
 
 
+class TestSparseVectors(unittest.TestCase):
+    def test_document_vector_saturates_term_frequency(self):
+        indices, values = sparse_document_vector("fox fox fox dog")
+        weights = dict(zip(indices, values))
+        fox, dog = sparse_query_vector("fox dog")[0]
+
+        self.assertEqual(len(indices), 2)
+        self.assertGreater(weights[fox], weights[dog])
+        self.assertLess(weights[fox], 3 * weights[dog])
+
+    def test_query_vector_deduplicates_terms(self):
+        indices, values = sparse_query_vector("Fox fox DOG")
+
+        self.assertEqual(indices, sparse_query_vector("fox dog")[0])
+        self.assertEqual(values, [1.0, 1.0])
+
+
 class TestRRFFusion(unittest.TestCase):
     def test_rrf_deduplicates_and_ranks(self):
         vs = _make_chroma("semantic")
@@ -125,6 +146,36 @@ class TestHybridSearchMode(unittest.TestCase):
         self.assertEqual(len(contents), len(set(contents)))
 
 
+class TestSearchWithScores(unittest.TestCase):
+    def test_semantic_scores_from_chroma_distances(self):
+        vs = _make_chroma("semantic")
+        vs.collection.query.return_value = {
+            "ids": [["a", "b"]],
+            "documents": [["first", "second"]],
+            "metadatas": [[{}, {}]],
+            "distances": [[0.0, 1.0]],
+        }
+        results = vs.similarity_search_with_scores("query", k=2)
+        self.assertEqual([doc.id for doc, _ in results], ["a", "b"])
+        self.assertEqual([score for _, score in results], [1.0, 0.5])
+
+    def test_search_type_override(self):
+        vs = _make_chroma("semantic")
+        vs._bm25.add_documents(
+            ["cat sat on the mat", "dog ran in the park", "bird on a wire"]
+        )
+        vs._query_collection_with_scores = MagicMock()
+        results = vs.similarity_search_with_scores("cat", k=1, search_type="bm25")
+        self.assertEqual(results[0][0].page_content, "cat sat on the mat")
+        self.assertGreater(results[0][1], 0)
+        vs._query_collection_with_scores.assert_not_called()
+
+    def test_bm25_rejects_other_collections(self):
+        vs = _make_chroma("bm25")
+        with self.assertRaises(ValueError):
+            vs.similarity_search_with_scores("cat", collection_name="other")
+
+
 class TestSemanticModeUnchanged(unittest.TestCase):
     def test_semantic_mode_delegates_to_query_collection(self):
         vs = _make_chroma("semantic")
@@ -0,0 +1,246 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from langchain_core.documents import Document
+
+from raglight.vectorstore import local
+from raglight.vectorstore.local import HNSW_FILE, LocalCollection, LocalVS
+
+# Toy embeddings: each known word is one axis, so similarity reflects shared words.
+VOCABULARY = ["cat", "dog", "fish", "bird", "tree"]
+
+
+def _embed(text):
+    words = text.lower().split()
+    return [float(words.count(word)) + 0.01 for word in VOCABULARY]
+
+
+def _append_rows(directory: str, writer: int, batches: int) -> None:
+    collection = LocalCollection(Path(directory), index_type="flat", max_segments=4)
+    for batch in range(batches):
+        vectors = np.eye(4, dtype=np.float32)[[writer % 4]]
+        collection.add(vectors, [f"{writer}-{batch}"], [{"writer": writer}])
+
+
+def _make_embeddings():
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [_embed(t) for t in texts]
+    embeddings.embed_query.side_effect = _embed
+    embeddings.split_to_fit.side_effect = lambda text: [text]
+    return embeddings
+
+
+class TestLocalVS(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.embeddings = _make_embeddings()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        return LocalVS(
+            collection_name="test",
+            embeddings_model=self.embeddings,
+            persist_directory=self.tmp.name,
+            **kwargs,
+        )
+
+    def _add_animals(self, vs):
+        vs.add_documents(
+            [
+                Document(page_content="cat cat", metadata={"source": "a.txt"}),
+                Document(page_content="dog", metadata={"source": "b.txt"}),
+            ]
+        )
+        vs.add_documents(
+            [Document(page_content="fish dog", metadata={"source": "a.txt", "page": 2})]
+        )
+
+    def test_semantic_search_ranks_by_similarity(self):
+        vs = self._store()
+        self._add_animals(vs)
+
+        results = vs.similarity_search_with_scores("dog", k=2)
+
+        self.assertEqual([doc.page_content for doc, _ in results], ["dog", "fish dog"])
+        self.assertAlmostEqual(results[0][1], 1.0, places=3)
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual(results[0][0].metadata, {"source": "b.txt"})
+
+    def test_filter_matches_metadata(self):
+        vs = self._store()
+        self._add_animals(vs)
+
+        docs = vs.similarity_search("dog", k=5, filter={"source": "a.txt"})
+        self.assertEqual([d.page_content for d in docs], ["fish dog", "cat cat"])
+        self.assertEqual(docs[0].metadata, {"source": "a.txt", "page": 2})
+        self.assertEqual(vs.similarity_search("dog", filter={"missing": "x"}), [])
+
+    def test_reopen_memory_maps_existing_segments(self):
+        self._add_animals(self._store())
+
+        vs = self._store()
+
+        self.assertEqual(vs.similarity_search("cat", k=1)[0].page_content, "cat cat")
+        segment = vs._collection("test").segments[0]
+        self.assertIsInstance(segment.vectors, np.memmap)
+
+    def test_sees_segments_written_by_another_instance(self):
+        reader = self._store()
+        self.assertEqual(reader.similarity_search("bird"), [])
+
+        self._store().add_documents([Document(page_content="bird", metadata={})])
+
+        self.assertEqual(reader.similarity_search("bird", k=1)[0].page_content, "bird")
+
+    def test_compaction_keeps_documents_in_order(self):
+        vs = self._store(max_segments=4)
+        for word in VOCABULARY:
+            vs.add_documents([Document(page_content=word, metadata={"w": word})])
+
+        collection = vs._collection("test")
+        self.assertLessEqual(len(collection.segments), 4)
+        self.assertEqual(collection.texts(), VOCABULARY)
+        self.assertEqual(vs.similarity_search("tree", k=1)[0].metadata, {"w": "tree"})
+
+    def test_compaction_leaves_large_segments_alone(self):
+        collection = LocalCollection(
+            Path(self.tmp.name) / "tiers", index_type="flat", max_segments=8
+        )
+        written = []
+        write = local._Segment.write
+
+        def counting_write(directory, name, vectors, *args):
+            written.append(len(vectors))
+            return write(directory, name, vectors, *args)
+
+        with patch.object(local._Segment, "write", staticmethod(counting_write)):
+            for n in range(200):
+                collection.add(np.ones((1, 4), dtype=np.float32), [str(n)], [{}])
+
+        self.assertLessEqual(len(collection.segments), 8)
+        self.assertEqual(collection.texts(), [str(n) for n in range(200)])
+        # Merging the newest segments every time rewrote ~30x the rows written.
+        self.assertLess(sum(written), 200 * 6)
+
+    def test_hnsw_index_matches_exact_search(self):
+        vs = self._store(index_type="hnsw")
+        self._add_animals(vs)
+
+        collection = vs._collection("test")
+        self.assertIsNotNone(collection._hnsw)
+        self.assertEqual(
+            [d.page_content for d in vs.similarity_search("dog", k=2)],
+            ["dog", "fish dog"],
+        )
+        reopened = self._store(index_type="hnsw")
+        self.assertEqual(reopened._collection("test")._hnsw_count, 3)
+
+    def test_quantized_search_rescores_with_full_vectors(self):
+        for quantization in ("scalar", "binary"):
+            with self.subTest(quantization=quantization):
+                vs = LocalVS(
+                    collection_name=quantization,
+                    embeddings_model=self.embeddings,
+                    persist_directory=self.tmp.name,
+                    quantization=quantization,
+                    oversampling=3,
+                )
+                self._add_animals(vs)
+
+                results = vs.similarity_search_with_scores("dog", k=2)
+
+                self.assertEqual(
+                    [doc.page_content for doc, _ in results], ["dog", "fish dog"]
+                )
+                # Scores are the exact cosine similarities, not the approximate ones.
+                self.assertAlmostEqual(results[0][1], 1.0, places=5)
+                segment = vs._collection(quantization).segments[0]
+                codes = segment.codes(quantization)["codes"]
+                self.assertEqual(
+                    codes.dtype, np.int8 if quantization == "scalar" else np.uint8
+                )
+
+    def test_prefix_search_rescores_with_full_vectors(self):
+        vs = self._store(search_dimensions=2, prefix_oversampling=2)
+        self._add_animals(vs)
+
+        results = vs.similarity_search_with_scores("fish dog", k=1)
+
+        self.assertEqual(results[0][0].page_content, "fish dog")
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+
+    def test_quantization_is_not_combined_with_hnsw(self):
+        with self.assertRaises(ValueError):
+            self._store(index_type="hnsw", quantization="binary")
+
+    def test_bm25_and_hybrid(self):
+        self._add_animals(self._store())
+
+        vs = self._store(search_type="hybrid")
+
+        self.assertEqual(vs._bm25.corpus, ["cat cat", "dog", "fish dog"])
+        self.assertEqual(vs.similarity_search("fish", k=1)[0].page_content, "fish dog")
+
+    def test_class_documents_and_collections(self):
+        vs = self._store()
+        self._add_animals(vs)
+        vs.add_class_documents([Document(page_content="class Tree", metadata={})])
+
+        self.assertEqual(vs.get_available_collections(), ["test", "test_classes"])
+        self.assertEqual(
+            vs.similarity_search_class("tree", k=1)[0].page_content, "class Tree"
+        )
+
+    def test_dimension_mismatch(self):
+        vs = self._store()
+        self._add_animals(vs)
+        self.embeddings.embed_documents.side_effect = lambda texts: [
+            [1.0] for _ in texts
+        ]
+
+        with self.assertRaises(ValueError):
+            vs.add_documents([Document(page_content="x", metadata={})])
+
+    @unittest.skipIf(local.fcntl is None, "needs fcntl")
+    def test_concurrent_writer_processes(self):
+        directory = os.path.join(self.tmp.name, "shared")
+        context = multiprocessing.get_context("fork")
+        writers = [
+            context.Process(target=_append_rows, args=(directory, writer, 10))
+            for writer in range(4)
+        ]
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+
+        texts = LocalCollection(Path(directory)).texts()
+        self.assertEqual(
+            sorted(texts), sorted(f"{w}-{b}" for w in range(4) for b in range(10))
+        )
+
+    def test_readers_never_write_the_hnsw_graph(self):
+        self._add_animals(self._store(index_type="flat"))
+        collection_dir = os.path.join(self.tmp.name, "test")
+
+        reader = self._store(index_type="hnsw")
+        self.assertEqual(reader.similarity_search("dog", k=1)[0].page_content, "dog")
+        self.assertFalse(os.path.exists(os.path.join(collection_dir, HNSW_FILE)))
+
+        reader._collection("test").build_index()
+        self.assertTrue(os.path.exists(os.path.join(collection_dir, HNSW_FILE)))
+        self.assertEqual(
+            self._store(index_type="hnsw")._collection("test")._hnsw_count, 3
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,369 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.documents import Document
+
+from raglight.vectorstore.qdrant import QdrantVS
+from raglight.vectorstore.vector_store import FILTER_CONDITIONS
+
+
+def _make_embeddings():
+    embeddings = MagicMock()
+    embeddings.embed_query.side_effect = lambda text: [1.0, float(len(text)), 0.5, 0.0]
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [1.0, float(len(t)), 0.5, 0.0] for t in texts
+    ]
+    embeddings.split_to_fit.side_effect = lambda text: [text]
+    return embeddings
+
+
+class TestQdrantQuantization(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        return QdrantVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+            **kwargs,
+        )
+
+    def _created_with(self, vs):
+        with patch.object(vs.client, "create_collection") as create_collection:
+            vs._ensure_collection("other")
+        return create_collection.call_args.kwargs
+
+    def test_collection_created_with_scalar_quantization(self):
+        vs = self._store(quantization="scalar", on_disk=True)
+
+        kwargs = self._created_with(vs)
+
+        self.assertEqual(kwargs["quantization_config"].scalar.type, "int8")
+        self.assertTrue(kwargs["quantization_config"].scalar.always_ram)
+        self.assertTrue(kwargs["vectors_config"].on_disk)
+
+    def test_collection_created_with_binary_quantization(self):
+        vs = self._store(quantization="binary")
+
+        kwargs = self._created_with(vs)
+
+        self.assertTrue(kwargs["quantization_config"].binary.always_ram)
+        self.assertFalse(kwargs["vectors_config"].on_disk)
+
+    def test_search_requests_rescoring(self):
+        vs = self._store(quantization="scalar", oversampling=3.0)
+        vs.add_documents([Document(page_content="hello", metadata={})])
+
+        with patch.object(
+            vs.client, "query_points", wraps=vs.client.query_points
+        ) as query_points:
+            docs = vs.similarity_search("hello", k=1)
+
+        self.assertEqual(docs[0].page_content, "hello")
+        params = query_points.call_args.kwargs["search_params"].quantization
+        self.assertTrue(params.rescore)
+        self.assertEqual(params.oversampling, 3.0)
+
+    def test_no_quantization_by_default(self):
+        vs = self._store()
+
+        self.assertIsNone(self._created_with(vs)["quantization_config"])
+        self.assertIsNone(vs._search_params())
+
+    def test_unknown_quantization(self):
+        with self.assertRaises(ValueError):
+            self._store(quantization="pq")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestQdrantPrefixSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        return QdrantVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+            **kwargs,
+        )
+
+    def test_two_stage_search_with_prefix_vector(self):
+        vs = self._store(search_dimensions=2, prefix_oversampling=2)
+        vs.add_documents(
+            [Document(page_content=t, metadata={}) for t in ("a", "abc", "abcdef")]
+        )
+
+        with patch.object(
+            vs.client, "query_points", wraps=vs.client.query_points
+        ) as query_points:
+            docs = vs.similarity_search("abc", k=1)
+
+        self.assertEqual(docs[0].page_content, "abc")
+        kwargs = query_points.call_args.kwargs
+        self.assertEqual(kwargs["using"], "full")
+        self.assertEqual(kwargs["prefetch"].using, "prefix")
+        self.assertEqual(len(kwargs["prefetch"].query), 2)
+        self.assertEqual(kwargs["prefetch"].limit, 2)
+
+    def test_existing_collection_without_prefix_vector(self):
+        self._store().client.close()
+
+        vs = self._store(search_dimensions=2)
+        vs.add_documents([Document(page_content="abc", metadata={})])
+
+        self.assertIsNone(vs._prefix_dim("test"))
+        self.assertEqual(vs.similarity_search("abc", k=1)[0].page_content, "abc")
+
+    def test_invalid_search_dimensions(self):
+        with self.assertRaises(ValueError):
+            self._store(search_dimensions=4)
+
+
+class TestQdrantNativeHybrid(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        return QdrantVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+            search_type="hybrid",
+            **kwargs,
+        )
+
+    def _add(self, vs):
+        vs.add_documents(
+            [
+                Document(page_content=t, metadata={"source": t})
+                for t in ("the cat sat", "dogs bark loudly", "quantum physics paper")
+            ]
+        )
+
+    def test_bm25_search_uses_sparse_vectors(self):
+        vs = self._store(native_hybrid=True)
+        self._add(vs)
+
+        results = vs.similarity_search_with_scores("quantum", k=2, search_type="bm25")
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][0].page_content, "quantum physics paper")
+        self.assertEqual(vs._bm25.corpus, [])
+        self.assertFalse(os.path.exists(vs._bm25_path()))
+
+    def test_hybrid_search_fuses_in_one_query(self):
+        vs = self._store(native_hybrid=True, search_dimensions=2)
+        self._add(vs)
+
+        with patch.object(
+            vs.client, "query_points", wraps=vs.client.query_points
+        ) as query_points:
+            docs = vs.similarity_search("quantum", k=3)
+
+        self.assertEqual(query_points.call_count, 1)
+        kwargs = query_points.call_args.kwargs
+        self.assertEqual(kwargs["query"].fusion, "rrf")
+        self.assertEqual([p.using for p in kwargs["prefetch"]], ["full", "bm25"])
+        self.assertEqual(docs[0].page_content, "quantum physics paper")
+
+    def test_existing_collection_without_sparse_vectors(self):
+        previous = self._store()
+        self._add(previous)
+        previous.client.close()
+
+        vs = self._store(native_hybrid=True)
+
+        self.assertFalse(vs.native_hybrid)
+        self.assertEqual(len(vs._bm25.corpus), 3)
+
+
+class TestQdrantBM25Rebuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rebuild_pages_through_the_collection(self):
+        store = QdrantVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+        )
+        store.add_documents(
+            [Document(page_content=f"document {i}", metadata={}) for i in range(5)]
+        )
+        store.client.close()
+        os.remove(store._bm25_path())
+
+        with patch("raglight.vectorstore.qdrant.BM25_REBUILD_PAGE_SIZE", 2):
+            vs = QdrantVS(
+                collection_name="test",
+                embeddings_model=_make_embeddings(),
+                persist_directory=self.tmp.name,
+                search_type="bm25",
+            )
+
+        self.assertEqual(sorted(vs._bm25.corpus), [f"document {i}" for i in range(5)])
+        self.assertTrue(vs._bm25_path().exists())
+        self.assertFalse(vs._bm25_checkpoint_path().exists())
+
+
+class TestQdrantBatchedUpserts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.vs = QdrantVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+            upsert_batch_size=2,
+            upsert_parallelism=2,
+        )
+        self.docs = [Document(page_content=f"doc {i}", metadata={}) for i in range(5)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_local_mode_upserts_batches_in_order(self):
+        with patch.object(
+            self.vs.client, "upsert", wraps=self.vs.client.upsert
+        ) as upsert:
+            self.vs.add_documents(self.docs)
+
+        self.assertEqual(
+            [len(c.kwargs["points"]) for c in upsert.call_args_list], [2, 2, 1]
+        )
+        self.assertEqual(len(self.vs.similarity_search("doc 1", k=10)), 5)
+
+    def test_server_mode_waits_for_every_batch(self):
+        self.vs.host = "qdrant"
+        self.vs.client = MagicMock()
+
+        self.vs._add_to_collection("test", self.docs)
+
+        calls = self.vs.client.upsert.call_args_list
+        self.assertEqual([c.kwargs["wait"] for c in calls], [True, True, True])
+        self.assertEqual(sorted(len(c.kwargs["points"]) for c in calls), [1, 2, 2])
+
+    def test_server_mode_raises_upload_errors(self):
+        self.vs.host = "qdrant"
+        self.vs.client = MagicMock()
+        self.vs.client.upsert.side_effect = RuntimeError("unavailable")
+
+        with self.assertRaises(RuntimeError):
+            self.vs._add_to_collection("test", self.docs)
+
+
+class TestQdrantPayloadIndexes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        return QdrantVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+            **kwargs,
+        )
+
+    def test_server_mode_creates_missing_indexes(self):
+        vs = self._store(indexed_fields={"source": "keyword", "page": "integer"})
+        vs.host = "qdrant"
+        vs.client = MagicMock()
+        vs.client.get_collection.return_value.payload_schema = {"source": object()}
+
+        vs._ensure_payload_indexes("test")
+
+        vs.client.create_payload_index.assert_called_once_with(
+            collection_name="test", field_name="page", field_schema="integer"
+        )
+        self.assertEqual(vs.indexed_fields(), ["page", "source"])
+        self.assertEqual(
+            vs.filter_coverage({"page": 2, "author": "x"}),
+            {"page": True, "author": False},
+        )
+
+    def test_embedded_mode_reports_unindexed_filters(self):
+        vs = self._store()
+        vs.add_documents([Document(page_content="abc", metadata={"source": "a"})])
+        counter = FILTER_CONDITIONS.value(indexed="false")
+
+        with self.assertLogs(level="WARNING") as logs:
+            vs.similarity_search("abc", k=1, filter={"source": "a"})
+            vs.similarity_search("abc", k=1, filter={"source": "a"})
+
+        self.assertEqual(vs.indexed_fields(), [])
+        self.assertEqual(FILTER_CONDITIONS.value(indexed="false"), counter + 2)
+        self.assertEqual(len(logs.records), 1)
+
+    def test_unknown_schema_type(self):
+        with self.assertRaises(ValueError):
+            self._store(indexed_fields={"source": "text-ish"})
+
+
+class TestQdrantQueryEmbeddings(unittest.TestCase):
+    def test_embed_queries_batches_uncached_queries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            vs = QdrantVS(
+                collection_name="test",
+                embeddings_model=_make_embeddings(),
+                persist_directory=tmp,
+            )
+            vs.embeddings_model.embed_queries.side_effect = lambda texts: [
+                [1.0, float(len(t)), 0.5, 0.0] for t in texts
+            ]
+            vs.similarity_search("a", k=1)
+            vs.embeddings_model.embed_query.reset_mock()
+
+            vs.embed_queries(["a", "bb", "bb", "ccc"])
+            vs.similarity_search("bb", k=1)
+            vs.similarity_search("ccc", k=1)
+
+            vs.embeddings_model.embed_queries.assert_called_once_with(["bb", "ccc"])
+            vs.embeddings_model.embed_query.assert_not_called()
+
+
+class TestQdrantAsyncSearch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_async_search_uses_query_embedding_cache(self):
+        vs = QdrantVS(
+            collection_name="test",
+            embeddings_model=_make_embeddings(),
+            persist_directory=self.tmp.name,
+        )
+        vs.host = "qdrant"
+        async_client = MagicMock()
+        async_client.query_points = AsyncMock(return_value=MagicMock(points=[]))
+        vs._async_client = async_client
+        vs.embeddings_model.embed_query.reset_mock()
+
+        vs.similarity_search("what is raglight?", k=1)
+        await vs.asimilarity_search("what is raglight?", k=1)
+
+        vs.embeddings_model.embed_query.assert_called_once()
+        vs.embeddings_model.aembed_query.assert_not_called()
+        async_client.query_points.assert_awaited_once()